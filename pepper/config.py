@@ -1,4 +1,4 @@
-from pepper.framework import CameraResolution, NaoqiMicrophoneIndex
+from pepper.framework import CameraResolution, NaoqiMicrophoneIndex, OverflowPolicy, GapConcealment
 
 import enum
 import json
@@ -35,13 +35,48 @@ BRAIN_LOG = os.path.join(os.path.dirname(__file__), "brain_log")
 
 MICROPHONE_SAMPLE_RATE = 16000
 MICROPHONE_CHANNELS = 1
+MICROPHONE_DEVICE_RATE = None  # System microphone capture rate, resampled to MICROPHONE_SAMPLE_RATE (None: native rate)
+MICROPHONE_BUFFER = 2.0  # Audio buffer [s] between microphone and (VAD) callbacks
+MICROPHONE_OVERFLOW = OverflowPolicy.DROP_OLDEST  # What to do when a callback falls a full buffer behind
 
 VAD_VOICE_THRESHOLD = 0.9
 VAD_NONVOICE_THRESHOLD = 0.2
 VAD_WINDOW_SIZE = 3  # * VAD_FRAME_MS
+# Reject clearly silent frames before webrtcvad, adapt thresholds to noise level. Off by default: it only saves CPU
+# for large microphone blocks (~4096 samples, it costs more than it saves for smaller ones, see test/benchmark/vad.py)
+# and its higher thresholds in noise may miss quiet utterances
+VAD_CASCADE = False
+VAD_VOICE_THRESHOLD_LOUD = 0.95  # VAD_VOICE_THRESHOLD in noisy environments (VAD_CASCADE)
+VAD_NONVOICE_THRESHOLD_LOUD = 0.4  # VAD_NONVOICE_THRESHOLD in noisy environments (VAD_CASCADE)
+VAD_HANGOVER = 0.1  # Time [s] an utterance continues after voice activation has dropped
+VAD_ENDPOINT_DECAY = 20.0  # No hangover once activation drops after non-speech this much [dB] below speech (None: off)
+VAD_MAX_DURATION = 15.0  # Maximum utterance duration [s], longer ones are split on their quietest frame (None: off)
+VAD_UTTERANCE_WORKERS = 2  # Maximum number of utterances processed (transcribed) concurrently
+VAD_UTTERANCE_BACKLOG = 4  # Maximum number of utterances waiting to be processed, older ones are dropped
+VAD_UTTERANCE_MAX_AGE = 5.0  # Maximum time [s] an utterance may wait to be processed
+
+ASR_STREAMING = True  # Stream utterances to speech recognition while they are being recorded
+ASR_TRANSLATE_ALTERNATIVES = None  # Number of best hypotheses translated into English, others kept as is (None: all)
+
+BARGE_IN = False  # Keep listening while talking (echo suppressed), stop talking when interrupted
 
 CAMERA_RESOLUTION = CameraResolution.QVGA
 CAMERA_FRAME_RATE = 4
+CAMERA_FRAME_RATE_MIN = 1  # Lower bound when adapting frame rate to (face/object) detection throughput
+CAMERA_PIPELINED = False  # Fetch next image from Naoqi robot while converting the previous one
+CAMERA_GRAB = True  # Grab system camera frames continuously, only decoding the newest frame when one is due
+CAMERA_DEPTH = False  # Pair Naoqi top camera frames with depth camera frames (RGB-D), for distance to faces/objects
+CAMERA_DEPTH_RESOLUTION = CameraResolution.QVGA
+CAMERA_DEPTH_TOLERANCE = 0.05  # Maximum difference [s] between colour and depth capture time, to pair them
+
+MOTION_GATE_THRESHOLD = 0.01  # Fraction of changed pixels needed to run face/object detection on a frame
+MOTION_GATE_REFRESH = 5  # Run face/object detection at least every n seconds, regardless of change
+
+# Frame scale (one of 1, 0.5, 0.25) each vision component works on, sharing one image pyramid per frame
+FACE_DETECTION_SCALE = 1.0
+OBJECT_DETECTION_SCALE = 1.0
+VIDEO_DISPLAY_SCALE = 1.0
+VIDEO_WRITER_SCALE = 1.0
 
 OBJECT_CONFIDENCE_THRESHOLD = 0.5
 
@@ -54,7 +89,13 @@ FACE_RECOGNITION_NEW_DISTANCE_THRESHOLD = 1.2
 NAOQI_IP = "192.168.1.176"
 NAOQI_PORT = 9559
 NAOQI_URL = "tcp://{}:{}".format(NAOQI_IP, NAOQI_PORT)
-NAOQI_MICROPHONE_INDEX = NaoqiMicrophoneIndex.FRONT
+NAOQI_MICROPHONE_INDEX = NaoqiMicrophoneIndex.FRONT  # NaoqiMicrophoneIndex.ALL: beamform all microphones
+NAOQI_BEAMFORMER_AZIMUTH = 0.0  # Initial beamforming direction [rad] (0: front, pi/2: left)
+NAOQI_MICROPHONE_JITTER_DELAY = 0.1  # Audio [s] to hold while waiting for a missing network audio block
+NAOQI_MICROPHONE_CONCEALMENT = GapConcealment.INTERPOLATE  # How to fill gaps left by lost network audio blocks
+
+SOUND_LOCALIZATION_CONFIDENCE_THRESHOLD = 0.2  # Minimum GCC-PHAT confidence to report a sound direction
+SOUND_LOCALIZATION_STEER = True  # Steer beamforming microphone towards localized sound
 
 # Add-ons
 REALTIME_STATISTICS = True
@@ -11,6 +11,21 @@ class CameraResolution(Enum):
     VGA4 = 960, 1280
 
 
+class ColorSpace(Enum):
+    RGB = 0
+    LUMA = 1
+
+
+class OverflowPolicy(Enum):
+    DROP_OLDEST = 0
+    BLOCK = 1
+
+
+class GapConcealment(Enum):
+    SILENCE = 0
+    INTERPOLATE = 1
+
+
 class NaoqiCameraIndex(IntEnum):
     TOP = 0
     BOTTOM = 1
@@ -1,5 +1,5 @@
-from .camera import AbstractCamera
-from .microphone import AbstractMicrophone
+from .camera import AbstractCamera, Frame
+from .microphone import AbstractMicrophone, JitterBuffer
 from .text_to_speech import AbstractTextToSpeech
 
 from .backend import AbstractBackend
@@ -1,4 +1,6 @@
 from . import AbstractCamera, AbstractMicrophone, AbstractTextToSpeech
+from pepper.sensor.echo import EchoSuppressor
+from pepper import config
 
 
 class AbstractBackend(object):
@@ -16,6 +18,15 @@ class AbstractBackend(object):
         self._microphone = microphone
         self._text_to_speech = text_to_speech
 
+        # Barge-in: speech played back by Text to Speech serves as reference to suppress its echo in Microphone audio
+        # (otherwise the microphone is stopped while talking, and needs no echo suppression)
+        self._echo_suppressor = None
+
+        if config.BARGE_IN:
+            self._echo_suppressor = EchoSuppressor(microphone.rate, microphone.channels)
+            self._microphone.echo_suppressor = self._echo_suppressor
+            self._text_to_speech.echo_suppressor = self._echo_suppressor
+
     @property
     def camera(self):
         """
@@ -42,3 +53,13 @@ class AbstractBackend(object):
         text_to_speech: AbstractTextToSpeech
         """
         return self._text_to_speech
+
+    @property
+    def echo_suppressor(self):
+        """
+        Returns
+        -------
+        echo_suppressor: pepper.sensor.echo.EchoSuppressor or None
+            Echo Suppressor between Text to Speech and Microphone (config.BARGE_IN)
+        """
+        return self._echo_suppressor
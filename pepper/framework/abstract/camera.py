@@ -1,17 +1,563 @@
-from pepper.framework import CameraResolution
+from pepper.framework import CameraResolution, ColorSpace
+from pepper.util.yuv import rgb_to_luma
 from pepper import logger
 
-from threading import Thread
-from Queue import Queue
+from threading import Thread, Condition, Lock, Event
 
 from collections import deque
+from itertools import count
 from time import time
+import copy
 
 import numpy as np
 
 
+class Frame(object):
+
+    SCALES = (1.0, 0.5, 0.25)  # Image Pyramid Levels
+
+    _ids = count()
+
+    def __init__(self, image, capture_time=None, receive_time=None, angles=None, luma=None, depth=None):
+        """
+        Camera Frame: Image with Capture Metadata
+
+        Downscaled versions of the image (see SCALES) and missing colour spaces are computed lazily,
+        once per frame, and shared between all views of this frame (see Frame.at)
+
+        Parameters
+        ----------
+        image: np.ndarray or None
+            (RGB) Image, or None if only luma is available
+        capture_time: float
+            Time [s] the image was captured by the camera (defaults to receive_time)
+        receive_time: float
+            Time [s] the image was received by this host (defaults to now)
+        angles: tuple of float or None
+            Camera angles (left, top, right, bottom) [rad] at capture time, if available
+        luma: np.ndarray or None
+            Luma Image, if available without conversion
+        depth: np.ndarray or None
+            Depth Image [mm] (0 = unknown), if available, aligned in time with image
+        """
+        self._id = next(Frame._ids)
+        self._receive_time = time() if receive_time is None else receive_time
+        self._capture_time = self._receive_time if capture_time is None else capture_time
+        self._angles = angles
+        self._depth = depth
+
+        self._scale = 1.0
+        self._pyramid = {(space, 1.0): img for space, img in ((ColorSpace.RGB, image), (ColorSpace.LUMA, luma))
+                         if img is not None}
+        self._pyramid_lock = Lock()
+
+    @property
+    def id(self):
+        """
+        Returns
+        -------
+        id: int
+            Monotonically increasing Frame id
+        """
+        return self._id
+
+    @property
+    def scale(self):
+        """
+        Returns
+        -------
+        scale: float
+            Scale of image with respect to the captured image
+        """
+        return self._scale
+
+    @property
+    def image(self):
+        """
+        Returns
+        -------
+        image: np.ndarray
+            (RGB) Image, at frame scale (grey, if frame was captured as luma only)
+        """
+        return self._level(ColorSpace.RGB)
+
+    @property
+    def luma(self):
+        """
+        Returns
+        -------
+        luma: np.ndarray
+            Luma Image, at frame scale
+        """
+        return self._level(ColorSpace.LUMA)
+
+    @property
+    def depth(self):
+        """
+        Returns
+        -------
+        depth: np.ndarray or None
+            Depth Image [mm] (0 = unknown), subsampled (without copying) to frame scale, if available
+        """
+        if self._depth is None:
+            return None
+
+        step = int(round(1 / self._scale))
+        return self._depth[::step, ::step]
+
+    @property
+    def capture_time(self):
+        """
+        Returns
+        -------
+        capture_time: float
+            Time [s] the image was captured by the camera
+        """
+        return self._capture_time
+
+    @property
+    def receive_time(self):
+        """
+        Returns
+        -------
+        receive_time: float
+            Time [s] the image was received by this host
+        """
+        return self._receive_time
+
+    @property
+    def angles(self):
+        """
+        Returns
+        -------
+        angles: tuple of float or None
+            Camera angles (left, top, right, bottom) [rad] at capture time, if available
+        """
+        return self._angles
+
+    def at(self, scale):
+        """
+        View of this Frame at another scale, sharing metadata and image pyramid
+
+        Normalized coordinates (e.g. detection bounds) are equal at every scale
+
+        Parameters
+        ----------
+        scale: float
+            One of Frame.SCALES
+
+        Returns
+        -------
+        frame: Frame
+        """
+        if scale not in self.SCALES:
+            raise ValueError("Frame scale must be one of {}, not {}".format(self.SCALES, scale))
+
+        if scale == self._scale:
+            return self
+
+        frame = copy.copy(self)
+        frame._scale = float(scale)
+        return frame
+
+    def with_depth(self, depth):
+        """
+        View of this Frame with Depth Image, sharing metadata and image pyramid
+
+        Parameters
+        ----------
+        depth: np.ndarray
+            Depth Image [mm] (0 = unknown), captured at (roughly) the same time as this frame
+
+        Returns
+        -------
+        frame: Frame
+        """
+        frame = copy.copy(self)
+        frame._depth = depth
+        return frame
+
+    def distance(self, bounds):
+        """
+        Distance to Region of Frame, e.g. a detected face or object
+
+        Depth and colour cameras are not registered, so distance is approximate near object edges
+
+        Parameters
+        ----------
+        bounds: pepper.sensor.obj.Bounds
+            Region of frame, in normalized coordinates [0..1]
+
+        Returns
+        -------
+        distance: float or None
+            Median distance [m] to region, or None if no depth is known for it
+        """
+        if self._depth is None:
+            return None
+
+        height, width = self._depth.shape[:2]
+
+        region = self._depth[int(max(0, bounds.y0) * height):int(np.ceil(min(1, bounds.y1) * height)),
+                             int(max(0, bounds.x0) * width):int(np.ceil(min(1, bounds.x1) * width))]
+        region = region[region > 0]
+
+        return float(np.median(region)) / 1000 if region.size else None
+
+    def latency(self, t=None):
+        """
+        Capture to Event Latency
+
+        Assumes the camera (robot) clock is synchronised with the host clock
+
+        Parameters
+        ----------
+        t: float
+            Time [s] of event (defaults to now)
+
+        Returns
+        -------
+        latency: float
+            Time [s] since frame was captured
+        """
+        return (time() if t is None else t) - self.capture_time
+
+    def _level(self, color_space):
+        """
+        Get (and lazily compute) image pyramid level in colour space at frame scale
+
+        Parameters
+        ----------
+        color_space: ColorSpace
+
+        Returns
+        -------
+        image: np.ndarray
+        """
+        with self._pyramid_lock:
+            if (color_space, 1.0) not in self._pyramid:
+                if color_space == ColorSpace.LUMA:
+                    self._pyramid[(color_space, 1.0)] = rgb_to_luma(self._pyramid[(ColorSpace.RGB, 1.0)])
+                else:
+                    luma = self._pyramid[(ColorSpace.LUMA, 1.0)]
+                    self._pyramid[(color_space, 1.0)] = np.repeat(luma[..., np.newaxis], 3, axis=2)
+
+            level = 1.0
+            while level > self._scale:
+                if (color_space, level / 2) not in self._pyramid:
+                    self._pyramid[(color_space, level / 2)] = self._downscale(self._pyramid[(color_space, level)])
+                level /= 2
+
+            return self._pyramid[(color_space, self._scale)]
+
+    @staticmethod
+    def _downscale(image):
+        """
+        Downscale Image by a factor 2, averaging 2x2 pixel blocks
+
+        Parameters
+        ----------
+        image: np.ndarray
+
+        Returns
+        -------
+        image: np.ndarray
+        """
+        height, width = image.shape[0] // 2 * 2, image.shape[1] // 2 * 2
+
+        total = np.add(image[0:height:2, 0:width:2], image[1:height:2, 0:width:2], dtype=np.uint32)
+        total += image[0:height:2, 1:width:2]
+        total += image[1:height:2, 1:width:2]
+        total >>= 2
+
+        return total.astype(image.dtype)
+
+    def __repr__(self):
+        return "{}[{}] @ {:3.0%}".format(self.__class__.__name__, self.id, self.scale)
+
+
+class CameraSubscriber(object):
+
+    SMOOTHING = 0.8  # Exponential smoothing of callback processing time
+
+    def __init__(self, callback, throttle=False, scale=1.0, color_space=ColorSpace.RGB):
+        """
+        Camera Subscriber, calls its callback on its own thread with the latest frame ("latest frame wins")
+
+        A callback may return False for frames it skipped (see MotionGate),
+        their (near zero) processing time does not count towards the subscriber's capacity.
+
+        Parameters
+        ----------
+        callback: callable
+            On Image Callback
+        throttle: bool
+            Whether the camera frame rate should adapt to the throughput of this subscriber
+        scale: float
+            Frame scale this subscriber needs, one of Frame.SCALES
+        color_space: ColorSpace
+            Colour space this subscriber needs (Frame.image for RGB, Frame.luma for LUMA)
+        """
+        if scale not in Frame.SCALES:
+            raise ValueError("Subscriber scale must be one of {}, not {}".format(Frame.SCALES, scale))
+
+        self._callback = callback
+        self._throttle = throttle
+        self._scale = scale
+        self._color_space = color_space
+
+        self._frame = None
+        self._condition = Condition()
+        self._running = True
+
+        self._delivered = 0
+        self._dropped = 0
+        self._processed = 0
+        self._processing_time = 0.0
+
+        self._thread = Thread(target=self._worker)
+        self._thread.daemon = True
+        self._thread.start()
+
+    @property
+    def callback(self):
+        """
+        Returns
+        -------
+        callback: callable
+            On Image Callback
+        """
+        return self._callback
+
+    @property
+    def throttle(self):
+        """
+        Returns
+        -------
+        throttle: bool
+            Whether the camera frame rate should adapt to the throughput of this subscriber
+        """
+        return self._throttle
+
+    @property
+    def scale(self):
+        """
+        Returns
+        -------
+        scale: float
+            Frame scale this subscriber needs
+        """
+        return self._scale
+
+    @property
+    def color_space(self):
+        """
+        Returns
+        -------
+        color_space: ColorSpace
+            Colour space this subscriber needs
+        """
+        return self._color_space
+
+    @property
+    def delivered(self):
+        """
+        Returns
+        -------
+        delivered: int
+            Number of frames delivered to callback
+        """
+        return self._delivered
+
+    @property
+    def dropped(self):
+        """
+        Returns
+        -------
+        dropped: int
+            Number of frames replaced by a newer frame before callback could process them
+        """
+        return self._dropped
+
+    @property
+    def processed(self):
+        """
+        Returns
+        -------
+        processed: int
+            Number of delivered frames the callback processed (did not skip)
+        """
+        return self._processed
+
+    @property
+    def backlog(self):
+        """
+        Returns
+        -------
+        backlog: int
+            Number of frames waiting to be processed (0 or 1)
+        """
+        return int(self._frame is not None)
+
+    @property
+    def capacity(self):
+        """
+        Returns
+        -------
+        capacity: float or None
+            Frames per second this subscriber can process, based on (smoothed) callback processing time
+            of processed (not skipped) frames
+        """
+        return 1.0 / self._processing_time if self._processing_time else None
+
+    def put(self, frame):
+        """
+        Offer Frame to Subscriber, replacing any frame still waiting to be processed
+
+        Parameters
+        ----------
+        frame: Frame
+        """
+        with self._condition:
+            if self._frame is not None:
+                self._dropped += 1
+            self._frame = frame
+            self._condition.notify()
+
+    def close(self):
+        """Stop Subscriber Thread"""
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+
+    def _worker(self):
+        while True:
+            with self._condition:
+                while self._running and self._frame is None:
+                    self._condition.wait()
+
+                if not self._running:
+                    return
+
+                frame, self._frame = self._frame, None
+
+            t0 = time()
+            processed = self._callback(frame.at(self.scale)) is not False
+            dt = time() - t0
+
+            if processed:
+                self._processing_time = dt if not self._processed else \
+                    self.SMOOTHING * self._processing_time + (1 - self.SMOOTHING) * dt
+                self._processed += 1
+
+            self._delivered += 1
+
+    def __repr__(self):
+        return "{}[{}]: delivered={}, dropped={}".format(
+            self.__class__.__name__, getattr(self.callback, '__name__', self.callback), self.delivered, self.dropped)
+
+
+class FrameRateController(object):
+
+    HEADROOM = 0.9  # Fraction of subscriber capacity to aim for
+    SMOOTHING = 0.5  # Exponential smoothing of rate updates
+    INTERVAL = 1.0  # Time [s] between rate updates
+
+    def __init__(self, min_rate, max_rate):
+        """
+        Adapt Camera Frame Rate to the throughput of throttling subscribers
+
+        The rate converges to (a fraction of) the capacity of the slowest throttling subscriber,
+        so frames that would be dropped anyway are not acquired, within [min_rate, max_rate].
+
+        Parameters
+        ----------
+        min_rate: float
+            Minimum Frame Rate
+        max_rate: float
+            Maximum Frame Rate
+        """
+        self._min_rate = min(min_rate, max_rate)
+        self._max_rate = max_rate
+
+        self._rate = float(max_rate)
+        self._t0 = time()
+
+        self._dropped = {}  # Subscriber -> dropped frame count at last update
+
+    @property
+    def min_rate(self):
+        """
+        Returns
+        -------
+        min_rate: float
+            Minimum Frame Rate
+        """
+        return self._min_rate
+
+    @property
+    def max_rate(self):
+        """
+        Returns
+        -------
+        max_rate: float
+            Maximum Frame Rate
+        """
+        return self._max_rate
+
+    @property
+    def rate(self):
+        """
+        Returns
+        -------
+        rate: float
+            Current Frame Rate
+        """
+        return self._rate
+
+    def update(self, subscribers):
+        """
+        Update Frame Rate based on Subscriber capacity and backlog (at most once every INTERVAL seconds)
+
+        Parameters
+        ----------
+        subscribers: list of CameraSubscriber
+
+        Returns
+        -------
+        rate: float
+            Updated Frame Rate
+        """
+        t1 = time()
+
+        if t1 - self._t0 >= self.INTERVAL:
+            self._t0 = t1
+
+            throttling = [subscriber for subscriber in subscribers if subscriber.throttle and subscriber.capacity]
+            capacities = [subscriber.capacity for subscriber in throttling]
+
+            # Subscribers that dropped frames since last update
+            backlogged = [subscriber for subscriber in throttling
+                          if subscriber.dropped > self._dropped.get(subscriber, subscriber.dropped)]
+            self._dropped = {subscriber: subscriber.dropped for subscriber in throttling}
+
+            if capacities:
+                target = self.HEADROOM * min(capacities)
+
+                # Frames are being dropped: don't speed up
+                if backlogged:
+                    target = min(target, self._rate)
+
+                rate = self.SMOOTHING * self._rate + (1 - self.SMOOTHING) * target
+                self._rate = float(np.clip(rate, self.min_rate, self.max_rate))
+            else:
+                self._rate = float(self.max_rate)
+
+        return self._rate
+
+
 class AbstractCamera(object):
-    def __init__(self, resolution, rate, callbacks):
+    def __init__(self, resolution, rate, callbacks, min_rate=None):
         """
         Abstract Camera
 
@@ -19,14 +565,20 @@ class AbstractCamera(object):
         ----------
         resolution: CameraResolution
         rate: int
+            (Maximum) Frame Rate
         callbacks: list of callable
+            On Image Event Callbacks (copied, so subscribe does not modify the given list)
+        min_rate: int
+            Minimum Frame Rate, when adapting rate to throttling subscribers (defaults to rate -> fixed rate)
         """
         self._resolution = resolution
         self._width = self._resolution.value[1]
         self._height = self._resolution.value[0]
 
         self._rate = rate
-        self._callbacks = callbacks
+        self._callbacks = list(callbacks or [])
+
+        self._rate_controller = FrameRateController(rate if min_rate is None else min_rate, rate)
 
         self._shape = np.array([self.height, self.width, self.channels])
 
@@ -34,15 +586,25 @@ class AbstractCamera(object):
         self._true_rate = rate
         self._t0 = time()
 
-        self._queue = Queue(maxsize=2)
-        self._processor_thread = Thread(target=self._processor)
-        self._processor_thread.daemon = True
-        self._processor_thread.start()
+        # Each callback gets its own CameraSubscriber (thread), created when it first receives a frame
+        self._subscribers = {}
+        self._subscribers_lock = Lock()
 
-        self._running = False
+        # Set while streaming, acquisition threads wait on it (without spinning) while the camera is stopped
+        self._running = Event()
 
         self._log = logger.getChild(self.__class__.__name__)
 
+    @property
+    def running(self):
+        """
+        Returns
+        -------
+        running: bool
+            Whether the camera is streaming images
+        """
+        return self._running.is_set()
+
     @property
     def resolution(self):
         """
@@ -87,10 +649,10 @@ class AbstractCamera(object):
         """
         Returns
         -------
-        rate: int
-            Image rate
+        rate: float
+            Current (adaptive) Frame Rate
         """
-        return self._rate
+        return self._rate_controller.rate
 
     @property
     def shape(self):
@@ -107,7 +669,7 @@ class AbstractCamera(object):
         Returns
         -------
         callbacks: list of callable
-            on_image callbacks
+            on_image callbacks, called with Frame
         """
         return self._callbacks
 
@@ -120,42 +682,104 @@ class AbstractCamera(object):
         """
         self._callbacks = value
 
-    def on_image(self, image):
+    @property
+    def subscribers(self):
+        """
+        Returns
+        -------
+        subscribers: list of CameraSubscriber
+            Subscriber per on_image callback, with delivered/dropped frame statistics
+        """
+        return [self._subscribers[callback] for callback in self.callbacks if callback in self._subscribers]
+
+    @property
+    def color_spaces(self):
+        """
+        Returns
+        -------
+        color_spaces: set of ColorSpace
+            Colour spaces needed by subscribers (callbacks without subscriber yet need RGB)
+        """
+        with self._subscribers_lock:
+            return {self._subscribers[callback].color_space if callback in self._subscribers else ColorSpace.RGB
+                    for callback in self.callbacks}
+
+    def subscribe(self, callback, throttle=False, scale=1.0, color_space=ColorSpace.RGB):
+        """
+        Subscribe Callback to Camera Frames
+
+        Parameters
+        ----------
+        callback: callable
+            On Image Callback, called with Frame, may return False for frames it skipped (see CameraSubscriber)
+        throttle: bool
+            Whether the camera frame rate should adapt to the throughput of this callback
+        scale: float
+            Frame scale this callback needs, one of Frame.SCALES
+        color_space: ColorSpace
+            Colour space this callback needs, the camera only acquires/converts colour spaces that are needed
+        """
+        with self._subscribers_lock:
+            self._subscribers[callback] = CameraSubscriber(callback, throttle, scale, color_space)
+            self._callbacks.append(callback)
+
+    def on_image(self, frame):
         """
         On Image Event
 
         Parameters
         ----------
-        image: np.ndarray
+        frame: Frame
         """
-        if not self._queue.full():
-            self._queue.put(image)
+        t1 = time()
+        self._dt_buffer.append(t1 - self._t0)
+        self._t0 = t1
+
+        self._true_rate = 1.0 / np.mean(self._dt_buffer)
+
+        subscribers = self._update_subscribers()
+
+        for subscriber in subscribers:
+            subscriber.put(frame)
+
+        self._rate_controller.update(subscribers)
 
     def start(self):
         """Start Streaming Images from Camera"""
 
-        self._running = True
+        # Don't count the time the camera was stopped towards the true frame rate
+        self._dt_buffer.clear()
+        self._t0 = time()
+
+        self._running.set()
 
     def stop(self):
         """Stop Streaming Images from Camera"""
 
-        self._running = False
+        self._running.clear()
 
-    def _processor(self):
+    def _wait_running(self):
+        """Block (acquisition thread) until the camera is streaming"""
+        self._running.wait()
+
+    def _update_subscribers(self):
         """
-        Image Processor
+        Match Subscribers with current on_image callbacks
+
+        Creates Subscribers for new callbacks and closes Subscribers of removed callbacks
 
-        Calls each callback for each image, threaded, for higher image throughput
+        Returns
+        -------
+        subscribers: list of CameraSubscriber
         """
-        while True:
+        with self._subscribers_lock:
+            callbacks = list(self.callbacks)
 
-            t1 = time()
-            dt = (t1 - self._t0)
-            self._dt_buffer.append(dt)
-            self._t0 = t1
+            for callback in callbacks:
+                if callback not in self._subscribers:
+                    self._subscribers[callback] = CameraSubscriber(callback)
 
-            self._true_rate = 1.0 / np.mean(self._dt_buffer)
+            for callback in set(self._subscribers.keys()) - set(callbacks):
+                self._subscribers.pop(callback).close()
 
-            image = self._queue.get()
-            for callback in self.callbacks:
-                callback(image)
\ No newline at end of file
+            return [self._subscribers[callback] for callback in callbacks]
@@ -1,16 +1,689 @@
+from pepper.framework import OverflowPolicy, GapConcealment
 from pepper import logger
 
 import numpy as np
 
-from threading import Thread
-from Queue import Queue
+from threading import Thread, Condition, Lock
 from time import time
 
 from collections import deque
+from heapq import heappush, heappop
+
+
+class AudioRingBuffer(object):
+    def __init__(self, size, channels=1, overflow=OverflowPolicy.DROP_OLDEST):
+        """
+        Preallocated int16 Audio Ring Buffer, written by one producer and read by any number of AudioCursors
+
+        Cursors are at most size samples behind the writer. Audio handed out by AudioCursor.read is
+        protected from being overwritten by another size samples of headroom, so it can be read without copying.
+        With OverflowPolicy.DROP_OLDEST the writer never waits: audio held on to for longer than the headroom allows
+        is overwritten (and counted as dropped, see AudioCursor.read).
+
+        Parameters
+        ----------
+        size: int
+            Buffer size in samples (rounded down to a multiple of channels)
+        channels: int
+            Number of (interleaved) audio channels
+        overflow: OverflowPolicy
+            What to do when a cursor falls a full buffer behind
+        """
+        self._size = size // channels * channels
+        self._channels = channels
+        self._overflow = overflow
+
+        self._buffer = np.zeros(2 * self._size, np.int16)  # Buffer + headroom for audio being read
+        self._written = 0  # Total number of samples written (absolute write position)
+
+        self._cursors = []
+        self._condition = Condition()
+
+        self._overflows = 0
+
+    @property
+    def size(self):
+        """
+        Returns
+        -------
+        size: int
+            Buffer size in samples
+        """
+        return self._size
+
+    @property
+    def channels(self):
+        """
+        Returns
+        -------
+        channels: int
+            Number of (interleaved) audio channels
+        """
+        return self._channels
+
+    @property
+    def overflow(self):
+        """
+        Returns
+        -------
+        overflow: OverflowPolicy
+            What to do when a cursor falls a full buffer behind
+        """
+        return self._overflow
+
+    @property
+    def overflows(self):
+        """
+        Returns
+        -------
+        overflows: int
+            Number of writes that did not fit in the buffer for one of the cursors
+        """
+        return self._overflows
+
+    @property
+    def written(self):
+        """
+        Returns
+        -------
+        written: int
+            Total number of samples written (absolute write position)
+        """
+        return self._written
+
+    def cursor(self):
+        """
+        Create Read Cursor, starting at the current write position
+
+        Returns
+        -------
+        cursor: AudioCursor
+        """
+        with self._condition:
+            cursor = AudioCursor(self, self._written)
+            self._cursors.append(cursor)
+            return cursor
+
+    def write(self, audio):
+        """
+        Write Audio into Buffer, making room according to the overflow policy
+
+        With OverflowPolicy.BLOCK, this blocks until all cursors have read enough to make room for the audio
+
+        Parameters
+        ----------
+        audio: np.ndarray
+            Audio samples (interleaved channels), dtype np.int16
+        """
+        audio = audio[-self.size:]
+        n = len(audio)
+
+        with self._condition:
+            for cursor in list(self._cursors):
+                self._make_room(cursor, n)
+
+            start = self._written % len(self._buffer)
+            head = min(n, len(self._buffer) - start)
+
+            self._buffer[start:start + head] = audio[:head]
+            self._buffer[:n - head] = audio[head:]
+
+            self._written += n
+            self._condition.notify_all()
+
+    def _make_room(self, cursor, n):
+        """
+        Make room for n samples ahead of cursor (call with condition)
+
+        Parameters
+        ----------
+        cursor: AudioCursor
+        n: int
+        """
+        excess = self._written + n - self.size - cursor._position
+
+        if excess <= 0:
+            return
+
+        self._overflows += 1
+        cursor._overflows += 1
+
+        if self.overflow == OverflowPolicy.BLOCK:
+            # Wait for cursor to catch up
+            while excess > 0 and not cursor._closed:
+                self._condition.wait()
+                excess = self._written + n - self.size - cursor._position
+        else:
+            # Drop oldest samples cursor has not read yet
+            cursor._position += excess
+            cursor._dropped += excess
+
+            # Don't wait for a cursor holding on to the audio it is reading for longer than the headroom allows:
+            # overwrite it (the writer is the capture thread, shared by all cursors) and count it as dropped
+            if cursor._reading:
+                overwritten = min(cursor._reading, self._written + n - len(self._buffer) - cursor._reading_start)
+
+                if overwritten > cursor._overwritten:
+                    cursor._dropped += overwritten - cursor._overwritten
+                    cursor._overwritten = overwritten
+
+    def _remove(self, cursor):
+        """
+        Remove (closed) Cursor (call with condition)
+
+        Parameters
+        ----------
+        cursor: AudioCursor
+        """
+        if cursor in self._cursors:
+            self._cursors.remove(cursor)
+        self._condition.notify_all()
+
+
+class AudioCursor(object):
+    def __init__(self, ring_buffer, position):
+        """
+        Read Cursor on AudioRingBuffer, create with AudioRingBuffer.cursor
+
+        Parameters
+        ----------
+        ring_buffer: AudioRingBuffer
+        position: int
+            Absolute position of the first sample to read
+        """
+        self._ring_buffer = ring_buffer
+        self._position = position  # Absolute position of the next sample to read
+        self._reading = 0  # Number of samples being read (handed out, not released yet)
+        self._reading_start = position
+        self._overwritten = 0  # Number of samples being read, overwritten by the writer (OverflowPolicy.DROP_OLDEST)
+        self._closed = False
+
+        self._overflows = 0
+        self._dropped = 0
+
+    @property
+    def backlog(self):
+        """
+        Returns
+        -------
+        backlog: int
+            Number of samples written, but not read yet
+        """
+        return self._ring_buffer._written - self._position
+
+    @property
+    def overflows(self):
+        """
+        Returns
+        -------
+        overflows: int
+            Number of writes that did not fit in the buffer ahead of this cursor
+        """
+        return self._overflows
+
+    @property
+    def dropped(self):
+        """
+        Returns
+        -------
+        dropped: int
+            Number of samples dropped before this cursor could read (or finish reading) them (OverflowPolicy.DROP_OLDEST)
+        """
+        return self._dropped
+
+    def read(self, max_size):
+        """
+        Read Audio, blocking until audio is available
+
+        Returns a view on the ring buffer, without copying, which is only valid until AudioCursor.release.
+        With OverflowPolicy.DROP_OLDEST, the view is overwritten when it is held for longer than the buffer headroom
+        (another size samples of audio), which counts as dropped audio.
+
+        Parameters
+        ----------
+        max_size: int
+            Maximum number of samples to read (multiple of channels)
+
+        Returns
+        -------
+        audio: np.ndarray or None
+            Audio samples (interleaved channels), or None if cursor was closed
+        """
+        ring_buffer = self._ring_buffer
+
+        with ring_buffer._condition:
+            while not self._closed and self._position == ring_buffer._written:
+                ring_buffer._condition.wait()
+
+            if self._closed:
+                return None
+
+            start = self._position % len(ring_buffer._buffer)
+            self._reading = min(ring_buffer._written - self._position, len(ring_buffer._buffer) - start, max_size)
+            self._reading_start = self._position
+            self._overwritten = 0
+            self._position += self._reading
+
+            return ring_buffer._buffer[start:start + self._reading]
+
+    def release(self):
+        """Release Audio returned by last AudioCursor.read, so the writer may overwrite it"""
+        with self._ring_buffer._condition:
+            self._reading = 0
+            self._ring_buffer._condition.notify_all()
+
+    def close(self):
+        """Close Cursor, unblocking reader and writer"""
+        with self._ring_buffer._condition:
+            self._closed = True
+            self._ring_buffer._remove(self)
+
+
+class JitterBuffer(object):
+
+    TOLERANCE = 0.002  # Timestamp deviation [s] still considered contiguous (timestamp resolution)
+
+    def __init__(self, rate, channels=1, delay=0.1, concealment=GapConcealment.INTERPOLATE, max_gap=1.0):
+        """
+        Timestamp-ordered Jitter Buffer for (network) audio blocks
+
+        Blocks are placed on a sample timeline using the timestamp of their first sample (sender clock).
+        In-order blocks are released immediately. Blocks arriving ahead of a missing block are held
+        until either the missing block arrives (reordering) or more than delay seconds of audio are waiting,
+        after which the gap is concealed. Blocks arriving after their gap was concealed are dropped (late).
+
+        Parameters
+        ----------
+        rate: int
+            Sample rate [Hz]
+        channels: int
+            Number of (interleaved) audio channels
+        delay: float
+            Maximum amount of audio [s] to hold while waiting for a missing block
+        concealment: GapConcealment
+            How to fill gaps left by lost blocks
+        max_gap: float
+            Gaps [s] longer than this are not concealed, but treated as a discontinuity (e.g. stream restart)
+        """
+        self._rate = rate
+        self._channels = channels
+        self._delay = int(delay * rate)
+        self._concealment = concealment
+        self._max_gap = int(max_gap * rate)
+        self._tolerance = int(self.TOLERANCE * rate)
+
+        self._pending = []  # Heap of (position, sequence, audio) of blocks waiting to be released
+        self._buffered = 0  # Number of samples (per channel) pending
+
+        self._origin = None  # Timestamp of position 0
+        self._position = 0  # Position (samples per channel, since origin) of next sample to release
+        self._newest = 0  # Position of newest block received
+        self._last = np.zeros(channels, np.int16)  # Last sample (of all channels) released
+
+        self._lock = Lock()
+
+        self._received = 0
+        self._reordered = 0
+        self._late = 0
+        self._gaps = 0
+        self._lost = 0
+        self._released = 0
+        self._discontinuities = 0
+
+        self._transit = None
+        self._jitter = 0.0
+
+    @property
+    def rate(self):
+        """
+        Returns
+        -------
+        rate: int
+            Sample rate [Hz]
+        """
+        return self._rate
+
+    @property
+    def channels(self):
+        """
+        Returns
+        -------
+        channels: int
+            Number of (interleaved) audio channels
+        """
+        return self._channels
+
+    @property
+    def received(self):
+        """
+        Returns
+        -------
+        received: int
+            Number of blocks received
+        """
+        return self._received
+
+    @property
+    def reordered(self):
+        """
+        Returns
+        -------
+        reordered: int
+            Number of blocks received out of order, but in time to be released in order
+        """
+        return self._reordered
+
+    @property
+    def late(self):
+        """
+        Returns
+        -------
+        late: int
+            Number of blocks dropped, because they arrived after their gap was concealed (or twice)
+        """
+        return self._late
+
+    @property
+    def gaps(self):
+        """
+        Returns
+        -------
+        gaps: int
+            Number of concealed gaps
+        """
+        return self._gaps
+
+    @property
+    def lost(self):
+        """
+        Returns
+        -------
+        lost: int
+            Number of samples (per channel) concealed
+        """
+        return self._lost
+
+    @property
+    def loss(self):
+        """
+        Returns
+        -------
+        loss: float
+            Fraction of released audio that was concealed
+        """
+        return self._lost / float(max(1, self._released))
+
+    @property
+    def discontinuities(self):
+        """
+        Returns
+        -------
+        discontinuities: int
+            Number of gaps longer than max_gap or timestamps jumping back, which were not concealed
+        """
+        return self._discontinuities
+
+    @property
+    def jitter(self):
+        """
+        Returns
+        -------
+        jitter: float
+            Interarrival jitter [s]: smoothed variation in transit time between consecutive blocks (RFC 3550)
+        """
+        return self._jitter
+
+    def push(self, audio, timestamp, arrival=None):
+        """
+        Push Audio Block into Jitter Buffer
+
+        Parameters
+        ----------
+        audio: np.ndarray
+            Audio samples (interleaved channels), dtype np.int16
+        timestamp: float
+            Time [s] of first sample of block, on sender clock
+        arrival: float
+            Time [s] block arrived, on receiver clock (defaults to now)
+
+        Returns
+        -------
+        blocks: list of np.ndarray
+            Audio blocks (interleaved channels) to be processed in order, including concealed gaps
+        """
+        audio = audio.reshape(-1, self.channels)
+        arrival = time() if arrival is None else arrival
+
+        with self._lock:
+            self._received += 1
+
+            # Interarrival jitter: the receiver/sender clock offset cancels out in the transit time difference
+            transit = arrival - timestamp
+            if self._transit is not None:
+                self._jitter += (abs(transit - self._transit) - self._jitter) / 16
+            self._transit = transit
+
+            if self._origin is None:
+                self._origin = timestamp
+
+            position = int(round((timestamp - self._origin) * self.rate))
+
+            if position < self._position - self._max_gap:
+                # Timestamps jumped back (e.g. sender restarted): release everything and start a new timeline
+                blocks = self._release(flush=True)
+                self._discontinuities += 1
+                self._origin, self._position, self._newest, position = timestamp, 0, 0, 0
+            else:
+                blocks = []
+
+            if position + len(audio) <= self._position + self._tolerance:
+                self._late += 1
+                return blocks
+
+            if position < self._newest:
+                self._reordered += 1
+            self._newest = max(self._newest, position)
+
+            heappush(self._pending, (position, self._received, audio))
+            self._buffered += len(audio)
+
+            return blocks + self._release()
+
+    def _release(self, flush=False):
+        """
+        Release pending blocks that are next in line, concealing gaps that waited long enough (call with lock)
+
+        Parameters
+        ----------
+        flush: bool
+            Release all pending blocks, without waiting for missing blocks
+
+        Returns
+        -------
+        blocks: list of np.ndarray
+        """
+        blocks = []
+
+        while self._pending:
+            position, _, audio = self._pending[0]
+            gap = position - self._position
+
+            if abs(gap) <= self._tolerance:
+                gap = 0
+
+            # Wait for missing block, unless it has been too long
+            if gap > 0 and self._buffered < self._delay and not flush:
+                break
+
+            heappop(self._pending)
+            self._buffered -= len(audio)
+
+            end = position + len(audio)
+
+            if gap < 0:
+                audio = audio[-gap:]  # Overlaps audio already released
+
+                if not len(audio):
+                    self._late += 1
+                    continue
+
+            elif gap > self._max_gap:
+                self._discontinuities += 1
+            elif gap > 0:
+                blocks.append(self._conceal(gap, audio[0]).reshape(-1))
+                self._gaps += 1
+                self._lost += gap
+                self._released += gap
+
+            blocks.append(audio.reshape(-1))
+            self._released += len(audio)
+            self._position = end
+            self._last = audio[-1]
+
+        return blocks
+
+    def _conceal(self, n, following):
+        """
+        Create Audio to conceal Gap
+
+        Parameters
+        ----------
+        n: int
+            Gap length in samples (per channel)
+        following: np.ndarray
+            First sample (of all channels) after gap
+
+        Returns
+        -------
+        audio: np.ndarray
+            Audio of shape (n, channels)
+        """
+        if self._concealment == GapConcealment.INTERPOLATE:
+            # Linear interpolation between last sample before and first sample after gap
+            weights = np.arange(1, n + 1, dtype=np.float32).reshape(-1, 1) / (n + 1)
+            return (self._last + weights * (following.astype(np.float32) - self._last)).astype(np.int16)
+
+        return np.zeros((n, self.channels), np.int16)
+
+    def __repr__(self):
+        return "{}: received={}, reordered={}, late={}, gaps={}, lost={:.1%}, jitter={:.1f}ms".format(
+            self.__class__.__name__, self.received, self.reordered, self.late, self.gaps,
+            self.loss, self.jitter * 1000)
+
+
+class MicrophoneSubscriber(object):
+
+    CHUNKS = 8  # Maximum audio per callback, as a fraction of ring buffer size
+
+    def __init__(self, callback, ring_buffer):
+        """
+        Microphone Subscriber, calls its callback on its own thread with audio read from its own cursor
+
+        Parameters
+        ----------
+        callback: callable
+            On Audio Callback, called with a view on the ring buffer (copy audio to keep it beyond the callback)
+        ring_buffer: AudioRingBuffer
+        """
+        self._callback = callback
+        self._cursor = ring_buffer.cursor()
+        self._chunk = max(1, ring_buffer.size // self.CHUNKS // ring_buffer.channels) * ring_buffer.channels
+
+        self._delivered = 0
+
+        self._thread = Thread(target=self._worker)
+        self._thread.daemon = True
+        self._thread.start()
+
+    @property
+    def callback(self):
+        """
+        Returns
+        -------
+        callback: callable
+            On Audio Callback
+        """
+        return self._callback
+
+    @property
+    def delivered(self):
+        """
+        Returns
+        -------
+        delivered: int
+            Number of samples delivered to callback
+        """
+        return self._delivered
+
+    @property
+    def position(self):
+        """
+        Returns
+        -------
+        position: int
+            Stream position [samples] of the first sample of the audio being delivered (counting dropped audio)
+        """
+        return self._cursor._reading_start
+
+    @property
+    def backlog(self):
+        """
+        Returns
+        -------
+        backlog: int
+            Number of samples waiting to be processed
+        """
+        return self._cursor.backlog
+
+    @property
+    def overflows(self):
+        """
+        Returns
+        -------
+        overflows: int
+            Number of times audio did not fit in the buffer ahead of this subscriber
+        """
+        return self._cursor.overflows
+
+    @property
+    def dropped(self):
+        """
+        Returns
+        -------
+        dropped: int
+            Number of samples dropped before this subscriber could process them
+        """
+        return self._cursor.dropped
+
+    def close(self):
+        """Stop Subscriber Thread"""
+        self._cursor.close()
+
+    def _worker(self):
+        while True:
+            audio = self._cursor.read(self._chunk)
+
+            if audio is None:
+                return
+
+            try:
+                self._callback(audio)
+            finally:
+                self._cursor.release()
+
+            self._delivered += len(audio)
+
+    def __repr__(self):
+        return "{}[{}]: delivered={}, dropped={}, overflows={}".format(
+            self.__class__.__name__, getattr(self.callback, '__name__', self.callback),
+            self.delivered, self.dropped, self.overflows)
 
 
 class AbstractMicrophone(object):
-    def __init__(self, rate, channels, callbacks):
+
+    OVERFLOW_REPORT_INTERVAL = 1.0  # Minimum time [s] between overflow warnings
+
+    def __init__(self, rate, channels, callbacks, buffer=2.0, overflow=OverflowPolicy.DROP_OLDEST):
         """
         Abstract Microphone
 
@@ -19,23 +692,32 @@ class AbstractMicrophone(object):
         rate: int
         channels: int
         callbacks: list of callable
+            On Audio Callbacks (copied, so adding callbacks does not modify the given list)
+        buffer: float
+            Audio (ring) buffer size [s], between microphone and callbacks
+        overflow: OverflowPolicy
+            What to do with new audio when a callback falls a full buffer behind
         """
         self._rate = rate
         self._channels = channels
-        self._callbacks = callbacks
+        self._callbacks = list(callbacks or [])
 
-        self._dt_threshold_multiplier = 1.5
         self._dt_buffer = deque([], maxlen=32)
         self._true_rate = rate
         self._t0 = time()
 
-        self._queue = Queue()
-        self._processor_thread = Thread(target=self._processor)
-        self._processor_thread.daemon = True
-        self._processor_thread.start()
+        # Audio is written into a preallocated ring buffer, each callback reads from it with its own cursor & thread
+        self._ring_buffer = AudioRingBuffer(int(buffer * rate) * channels, channels, overflow)
+        self._subscribers = {}
+        self._subscribers_lock = Lock()
+
+        self._overflows_reported = 0
+        self._overflows_t0 = 0
 
         self._log = logger.getChild(self.__class__.__name__)
 
+        self._echo_suppressor = None
+
         self._running = False
         self._blocks = 0
 
@@ -59,6 +741,26 @@ class AbstractMicrophone(object):
         """
         return self._channels
 
+    @property
+    def positions(self):
+        """
+        Returns
+        -------
+        positions: np.ndarray or None
+            Positions [m] (x: front, y: left, z: up) of channels, of shape (channels, 3), if known
+        """
+        return None
+
+    @property
+    def array(self):
+        """
+        Returns
+        -------
+        array: AbstractMicrophone or None
+            Multi-channel microphone (array) with known positions this audio comes from, if any
+        """
+        return self if self.channels > 1 and self.positions is not None else None
+
     @property
     def callbacks(self):
         """
@@ -77,6 +779,81 @@ class AbstractMicrophone(object):
         """
         self._callbacks = value
 
+    @property
+    def echo_suppressor(self):
+        """
+        Returns
+        -------
+        echo_suppressor: pepper.sensor.echo.EchoSuppressor or None
+            Echo Suppressor applied to audio before it reaches the callbacks, if any
+        """
+        return self._echo_suppressor
+
+    @echo_suppressor.setter
+    def echo_suppressor(self, value):
+        """
+        Parameters
+        ----------
+        value: pepper.sensor.echo.EchoSuppressor or None
+        """
+        self._echo_suppressor = value
+
+    @property
+    def subscribers(self):
+        """
+        Returns
+        -------
+        subscribers: list of MicrophoneSubscriber
+            Subscriber per on_audio callback, with delivered/dropped sample and overflow statistics
+        """
+        return [self._subscribers[callback] for callback in self.callbacks if callback in self._subscribers]
+
+    def position(self, callback):
+        """
+        Stream Position of the Audio being delivered to Callback (call from within that callback)
+
+        Positions count all audio written to the callbacks, including audio dropped before a callback could process it,
+        so they identify the same sound for all callbacks of this microphone.
+
+        Parameters
+        ----------
+        callback: callable
+            On Audio Callback
+
+        Returns
+        -------
+        position: int or None
+            Position [samples per channel] of the first sample being delivered (None: callback has no subscriber)
+        """
+        subscriber = self._subscribers.get(callback)
+        return None if subscriber is None else subscriber.position // self.channels
+
+    def array_position(self, position):
+        """
+        Map Stream Position of this Microphone onto the Stream of its Array (see array and position)
+
+        Parameters
+        ----------
+        position: int
+            Position [samples per channel] in this microphone's stream
+
+        Returns
+        -------
+        array_position: int or None
+            Position [samples per channel] of the same sound in the array's stream (None: no array or unknown)
+        """
+        return position if self.array is self else None
+
+    @property
+    def overflows(self):
+        """
+        Returns
+        -------
+        overflows: int
+            Number of times audio did not fit in the buffer ahead of one of the callbacks
+        """
+        return self._ring_buffer.overflows
+
     def on_audio(self, audio):
         """
         On Audio Event
@@ -85,7 +862,25 @@ class AbstractMicrophone(object):
         ----------
         audio: np.ndarray
         """
-        self._queue.put(audio)
+        t1 = time()
+        self._dt_buffer.append(t1 - self._t0)
+        self._t0 = t1
+
+        self._true_rate = len(audio) / np.mean(self._dt_buffer)
+
+        if self._running:
+            if self._echo_suppressor:
+                audio = self._echo_suppressor.process(audio)
+
+            self._update_subscribers()
+            self._ring_buffer.write(audio)
+
+            if self.overflows > self._overflows_reported and t1 - self._overflows_t0 > self.OVERFLOW_REPORT_INTERVAL:
+                self._log.warning("<< Audio Buffer overflowed {} times, Callback(s) can't keep up: {} >>".format(
+                    self.overflows - self._overflows_reported,
+                    [subscriber for subscriber in self.subscribers if subscriber.overflows]))
+                self._overflows_reported = self.overflows
+                self._overflows_t0 = t1
 
     def start(self):
         """Start Microphone Stream"""
@@ -101,29 +896,18 @@ class AbstractMicrophone(object):
         self._blocks += 1
         self._running = False
 
-    def _processor(self):
+    def _update_subscribers(self):
         """
-        Audio Processor
+        Match Subscribers with current on_audio callbacks
 
-        Calls each callback for each audio frame, threaded, for higher audio throughput
+        Creates Subscribers for new callbacks and closes Subscribers of removed callbacks
         """
-        while True:
-            audio = self._queue.get()
-
-            t1 = time()
-            dt = (t1 - self._t0)
-            self._dt_buffer.append(dt)
-            self._t0 = t1
-
-            dt_mean = np.mean(self._dt_buffer)
-
-            self._true_rate = len(audio) / dt_mean
+        with self._subscribers_lock:
+            callbacks = list(self.callbacks)
 
-            if len(self._dt_buffer) == self._dt_buffer.maxlen and \
-                    dt_mean > self._dt_threshold_multiplier * (len(audio) / float(self.rate)):
-                self._log.warning("<< Frames were skipped, Check Host/Pepper Network Connection/Load >>")
-                self._dt_buffer.clear()
+            for callback in callbacks:
+                if callback not in self._subscribers:
+                    self._subscribers[callback] = MicrophoneSubscriber(callback, self._ring_buffer)
 
-            if self._running:
-                for callback in self.callbacks:
-                    callback(audio)
\ No newline at end of file
+            for callback in set(self._subscribers.keys()) - set(callbacks):
+                self._subscribers.pop(callback).close()
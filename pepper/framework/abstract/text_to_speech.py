@@ -10,6 +10,9 @@ class AbstractTextToSpeech(object):
         """
 
         self._language = language
+        self._echo_suppressor = None
+        self._talking = False
+
         self._log = logger.getChild(self.__class__.__name__)
 
     @property
@@ -22,6 +25,35 @@ class AbstractTextToSpeech(object):
         """
         return self._language
 
+    @property
+    def echo_suppressor(self):
+        """
+        Returns
+        -------
+        echo_suppressor: pepper.sensor.echo.EchoSuppressor or None
+            Echo Suppressor to register played back speech with, as reference
+        """
+        return self._echo_suppressor
+
+    @echo_suppressor.setter
+    def echo_suppressor(self, value):
+        """
+        Parameters
+        ----------
+        value: pepper.sensor.echo.EchoSuppressor or None
+        """
+        self._echo_suppressor = value
+
+    @property
+    def talking(self):
+        """
+        Returns
+        -------
+        talking: bool
+            Whether speech is currently being played back
+        """
+        return self._talking
+
     def say(self, text):
         """
         Say something through Text to Speech
@@ -30,4 +62,8 @@ class AbstractTextToSpeech(object):
         ----------
         text: str
         """
-        raise NotImplementedError()
\ No newline at end of file
+        raise NotImplementedError()
+
+    def stop(self):
+        """Stop speech currently being played back, e.g. when interrupted by a person (barge-in)"""
+        raise NotImplementedError()
@@ -1,6 +1,6 @@
 from pepper.framework.abstract import AbstractBackend, AbstractComponent
 from pepper.brain import LongTermMemory
-from pepper import logger
+from pepper import config, logger
 
 from time import sleep
 
@@ -56,9 +56,13 @@ class Application(AbstractComponent):
         return self._brain
 
     def say(self, text):
-        self.backend.microphone.stop()
-        self.backend.text_to_speech.say(text)
-        self.backend.microphone.start()
+        # With barge-in, keep listening (echo suppressed) while talking, so people can interrupt
+        if config.BARGE_IN:
+            self.backend.text_to_speech.say(text)
+        else:
+            self.backend.microphone.stop()
+            self.backend.text_to_speech.say(text)
+            self.backend.microphone.start()
 
     def run(self):
         self.backend.camera.start()
@@ -1,4 +1,4 @@
-from .camera import NaoqiCamera, NaoqiCameraIndex
-from .microphone import NaoqiMicrophone
+from .camera import NaoqiCamera, NaoqiRGBDCamera, NaoqiCameraIndex
+from .microphone import NaoqiMicrophone, NaoqiBeamformingMicrophone
 from .text_to_speech import NaoqiTextToSpeech
 from .backend import NaoqiBackend
\ No newline at end of file
@@ -1,5 +1,7 @@
 from pepper.framework.abstract import AbstractBackend
-from pepper.framework.backend.naoqi import NaoqiCamera, NaoqiMicrophone, NaoqiTextToSpeech
+from pepper.framework.backend.naoqi import NaoqiCamera, NaoqiRGBDCamera, NaoqiMicrophone, NaoqiBeamformingMicrophone, \
+    NaoqiTextToSpeech
+from pepper.framework import NaoqiMicrophoneIndex
 from pepper import config
 
 import qi
@@ -10,7 +12,17 @@ class NaoqiBackend(AbstractBackend):
                  url=config.NAOQI_URL,
                  camera_resolution=config.CAMERA_RESOLUTION,
                  camera_rate=config.CAMERA_FRAME_RATE,
+                 camera_min_rate=config.CAMERA_FRAME_RATE_MIN,
+                 camera_pipelined=config.CAMERA_PIPELINED,
+                 camera_depth=config.CAMERA_DEPTH,
+                 camera_depth_resolution=config.CAMERA_DEPTH_RESOLUTION,
+                 camera_depth_tolerance=config.CAMERA_DEPTH_TOLERANCE,
                  microphone_index=config.NAOQI_MICROPHONE_INDEX,
+                 microphone_buffer=config.MICROPHONE_BUFFER,
+                 microphone_overflow=config.MICROPHONE_OVERFLOW,
+                 microphone_azimuth=config.NAOQI_BEAMFORMER_AZIMUTH,
+                 microphone_jitter_delay=config.NAOQI_MICROPHONE_JITTER_DELAY,
+                 microphone_concealment=config.NAOQI_MICROPHONE_CONCEALMENT,
                  language=config.LANGUAGE):
         """
         Initialize Naoqi Backend
@@ -20,14 +32,45 @@ class NaoqiBackend(AbstractBackend):
         url: str
         camera_resolution: pepper.framework.abstract.camera.CameraResolution
         camera_rate: int
+        camera_min_rate: int
+        camera_pipelined: bool
+        camera_depth: bool
+            Whether to pair camera frames with depth frames (see NaoqiRGBDCamera)
+        camera_depth_resolution: pepper.framework.abstract.camera.CameraResolution
+        camera_depth_tolerance: float
         microphone_index: int
+            Microphone to use, NaoqiMicrophoneIndex.ALL beamforms all microphones (see NaoqiBeamformingMicrophone)
+        microphone_buffer: float
+        microphone_overflow: pepper.framework.OverflowPolicy
+        microphone_azimuth: float
+        microphone_jitter_delay: float
+            Maximum amount of audio [s] to hold while waiting for a missing (reordered) block
+        microphone_concealment: pepper.framework.GapConcealment
         language: str
         """
         self._url = url
         self._session = self.create_session(self._url)
 
-        super(NaoqiBackend, self).__init__(NaoqiCamera(self.session, camera_resolution, camera_rate),
-                                           NaoqiMicrophone(self.session, microphone_index),
+        if camera_depth:
+            camera = NaoqiRGBDCamera(self.session, camera_resolution, camera_rate,
+                                     min_rate=camera_min_rate, pipelined=camera_pipelined,
+                                     depth_resolution=camera_depth_resolution, tolerance=camera_depth_tolerance)
+        else:
+            camera = NaoqiCamera(self.session, camera_resolution, camera_rate,
+                                 min_rate=camera_min_rate, pipelined=camera_pipelined)
+
+        if microphone_index == NaoqiMicrophoneIndex.ALL:
+            microphone = NaoqiBeamformingMicrophone(self.session, buffer=microphone_buffer,
+                                                    overflow=microphone_overflow, azimuth=microphone_azimuth,
+                                                    jitter_delay=microphone_jitter_delay,
+                                                    concealment=microphone_concealment)
+        else:
+            microphone = NaoqiMicrophone(self.session, microphone_index,
+                                         buffer=microphone_buffer, overflow=microphone_overflow,
+                                         jitter_delay=microphone_jitter_delay, concealment=microphone_concealment)
+
+        super(NaoqiBackend, self).__init__(camera,
+                                           microphone,
                                            NaoqiTextToSpeech(self.session, language))
 
     @property
@@ -1,16 +1,27 @@
-from pepper.framework.abstract.camera import AbstractCamera
-from pepper.framework import NaoqiCameraIndex, CameraResolution
+from pepper.framework.abstract.camera import AbstractCamera, Frame
+from pepper.framework import NaoqiCameraIndex, CameraResolution, ColorSpace
+from pepper.util.yuv import YUV422Converter, yuv422_to_luma
 
 import numpy as np
 
 from random import getrandbits
-from threading import Thread
+from threading import Thread, Lock
+from collections import deque
+from Queue import Queue
 from time import time, sleep
 
 class NaoqiCamera(AbstractCamera):
 
     SERVICE = "ALVideoDevice"
     COLOR_SPACE = 9 # YUV442
+    COLOR_SPACE_LUMA = 0  # Y only
+    COLOR_SPACE_DEPTH = 17  # Distance [mm] as uint16
+
+    # Naoqi colour space to subscribe with, for colour spaces needed by subscribers
+    COLOR_SPACE_CODE = {
+        ColorSpace.RGB: COLOR_SPACE,  # RGB is converted on this machine, luma comes for free
+        ColorSpace.LUMA: COLOR_SPACE_LUMA,  # Luma only, halves bandwidth
+    }
 
     RESOLUTION_CODE = {
         CameraResolution.NATIVE: 2,
@@ -23,7 +34,8 @@ class NaoqiCamera(AbstractCamera):
     }
 
 
-    def __init__(self, session, resolution, rate, callbacks=[], index=NaoqiCameraIndex.TOP):
+    def __init__(self, session, resolution, rate, callbacks=None, index=NaoqiCameraIndex.TOP, min_rate=None,
+                 pipelined=False):
         """
         Naoqi Camera
 
@@ -34,73 +46,288 @@ class NaoqiCamera(AbstractCamera):
         resolution: CameraResolution
             Camera Resolution
         rate: int
-            Camera Rate
+            (Maximum) Camera Rate
         callbacks: list of callable
             On Image Event Callbacks
         index: int
             Which Camera to choose
+        min_rate: int
+            Minimum Camera Rate, when adapting to throughput of throttling subscribers
+        pipelined: bool
+            Whether to fetch the next image from the robot while the previous image is converted and published
         """
-        super(NaoqiCamera, self).__init__(resolution, rate, callbacks)
+        super(NaoqiCamera, self).__init__(resolution, rate, callbacks, min_rate)
 
         # Get random camera id, to prevent name collision
         self._id = str(getrandbits(128))
 
         self._resolution = resolution
-        self._rate = rate
         self._index = index
 
+        # YUV422 -> RGB Converter, (re)created when the image size is known/changes
+        self._converter = None
+
         # Connect to Camera Service and Subscribe with Settings
+        self._color_space = NaoqiCamera.COLOR_SPACE_DEPTH if index == NaoqiCameraIndex.DEPTH else NaoqiCamera.COLOR_SPACE
         self._service = session.service(NaoqiCamera.SERVICE)
         self._client = self._service.subscribeCamera(
-            self._id, int(index), NaoqiCamera.RESOLUTION_CODE[resolution], NaoqiCamera.COLOR_SPACE, rate)
+            self._id, int(index), NaoqiCamera.RESOLUTION_CODE[resolution], self._color_space, rate)
 
-        # Run image acquisition in Thread
-        self._thread = Thread(target=self._run)
-        self._thread.setDaemon(True)
-        self._thread.start()
+        # Run image acquisition in Thread(s)
+        if pipelined:
+            # Fetched images are handed over to the publishing thread, one at a time
+            self._results = Queue(maxsize=1)
+            self._threads = [Thread(target=self._run_fetch), Thread(target=self._run_publish)]
+        else:
+            self._threads = [Thread(target=self._run)]
+
+        for thread in self._threads:
+            thread.setDaemon(True)
+            thread.start()
 
         self._log.debug("Booted")
 
     def _run(self):
         while True:
-            if self._running:
+            self._wait_running()
+
+            t0 = time()
+
+            self._publish(*self._fetch())
+
+            # Maintain frame rate
+            sleep(max(0, 1. / self.rate - (time() - t0)))
+
+    def _run_fetch(self):
+        while True:
+            self._wait_running()
+
+            t0 = time()
+
+            # Blocks while the publishing thread is still busy with the previous image
+            self._results.put(self._fetch())
+
+            # Maintain frame rate
+            sleep(max(0, 1. / self.rate - (time() - t0)))
+
+    def _run_publish(self):
+        while True:
+            self._publish(*self._results.get())
+
+    def _fetch(self):
+        """
+        Get Image from Robot
+
+        Returns
+        -------
+        result: list
+            getImageRemote result
+        receive_time: float
+            Time [s] the result was received
+        """
+        self._negotiate_color_space()
+
+        result = self._service.getImageRemote(self._client)
+        receive_time = time()
+
+        if not result:
+            self._service.unsubscribe(self._id)
+            raise RuntimeError("{} could not fetch image".format(self.__class__.__name__))
+
+        return result, receive_time
+
+    def _publish(self, result, receive_time):
+        """
+        Convert Image from Robot and call On Image Event
+
+        Parameters
+        ----------
+        result: list
+            getImageRemote result
+        receive_time: float
+            Time [s] the result was received
+        """
+
+        # Split Data
+        X, Y, layers, color_space, seconds, microseconds, data, camera, \
+        angle_left, angle_top, angle_right, angle_bottom = result
+
+        # Robot timestamp of capture & camera angles
+        capture_time = seconds + microseconds / 1E6
+        angles = (angle_left, angle_top, angle_right, angle_bottom)
+
+        image = luma = None
+
+        if self._index == NaoqiCameraIndex.DEPTH:
+            # Depth Images come as uint16
+            image = np.frombuffer(data, np.uint16).reshape(Y, X)
+        elif color_space == NaoqiCamera.COLOR_SPACE_LUMA:
+            luma = np.frombuffer(data, np.uint8).reshape(Y, X)
+        else:
+            # Luma is part of YUV422 and comes without conversion
+            luma = yuv422_to_luma(data, X, Y)
+
+            # YUV442 -> RGB Conversion(, which is faster on this machine than on the robot), only when needed
+            if ColorSpace.RGB in self.color_spaces:
+                if not self._converter or (self._converter.width, self._converter.height) != (X, Y):
+                    self._converter = YUV422Converter(X, Y)
+
+                image = self._converter.convert(data)
+
+        # Call On Image Event
+        self.on_image(Frame(image, capture_time, receive_time, angles, luma))
+
+    def _negotiate_color_space(self):
+        """Subscribe to Y only, if all subscribers need luma only, and to YUV422 otherwise"""
+        if self._index == NaoqiCameraIndex.DEPTH:
+            return
+
+        color_spaces = self.color_spaces
+        color_space = NaoqiCamera.COLOR_SPACE_CODE[ColorSpace.LUMA if color_spaces == {ColorSpace.LUMA}
+                                                   else ColorSpace.RGB]
+
+        if color_space != self._color_space:
+            self._log.debug("Switching to Naoqi colour space {}".format(color_space))
+            self._service.setColorSpace(self._client, color_space)
+            self._color_space = color_space
+
+
+class NaoqiRGBDCamera(NaoqiCamera):
 
-                t0 = time()
+    DEPTH_BUFFER = 4  # Number of recent depth frames to pair colour frames with
+    PENDING = 2  # Number of colour frames waiting for a depth frame, before they are published without depth
 
-                # Get Image from Robot
-                result = self._service.getImageRemote(self._client)
+    def __init__(self, session, resolution, rate, callbacks=None, min_rate=None, pipelined=False,
+                 depth_resolution=CameraResolution.QVGA, tolerance=0.05):
+        """
+        Naoqi RGB-D Camera: Top Camera Frames, paired with Depth Camera Frames by robot timestamp
+
+        Published Frames share image and depth buffers with the frames they were paired from (see Frame.depth).
+        Colour frames without a depth frame within tolerance are published without depth.
+
+        Parameters
+        ----------
+        session: qi.Session
+            Qi Application Session
+        resolution: CameraResolution
+            (Colour) Camera Resolution
+        rate: int
+            (Maximum) Camera Rate
+        callbacks: list of callable
+            On Image Event Callbacks
+        min_rate: int
+            Minimum Camera Rate, when adapting to throughput of throttling subscribers
+        pipelined: bool
+            Whether to fetch the next image from the robot while the previous image is converted and published
+        depth_resolution: CameraResolution
+            Depth Camera Resolution
+        tolerance: float
+            Maximum difference [s] between colour and depth capture time, for them to be paired
+        """
+        self._tolerance = tolerance
+
+        self._colour_frames = deque()
+        self._depth_frames = deque([], maxlen=NaoqiRGBDCamera.DEPTH_BUFFER)
+        self._pair_lock = Lock()
+
+        # Depth Camera Stream, in its own acquisition loop (at maximum rate, so every colour frame can be paired)
+        self._depth_camera = NaoqiCamera(session, depth_resolution, rate, index=NaoqiCameraIndex.DEPTH)
+        self._depth_camera.subscribe(self._on_depth)
+
+        super(NaoqiRGBDCamera, self).__init__(session, resolution, rate, callbacks, NaoqiCameraIndex.TOP,
+                                              min_rate, pipelined)
 
-                if result:
+    @property
+    def tolerance(self):
+        """
+        Returns
+        -------
+        tolerance: float
+            Maximum difference [s] between colour and depth capture time, for them to be paired
+        """
+        return self._tolerance
+
+    @property
+    def depth_camera(self):
+        """
+        Returns
+        -------
+        depth_camera: NaoqiCamera
+            Depth Camera Stream
+        """
+        return self._depth_camera
 
-                    # Split Data
-                    X, Y, layers, color_space, seconds, milliseconds, data, camera, \
-                    angle_left, angle_top, angle_right, angle_bottom = result
+    def on_image(self, frame):
+        """
+        On (Colour) Image Event, publishes frame once it is paired with a depth frame
+
+        Parameters
+        ----------
+        frame: Frame
+        """
+        with self._pair_lock:
+            self._colour_frames.append(frame)
+            frames = self._pair()
+
+        for frame in frames:
+            super(NaoqiRGBDCamera, self).on_image(frame)
+
+    def start(self):
+        """Start Streaming Colour and Depth Images from Camera"""
+        self._depth_camera.start()
+        super(NaoqiRGBDCamera, self).start()
+
+    def stop(self):
+        """Stop Streaming Colour and Depth Images from Camera"""
+        super(NaoqiRGBDCamera, self).stop()
+        self._depth_camera.stop()
+
+    def _on_depth(self, frame):
+        """
+        On Depth Image Event
+
+        Parameters
+        ----------
+        frame: Frame
+        """
+        with self._pair_lock:
+            self._depth_frames.append(frame)
+            frames = self._pair()
+
+        for frame in frames:
+            super(NaoqiRGBDCamera, self).on_image(frame)
+
+    def _pair(self):
+        """
+        Pair waiting colour frames with depth frames (call with pair lock)
+
+        Returns
+        -------
+        frames: list of Frame
+            Colour frames ready to be published, in order, with depth if it could be paired
+        """
+        frames = []
 
-                    if self._index == NaoqiCameraIndex.DEPTH:
-                        # Depth Images come as uint16
-                        self.on_image(np.frombuffer(data, np.uint16).reshape(Y, X))
-                    else:
-                        # Some Color Math: YUV442 -> RGB Conversion(, which is faster on this machine than on the robot)
-                        X2 = X // 2
+        while self._colour_frames:
+            colour = self._colour_frames[0]
 
-                        YUV442 = np.frombuffer(data, np.uint8).reshape(Y, X2, 4)
+            if self._depth_frames:
+                depth = min(self._depth_frames, key=lambda frame: abs(frame.capture_time - colour.capture_time))
 
-                        RGB = np.empty((Y, X2, 2, 3), np.float32)
-                        RGB[:, :, 0, :] = YUV442[..., 0].reshape(Y, X2, 1)
-                        RGB[:, :, 1, :] = YUV442[..., 2].reshape(Y, X2, 1)
+                if abs(depth.capture_time - colour.capture_time) <= self.tolerance:
+                    frames.append(self._colour_frames.popleft().with_depth(depth.image))
+                    continue
 
-                        Cr = (YUV442[..., 1].astype(np.float32) - 128.0).reshape(Y, X2, 1)
-                        Cb = (YUV442[..., 3].astype(np.float32) - 128.0).reshape(Y, X2, 1)
+                if self._depth_frames[-1].capture_time > colour.capture_time + self.tolerance:
+                    # Depth frames arrive in order: no future depth frame will match this colour frame
+                    frames.append(self._colour_frames.popleft())
+                    continue
 
-                        RGB[..., 0] += np.float32(1.402) * Cb
-                        RGB[..., 1] += - np.float32(0.71414) * Cb - np.float32(0.34414) * Cr
-                        RGB[..., 2] += np.float32(1.772) * Cr
+            if len(self._colour_frames) > NaoqiRGBDCamera.PENDING:
+                # Depth stream lags too far behind (or stalled): don't hold up the colour stream
+                frames.append(self._colour_frames.popleft())
+                continue
 
-                        # Call On Image Event
-                        self.on_image(RGB.clip(0, 255).astype(np.uint8).reshape(Y, X, 3))
-                else:
-                    self._service.unsubscribe(self._id)
-                    raise RuntimeError("{} could not fetch image".format(self.__class__.__name__))
+            break
 
-                # Maintain frame rate
-                sleep(max(0, 1. / self.rate - (time() - t0)))
\ No newline at end of file
+        return frames
@@ -1,17 +1,37 @@
-from pepper.framework.abstract.microphone import AbstractMicrophone
-from pepper.framework import NaoqiMicrophoneIndex
+from pepper.framework.abstract.microphone import AbstractMicrophone, JitterBuffer
+from pepper.framework import NaoqiMicrophoneIndex, OverflowPolicy, GapConcealment
+from pepper.sensor.beamformer import Beamformer
 import numpy as np
 
+from collections import deque
+from threading import Lock
+from time import time
+
 
 class NaoqiMicrophone(AbstractMicrophone):
 
     SERVICE = "ALAudioDevice"
     RATE = 16000
+    RATE_ALL = 48000  # Naoqi only streams all (4) channels at 48 kHz
+
+    LOSS_REPORT_INTERVAL = 1.0  # Minimum time [s] between network loss warnings
 
-    def __init__(self, session, index, callbacks = []):
+    # Microphone positions [m] (x: front, y: left, z: up) relative to the head, in NaoqiMicrophoneIndex.ALL channel order
+    POSITIONS = np.array([
+        [-0.0195, 0.0606, 0.0664],  # Left
+        [-0.0195, -0.0606, 0.0664],  # Right
+        [0.0489, 0.0, 0.0760],  # Front
+        [-0.0461, 0.0, 0.0718],  # Rear
+    ])
+
+    def __init__(self, session, index, callbacks=None, buffer=2.0, overflow=OverflowPolicy.DROP_OLDEST,
+                 jitter_delay=0.1, concealment=GapConcealment.INTERPOLATE):
         """
         Naoqi Microphone
 
+        Audio arrives over the network and passes a JitterBuffer, which reorders late blocks and conceals lost ones,
+        so callbacks see a continuous stream. Network loss is reported separately from buffer overflows (host overload).
+
         Parameters
         ----------
         session: qi.Session
@@ -20,9 +40,28 @@ class NaoqiMicrophone(AbstractMicrophone):
             Which Microphone to Use
         callbacks: list of callable
             On Audio Callbacks
+        buffer: float
+            Audio buffer size [s]
+        overflow: OverflowPolicy
+            What to do with new audio when a callback falls a full buffer behind
+        jitter_delay: float
+            Maximum amount of audio [s] to hold while waiting for a missing (reordered) block
+        concealment: GapConcealment
+            How to fill gaps left by lost blocks
         """
-        super(NaoqiMicrophone, self).__init__(
-            NaoqiMicrophone.RATE, 4 if index == NaoqiMicrophoneIndex.ALL else 1, callbacks)
+        if index == NaoqiMicrophoneIndex.ALL:
+            rate, channels = NaoqiMicrophone.RATE_ALL, len(NaoqiMicrophone.POSITIONS)
+        else:
+            rate, channels = NaoqiMicrophone.RATE, 1
+
+        super(NaoqiMicrophone, self).__init__(rate, channels, callbacks, buffer, overflow)
+
+        self._index = index
+
+        self._jitter_buffer = JitterBuffer(rate, channels, jitter_delay, concealment)
+        self._jitter_buffer_lock = Lock()  # Naoqi may call processRemote concurrently, deliver blocks in order
+        self._lost_reported = 0
+        self._lost_t0 = 0
 
         # Register Service and Subscribe this class as callback
         self._service = session.service(NaoqiMicrophone.SERVICE)
@@ -32,6 +71,26 @@ class NaoqiMicrophone(AbstractMicrophone):
 
         self._log.debug("Booted")
 
+    @property
+    def positions(self):
+        """
+        Returns
+        -------
+        positions: np.ndarray or None
+            Positions [m] (x: front, y: left, z: up) of channels, when streaming all microphones
+        """
+        return NaoqiMicrophone.POSITIONS if self._index == NaoqiMicrophoneIndex.ALL else None
+
+    @property
+    def jitter_buffer(self):
+        """
+        Returns
+        -------
+        jitter_buffer: JitterBuffer
+            Jitter Buffer, with network loss and jitter statistics
+        """
+        return self._jitter_buffer
+
     def processRemote(self, channels, samples, timestamp, buffer):
         """
         Process Audio Window from Pepper/Nao
@@ -45,9 +104,147 @@ class NaoqiMicrophone(AbstractMicrophone):
         samples: int
             Number of Samples
         timestamp: (int, int)
-            seconds, millis since boot
+            seconds, microseconds since boot (of first sample)
         buffer: bytes
             Audio Buffer
         """
         audio = np.frombuffer(buffer, np.int16)
-        self.on_audio(audio)
\ No newline at end of file
+
+        with self._jitter_buffer_lock:
+            for block in self._jitter_buffer.push(audio, timestamp[0] + timestamp[1] / 1E6):
+                self.on_audio(block)
+
+        jitter_buffer = self._jitter_buffer
+        t1 = time()
+
+        if jitter_buffer.gaps > self._lost_reported and t1 - self._lost_t0 > self.LOSS_REPORT_INTERVAL:
+            self._log.warning("<< Network Audio lost in {} gap(s), concealed: {} >>".format(
+                jitter_buffer.gaps - self._lost_reported, jitter_buffer))
+            self._lost_reported = jitter_buffer.gaps
+            self._lost_t0 = t1
+
+
+class NaoqiBeamformingMicrophone(AbstractMicrophone):
+
+    ANCHORS = 1024  # Number of recent blocks to map (beamformed) stream positions onto the array stream for
+
+    def __init__(self, session, callbacks=None, buffer=2.0, overflow=OverflowPolicy.DROP_OLDEST, azimuth=0.0,
+                 jitter_delay=0.1, concealment=GapConcealment.INTERPOLATE):
+        """
+        Naoqi Beamforming Microphone: all (4) Naoqi microphone channels, beamformed into one 16 kHz mono stream
+
+        Parameters
+        ----------
+        session: qi.Session
+            Qi Application Session
+        callbacks: list of callable
+            On Audio Callbacks
+        buffer: float
+            Audio buffer size [s]
+        overflow: OverflowPolicy
+            What to do with new audio when a callback falls a full buffer behind
+        azimuth: float
+            Initial steering direction [rad] in horizontal plane (0: front, pi/2: left), see steer
+        jitter_delay: float
+            Maximum amount of audio [s] to hold while waiting for a missing (reordered) block
+        concealment: GapConcealment
+            How to fill gaps left by lost blocks
+        """
+        super(NaoqiBeamformingMicrophone, self).__init__(NaoqiMicrophone.RATE, 1, callbacks, buffer, overflow)
+
+        self._beamformer = Beamformer(NaoqiMicrophone.POSITIONS, NaoqiMicrophone.RATE_ALL, self.rate, azimuth)
+
+        # Stream position of each beamformed block, with the array stream position of the block it was beamformed from
+        self._anchors = deque(maxlen=self.ANCHORS)
+
+        # Beamform on Naoqi Microphone Subscriber thread
+        self._microphone = NaoqiMicrophone(session, NaoqiMicrophoneIndex.ALL, [self._on_channels], buffer, overflow,
+                                           jitter_delay, concealment)
+
+    @property
+    def microphone(self):
+        """
+        Returns
+        -------
+        microphone: NaoqiMicrophone
+            Multi-channel Microphone that is beamformed
+        """
+        return self._microphone
+
+    @property
+    def array(self):
+        """
+        Returns
+        -------
+        array: NaoqiMicrophone
+            Multi-channel Microphone that is beamformed
+        """
+        return self._microphone
+
+    @property
+    def beamformer(self):
+        """
+        Returns
+        -------
+        beamformer: Beamformer
+        """
+        return self._beamformer
+
+    def array_position(self, position):
+        """
+        Map Stream Position of this Microphone onto the Stream of its Array, accounting for beamformer latency
+
+        Parameters
+        ----------
+        position: int
+            Position [samples] in this (beamformed) microphone's stream
+
+        Returns
+        -------
+        array_position: int or None
+            Position [samples per channel] of the same sound in the array's stream (None: position too old)
+        """
+        for start, array_start in reversed(list(self._anchors)):
+            if start <= position:
+                return array_start + int(round((position - start) * self._microphone.rate / float(self.rate))) - \
+                       self._beamformer.HALF_WIDTH
+        return None
+
+    def steer(self, azimuth, elevation=0.0):
+        """
+        Steer Microphone towards Direction, e.g. of a speaker (may be called from any thread)
+
+        Parameters
+        ----------
+        azimuth: float
+            Direction [rad] in horizontal plane (0: front, pi/2: left)
+        elevation: float
+            Direction [rad] above horizontal plane
+        """
+        self._beamformer.steer(azimuth, elevation)
+
+    def start(self):
+        """Start Microphone Stream"""
+        self._microphone.start()
+        super(NaoqiBeamformingMicrophone, self).start()
+
+    def stop(self):
+        """Stop Microphone Stream"""
+        super(NaoqiBeamformingMicrophone, self).stop()
+        self._microphone.stop()
+
+    def _on_channels(self, audio):
+        """
+        On Multi-Channel Audio Event
+
+        Parameters
+        ----------
+        audio: np.ndarray
+            Interleaved (left, right, front, rear) audio
+        """
+        position = self._microphone.position(self._on_channels)
+
+        if position is not None:
+            self._anchors.append((self._ring_buffer.written, position))
+
+        self.on_audio(self._beamformer.process(audio))
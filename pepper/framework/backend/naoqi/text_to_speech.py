@@ -4,6 +4,9 @@ from pepper.framework.abstract.text_to_speech import AbstractTextToSpeech
 class NaoqiTextToSpeech(AbstractTextToSpeech):
 
     SERVICE = "ALAnimatedSpeech"
+    SERVICE_TTS = "ALTextToSpeech"
+
+    ACTIVITY_INTERVAL = 0.1  # Interval [s] at which playback activity is registered with the Echo Suppressor
 
     def __init__(self, session, language):
         """
@@ -18,6 +21,7 @@ class NaoqiTextToSpeech(AbstractTextToSpeech):
 
         # Subscribe to Naoqi Text to Speech Service
         self._service = session.service(NaoqiTextToSpeech.SERVICE)
+        self._tts = session.service(NaoqiTextToSpeech.SERVICE_TTS)
 
         self._log.debug("Booted")
 
@@ -25,9 +29,27 @@ class NaoqiTextToSpeech(AbstractTextToSpeech):
         """
         Say something through Text to Speech
 
+        Speech is synthesized on the robot, so only its activity (not its audio) is known to the Echo Suppressor
+
         Parameters
         ----------
         text: str
         """
         self._log.info(text)
-        self._service.say(text)
\ No newline at end of file
+
+        future = self._service.say(text, _async=True)
+        self._talking = True
+
+        try:
+            while not future.isFinished():
+                if self.echo_suppressor:
+                    self.echo_suppressor.reference_activity(2 * self.ACTIVITY_INTERVAL)
+                future.wait(int(self.ACTIVITY_INTERVAL * 1000))
+        finally:
+            self._talking = False
+
+    def stop(self):
+        """Stop speech currently being played back, e.g. when interrupted by a person (barge-in)"""
+        if self._talking:
+            self._log.info("<< Stopped Speaking >>")
+            self._tts.stopAll()
@@ -7,8 +7,13 @@ class SystemBackend(AbstractBackend):
     def __init__(self,
                  camera_resolution=config.CAMERA_RESOLUTION,
                  camera_rate=config.CAMERA_FRAME_RATE,
+                 camera_min_rate=config.CAMERA_FRAME_RATE_MIN,
+                 camera_grab=config.CAMERA_GRAB,
                  microphone_channels=config.MICROPHONE_CHANNELS,
                  microphone_rate=config.MICROPHONE_SAMPLE_RATE,
+                 microphone_buffer=config.MICROPHONE_BUFFER,
+                 microphone_overflow=config.MICROPHONE_OVERFLOW,
+                 microphone_device_rate=config.MICROPHONE_DEVICE_RATE,
                  language=config.LANGUAGE):
         """
         Initialize System Backend
@@ -17,11 +22,19 @@ class SystemBackend(AbstractBackend):
         ----------
         camera_resolution: pepper.framework.abstract.camera.CameraResolution
         camera_rate: int
+        camera_min_rate: int
+        camera_grab: bool
         microphone_channels: int
         microphone_rate: int
+        microphone_buffer: float
+        microphone_overflow: pepper.framework.OverflowPolicy
+        microphone_device_rate: int
         language: str
         """
 
-        super(SystemBackend, self).__init__(SystemCamera(camera_resolution, camera_rate),
-                                            SystemMicrophone(microphone_rate, microphone_channels),
+        super(SystemBackend, self).__init__(SystemCamera(camera_resolution, camera_rate, min_rate=camera_min_rate,
+                                                         grab=camera_grab),
+                                            SystemMicrophone(microphone_rate, microphone_channels,
+                                                             buffer=microphone_buffer, overflow=microphone_overflow,
+                                                             device_rate=microphone_device_rate),
                                             SystemTextToSpeech(language))
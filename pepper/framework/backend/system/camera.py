@@ -1,5 +1,5 @@
-from pepper.framework.abstract import AbstractCamera
-from pepper.framework import CameraResolution
+from pepper.framework.abstract import AbstractCamera, Frame
+from pepper.framework import CameraResolution, ColorSpace
 
 import cv2
 
@@ -8,7 +8,11 @@ from time import time, sleep
 
 
 class SystemCamera(AbstractCamera):
-    def __init__(self, resolution, rate, callbacks = [], index=0):
+
+    FOURCC = 'MJPG'  # Requested capture format: compressed, so grabbed frames are only decoded when retrieved
+    BUFFER = 4  # Number of frames the device (driver) may have buffered, flushed when resuming
+
+    def __init__(self, resolution, rate, callbacks=None, index=0, min_rate=None, grab=True):
         """
         System Camera
 
@@ -16,13 +20,20 @@ class SystemCamera(AbstractCamera):
         ----------
         resolution: pepper.framework.CameraResolution
         rate: int
+            (Maximum) Camera Rate
         callbacks: list of callable
         index: int
+        min_rate: int
+            Minimum Camera Rate, when adapting to throughput of throttling subscribers
+        grab: bool
+            Whether to grab frames continuously and only retrieve (decode) the newest frame when one is due,
+            instead of reading a (possibly stale, buffered) frame and sleeping until the next one is due
         """
-        super(SystemCamera, self).__init__(resolution, rate, callbacks)
+        super(SystemCamera, self).__init__(resolution, rate, callbacks, min_rate)
 
-        # Get Camera and request resolution
+        # Get Camera and request capture format & resolution
         self._camera = cv2.VideoCapture(index)
+        self._camera.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*SystemCamera.FOURCC))
 
         if not self.resolution == CameraResolution.NATIVE:
             self._camera.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
@@ -32,8 +43,17 @@ class SystemCamera(AbstractCamera):
         if not self._camera.isOpened():
             raise RuntimeError("{} could not be opened".format(self.__class__.__name__))
 
+        # Only resize when the camera did not accept the requested resolution
+        self._capture_size = (int(self._camera.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                              int(self._camera.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        self._resize = self.resolution != CameraResolution.NATIVE and self._capture_size != (self.width, self.height)
+
+        if self._resize:
+            self._log.debug("Capturing at {}x{}, resizing to {}x{}".format(
+                self._capture_size[0], self._capture_size[1], self.width, self.height))
+
         # Run Image acquisition in Thread
-        self._thread = Thread(target=self._run)
+        self._thread = Thread(target=self._run_grab if grab else self._run)
         self._thread.setDaemon(True)
         self._thread.start()
 
@@ -41,24 +61,74 @@ class SystemCamera(AbstractCamera):
 
     def _run(self):
         while True:
+            self._wait_running()
 
             t0 = time()
 
             # Get frame from camera
             status, image = self._camera.read()
+            capture_time = time()
 
-            if status:
-                if self._running:
-
-                    # Resize Image and Convert to RGB
-                    image = cv2.resize(image, (self.width, self.height))
-                    image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            if not status:
+                self._fail()
 
-                    # Call On Image Event
-                    self.on_image(image)
-            else:
-                self._camera.release()
-                raise RuntimeError("{} could not fetch image".format(self.__class__.__name__))
+            self._publish(image, capture_time)
 
             # Maintain frame rate
-            sleep(max(0, 1. / self.rate - (time() - t0)))
\ No newline at end of file
+            sleep(max(0, 1. / self.rate - (time() - t0)))
+
+    def _run_grab(self):
+        t0 = 0
+
+        while True:
+            if not self.running:
+                self._wait_running()
+
+                # Drop frames the device buffered while the camera was stopped
+                for i in range(SystemCamera.BUFFER):
+                    self._camera.grab()
+
+            # Grab every frame, so the device buffer never serves stale frames
+            if not self._camera.grab():
+                self._fail()
+            capture_time = time()
+
+            # Only retrieve (decode) the newest frame, when one is due
+            if capture_time - t0 >= 1. / self.rate:
+                t0 = capture_time
+
+                status, image = self._camera.retrieve()
+
+                if not status:
+                    self._fail()
+
+                self._publish(image, capture_time)
+
+    def _publish(self, image, capture_time):
+        """
+        Convert Image from Camera and call On Image Event
+
+        Parameters
+        ----------
+        image: np.ndarray
+            BGR Image
+        capture_time: float
+            Time [s] the image was captured
+        """
+
+        # Resize Image (if necessary) and Convert to RGB, or to luma only if that is all subscribers need
+        if self._resize:
+            image = cv2.resize(image, (self.width, self.height))
+
+        if self.color_spaces == {ColorSpace.LUMA}:
+            frame = Frame(None, capture_time, luma=cv2.cvtColor(image, cv2.COLOR_BGR2GRAY))
+        else:
+            frame = Frame(cv2.cvtColor(image, cv2.COLOR_BGR2RGB), capture_time)
+
+        # Call On Image Event
+        self.on_image(frame)
+
+    def _fail(self):
+        """Release Camera and raise, after it failed to deliver a frame"""
+        self._camera.release()
+        raise RuntimeError("{} could not fetch image".format(self.__class__.__name__))
@@ -1,28 +1,60 @@
 from pepper.framework.abstract.microphone import AbstractMicrophone
+from pepper.framework import OverflowPolicy
+from pepper.util.resample import Resampler
 
 import pyaudio
 import numpy as np
 
 
 class SystemMicrophone(AbstractMicrophone):
-    def __init__(self, rate, channels, callbacks = []):
+    def __init__(self, rate, channels, callbacks=None, buffer=2.0, overflow=OverflowPolicy.DROP_OLDEST,
+                 device_rate=None):
         """
         System Microphone
 
         Parameters
         ----------
         rate: int
+            Sample rate of microphone audio (resampled from device rate, if they differ)
         channels: int
         callbacks: list of callable
+        buffer: float
+            Audio buffer size [s]
+        overflow: OverflowPolicy
+            What to do with new audio when a callback falls a full buffer behind
+        device_rate: int
+            Sample rate to capture at (defaults to the native rate of the default input device)
         """
-        super(SystemMicrophone, self).__init__(rate, channels, callbacks)
+        super(SystemMicrophone, self).__init__(rate, channels, callbacks, buffer, overflow)
 
-        # Open Microphone Stream
         self._pyaudio = pyaudio.PyAudio()
-        self._microphone = self._pyaudio.open(rate, channels, pyaudio.paInt16, input=True, stream_callback=self._stream)
+
+        # Capture at native device rate and resample to microphone rate
+        if device_rate is None:
+            device_rate = int(self._pyaudio.get_default_input_device_info()['defaultSampleRate'])
+
+        self._device_rate = device_rate
+        self._resampler = Resampler(device_rate, rate, channels) if device_rate != rate else None
+
+        if self._resampler:
+            self._log.debug("Resampling {} Hz -> {} Hz".format(device_rate, rate))
+
+        # Open Microphone Stream
+        self._microphone = self._pyaudio.open(device_rate, channels, pyaudio.paInt16, input=True,
+                                              stream_callback=self._stream)
 
         self._log.debug("Booted")
 
+    @property
+    def device_rate(self):
+        """
+        Returns
+        -------
+        device_rate: int
+            Sample rate audio is captured at
+        """
+        return self._device_rate
+
     def _stream(self, in_data, frame_count, time_info, status):
         """
         System Microphone Audio Stream Handler
@@ -32,5 +64,9 @@ class SystemMicrophone(AbstractMicrophone):
         in_data: bytes
         """
         audio = np.frombuffer(in_data, np.int16)
+
+        if self._resampler:
+            audio = self._resampler.process(audio)
+
         self.on_audio(audio)
         return (None, pyaudio.paContinue)
\ No newline at end of file
@@ -1,19 +1,20 @@
 from __future__ import unicode_literals
 
 from pepper.framework.abstract.text_to_speech import AbstractTextToSpeech
-from pepper import config
 
 from google.cloud import texttospeech, translate_v2
-from playsound import playsound
+import pyaudio
+import numpy as np
 
-from random import getrandbits
 from time import sleep
-import os
+import wave
+import io
 
 
 class SystemTextToSpeech(AbstractTextToSpeech):
 
-    ROOT = os.path.join(config.PROJECT_ROOT, 'tmp', 'speech')
+    RATE = 24000  # Synthesized speech sample rate [Hz]
+    BLOCK = 1024  # Samples per playback block (granularity of reference audio & stopping)
 
     def __init__(self, language):
         """
@@ -24,15 +25,17 @@ class SystemTextToSpeech(AbstractTextToSpeech):
         """
         super(SystemTextToSpeech, self).__init__(language)
 
-        if not os.path.exists(self.ROOT): os.makedirs(self.ROOT)
-
         self._client = texttospeech.TextToSpeechClient()
         self._voice = texttospeech.types.VoiceSelectionParams(language_code=language)
 
-        # Select the type of audio file you want returned
-        self._audio_config = texttospeech.types.AudioConfig(audio_encoding=texttospeech.enums.AudioEncoding.MP3)
+        # Select the type of audio file you want returned: raw audio, to be played back (and used as echo reference)
+        self._audio_config = texttospeech.types.AudioConfig(
+            audio_encoding=texttospeech.enums.AudioEncoding.LINEAR16, sample_rate_hertz=self.RATE)
+
+        self._pyaudio = pyaudio.PyAudio()
 
         self._busy = False
+        self._stopped = False
 
         self._log.debug("Booted")
 
@@ -47,6 +50,7 @@ class SystemTextToSpeech(AbstractTextToSpeech):
 
         while self._busy: sleep(0.1)
         self._busy = True
+        self._stopped = False
 
         if not self.language.startswith('en'):
             new_text = translate_v2.Client().translate(text, target_language=self.language)['translatedText']
@@ -58,13 +62,46 @@ class SystemTextToSpeech(AbstractTextToSpeech):
         synthesis_input = texttospeech.types.SynthesisInput(text=text)
         response = self._client.synthesize_speech(synthesis_input, self._voice, self._audio_config)
 
-        file_hash = os.path.join(self.ROOT, "{}.mp3".format(str(getrandbits(128))))
-        with open(file_hash, 'wb') as out:
-            out.write(response.audio_content)
+        # LINEAR16 audio content is a WAV file
+        wav = wave.open(io.BytesIO(response.audio_content))
+        audio = np.frombuffer(wav.readframes(wav.getnframes()), np.int16)
+        rate = wav.getframerate()
 
-        playsound(file_hash)
-        os.remove(file_hash)
+        self._play(audio, rate)
 
         self._busy = False
 
+    def stop(self):
+        """Stop speech currently being played back, e.g. when interrupted by a person (barge-in)"""
+        if self._talking:
+            self._log.info("<< Stopped Speaking >>")
+            self._stopped = True
+
+    def _play(self, audio, rate):
+        """
+        Play back Audio, block by block, registering each block with the Echo Suppressor (if any)
+
+        Parameters
+        ----------
+        audio: np.ndarray
+            Mono audio, dtype np.int16
+        rate: int
+        """
+        stream = self._pyaudio.open(rate, 1, pyaudio.paInt16, output=True)
+        self._talking = True
+
+        try:
+            for i in range(0, len(audio), self.BLOCK):
+                if self._stopped:
+                    break
+
+                block = audio[i:i + self.BLOCK]
+
+                if self.echo_suppressor:
+                    self.echo_suppressor.reference(block, rate)
 
+                stream.write(block.tobytes())
+        finally:
+            self._talking = False
+            stream.stop_stream()
+            stream.close()
@@ -1,6 +1,7 @@
 from .face_detection import FaceDetection
 from .object_detection import ObjectDetection
 from .speech_recognition import SpeechRecognition
+from .sound_localization import SoundLocalization
 from .statistics import Statistics
 from .video_display import VideoDisplay
 from .video_writer import VideoWriter
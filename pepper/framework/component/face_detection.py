@@ -1,9 +1,13 @@
 from pepper.framework.abstract import AbstractComponent
 from pepper.sensor.face import OpenFace, FaceClassifier
+from pepper.sensor.motion import MotionGate
 from pepper import config
 
 from Queue import Queue
 from threading import Thread
+from collections import deque
+
+import numpy as np
 
 
 class FaceDetection(AbstractComponent):
@@ -17,9 +21,13 @@ class FaceDetection(AbstractComponent):
         """
         super(FaceDetection, self).__init__(backend)
 
+        # Callbacks, called with detections and the Frame they were detected in
         self.on_face_callbacks = []
         self.on_person_callbacks = []
 
+        # Capture to Event Latency of last couple of Frames
+        self._latency = deque([], maxlen=10)
+
         # Initialize OpenFace
         open_face = OpenFace()
 
@@ -30,29 +38,55 @@ class FaceDetection(AbstractComponent):
         # Initialize Face Classifier
         face_classifier = FaceClassifier(self.known_people)
 
+        # Skip Face Detection on frames without change, reusing the last detection instead
+        self._motion_gate = MotionGate()
+        detection = {'faces': [], 'persons': []}
+
         face_queue = Queue()
         person_queue = Queue()
 
-        def on_image(image):
+        def on_image(frame):
             """
             Raw On Image Event. Called every time the camera yields a frame.
 
             Parameters
             ----------
-            image: np.ndarray
+            frame: pepper.framework.abstract.camera.Frame
+
+            Returns
+            -------
+            processed: bool
+                False if the frame was skipped by the motion gate (see CameraSubscriber)
             """
 
+            if not self._motion_gate.changed(frame.luma):
+                if not self._motion_gate.skipped % MotionGate.REPORT_INTERVAL:
+                    self.log.debug("Motion Gate skipped {:3.0%} of frames".format(self._motion_gate.skip_ratio))
+
+                # Frame unchanged: reuse last detection
+                face_queue.put((detection['faces'], frame))
+                person_queue.put((detection['persons'], frame))
+                return False
+
+            # Find Faces, with their distance if the frame has depth
+            faces = open_face.represent(frame.image)
+            for face in faces:
+                face.distance = frame.distance(face.bounds)
+
             # Find Persons
-            faces = open_face.represent(image)
             persons = [face_classifier.classify(face) for face in faces]
             persons = [person for person in persons if person.confidence > config.FACE_RECOGNITION_THRESHOLD]
 
-            face_queue.put(faces)
-            person_queue.put(persons)
+            detection.update(faces=faces, persons=persons)
+
+            face_queue.put((faces, frame))
+            person_queue.put((persons, frame))
+
+            return True
 
         def worker():
             while True:
-                faces = face_queue.get()
+                faces, frame = face_queue.get()
                 if faces:
 
                     # Call on_face Event Function
@@ -60,9 +94,9 @@ class FaceDetection(AbstractComponent):
 
                     # Call Callbacks
                     for callback in self.on_face_callbacks:
-                        callback(faces)
+                        callback(faces, frame)
 
-                persons = person_queue.get()
+                persons, frame = person_queue.get()
                 if persons:
 
                     # Call on_person Event Function
@@ -70,15 +104,37 @@ class FaceDetection(AbstractComponent):
 
                     # Call Callback Functions
                     for callback in self.on_person_callbacks:
-                        callback(persons)
+                        callback(persons, frame)
+
+                self._latency.append(frame.latency())
 
         # Initialize Queue & Worker
         thread = Thread(target=worker)
         thread.daemon = True
         thread.start()
 
-        # Add on_image to Camera Callbacks
-        self.backend.camera.callbacks += [on_image]
+        # Subscribe on_image to Camera, adapting camera frame rate to detection throughput
+        self.backend.camera.subscribe(on_image, throttle=True, scale=config.FACE_DETECTION_SCALE)
+
+    @property
+    def motion_gate(self):
+        """
+        Returns
+        -------
+        motion_gate: MotionGate
+            Motion Gate in front of Face Detection (see MotionGate.skip_ratio)
+        """
+        return self._motion_gate
+
+    @property
+    def latency(self):
+        """
+        Returns
+        -------
+        latency: float
+            Mean capture to event latency [s] of the last couple of frames
+        """
+        return float(np.mean(self._latency)) if self._latency else 0.0
 
     def on_face(self, faces):
         """
@@ -1,9 +1,13 @@
 from pepper.framework.abstract import AbstractComponent
 from pepper.sensor.obj import CocoClassifyClient, CocoObject
+from pepper.sensor.motion import MotionGate
 from pepper import config
 
 from threading import Thread
 from Queue import Queue
+from collections import deque
+
+import numpy as np
 
 
 class ObjectDetection(AbstractComponent):
@@ -17,52 +21,102 @@ class ObjectDetection(AbstractComponent):
         """
         super(ObjectDetection, self).__init__(backend)
 
-        # Callbacks
+        # Callbacks, called with the Frame (and the objects detected in it)
         self.on_image_callbacks = []
         self.on_object_callbacks = []
 
+        # Capture to Event Latency of last couple of Frames
+        self._latency = deque([], maxlen=10)
+
         # Initialize Object Classifier
         coco = CocoClassifyClient()
         queue = Queue()
 
-        def on_image(image):
+        # Skip Object Detection on frames without change, reusing the last detection instead
+        self._motion_gate = MotionGate()
+        detection = {'objects': []}
+
+        def on_image(frame):
             """
             Raw On Image Event. Called every time the camera yields a frame.
 
             Parameters
             ----------
-            image: np.ndarray
+            frame: pepper.framework.abstract.camera.Frame
+
+            Returns
+            -------
+            processed: bool
+                False if the frame was skipped by the motion gate (see CameraSubscriber)
             """
-            objects = [obj for obj in coco.classify(image) if obj.confidence > config.OBJECT_CONFIDENCE_THRESHOLD]
-            queue.put((image, objects))
+            if not self._motion_gate.changed(frame.luma):
+                if not self._motion_gate.skipped % MotionGate.REPORT_INTERVAL:
+                    self.log.debug("Motion Gate skipped {:3.0%} of frames".format(self._motion_gate.skip_ratio))
+
+                # Frame unchanged: reuse last detection
+                queue.put((frame, detection['objects']))
+                return False
+
+            objects = [obj for obj in coco.classify(frame.image) if obj.confidence > config.OBJECT_CONFIDENCE_THRESHOLD]
+            detection['objects'] = objects
+
+            # Attach distance to objects, if the frame has depth
+            for obj in objects:
+                obj.distance = frame.distance(obj.bounds)
+
+            queue.put((frame, objects))
+
+            return True
 
         def worker():
             """Object Detection Event Worker"""
             while True:
-                image, objects = queue.get()
+                frame, objects = queue.get()
 
                 # Call on_image Event Function
-                self.on_image(image)
+                self.on_image(frame.image)
 
                 # Call on_image Callback Functions
                 for callback in self.on_image_callbacks:
-                    callback(image)
+                    callback(frame)
 
                 if objects:
                     # Call on_object Event Function
-                    self.on_object(image, objects)
+                    self.on_object(frame.image, objects)
 
                     # Call on_object Callback Functions
                     for callback in self.on_object_callbacks:
-                        callback(image, objects)
+                        callback(frame, objects)
+
+                self._latency.append(frame.latency())
 
         # Initialize Object Queue & Worker
         thread = Thread(target=worker)
         thread.daemon = True
         thread.start()
 
-        # Add on_image to Camera Callbacks
-        self.backend.camera.callbacks += [on_image]
+        # Subscribe on_image to Camera, adapting camera frame rate to detection throughput
+        self.backend.camera.subscribe(on_image, throttle=True, scale=config.OBJECT_DETECTION_SCALE)
+
+    @property
+    def motion_gate(self):
+        """
+        Returns
+        -------
+        motion_gate: MotionGate
+            Motion Gate in front of Object Detection (see MotionGate.skip_ratio)
+        """
+        return self._motion_gate
+
+    @property
+    def latency(self):
+        """
+        Returns
+        -------
+        latency: float
+            Mean capture to event latency [s] of the last couple of frames
+        """
+        return float(np.mean(self._latency)) if self._latency else 0.0
 
     def on_image(self, image):
         """
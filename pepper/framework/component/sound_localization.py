@@ -0,0 +1,137 @@
+from pepper.framework.abstract import AbstractComponent
+from pepper.framework.component import SpeechRecognition
+from pepper.sensor.localization import SoundLocalizer
+from pepper import config
+
+from collections import deque
+
+
+class SoundLocalization(AbstractComponent):
+
+    HISTORY = 20.0  # Array audio [s] to keep, to localize voiced segments (of up to config.VAD_MAX_DURATION) when they end
+
+    def __init__(self, backend):
+        """
+        Construct Sound Localization Component
+
+        Estimates the direction of each voiced segment (see SpeechRecognition.vad) from the microphone array,
+        using the array audio of the same stream range as the utterance (see AbstractMicrophone.array_position)
+
+        Parameters
+        ----------
+        backend: AbstractBackend
+        """
+        super(SoundLocalization, self).__init__(backend)
+
+        speech_recognition = self.require_dependency(SoundLocalization, SpeechRecognition)  # type: SpeechRecognition
+
+        array = self.backend.microphone.array
+
+        if array is None:
+            raise RuntimeError("{} requires a microphone array (e.g. NaoqiMicrophoneIndex.ALL)".format(
+                self.__class__.__name__))
+
+        # Callbacks, called with direction [rad] and confidence of each voiced segment
+        self.on_sound_direction_callbacks = []
+
+        self._localizer = SoundLocalizer(array.positions, array.rate)
+        self._direction = None
+
+        # Recent array audio blocks (position, audio) and voiced segments (start, end) to localize, in array positions
+        self._history = deque()
+        self._history_length = 0
+        self._segments = deque()
+
+        def on_utterance(audio):
+            """
+            VAD On Utterance Event. Hands the array stream range of the utterance to on_audio.
+
+            Parameters
+            ----------
+            audio: np.ndarray
+            """
+            start, end = speech_recognition.vad.segment
+            start, end = self.backend.microphone.array_position(start), self.backend.microphone.array_position(end)
+
+            if start is not None and end is not None:
+                self._segments.append((start, end))
+
+        def on_audio(audio):
+            """
+            Raw On Audio Event. Called with (interleaved) audio of all channels of the microphone array.
+
+            Parameters
+            ----------
+            audio: np.ndarray
+            """
+            audio = audio.reshape(-1, array.channels)
+            position = array.position(on_audio)
+
+            self._history.append((position, audio.copy()))
+            self._history_length += len(audio)
+
+            while self._history_length - len(self._history[0][1]) >= self.HISTORY * array.rate:
+                self._history_length -= len(self._history.popleft()[1])
+
+            # Localize voiced segments, once all their audio has arrived
+            while self._segments and self._segments[0][1] <= position + len(audio):
+                self._localize(*self._segments.popleft())
+
+        speech_recognition.vad.callbacks.append(on_utterance)
+        array.callbacks.append(on_audio)
+
+    @property
+    def direction(self):
+        """
+        Returns
+        -------
+        direction: float or None
+            Direction [rad] (0: front, pi/2: left) of last voiced segment, if any
+        """
+        return self._direction
+
+    def _localize(self, start, end):
+        """
+        Localize Voiced Segment, report and steer towards its direction
+
+        Parameters
+        ----------
+        start: int
+            Array stream position [samples] of segment start
+        end: int
+            Array stream position [samples] of segment end
+        """
+        for position, audio in list(self._history):
+            first, last = max(start, position), min(end, position + len(audio))
+            if first < last:
+                self._localizer.add(audio[first - position:last - position])
+
+        azimuth, confidence = self._localizer.estimate()
+        self._localizer.reset()
+
+        if azimuth is not None and confidence > config.SOUND_LOCALIZATION_CONFIDENCE_THRESHOLD:
+            self._direction = azimuth
+
+            # Steer (beamforming) microphone towards sound
+            if config.SOUND_LOCALIZATION_STEER and hasattr(self.backend.microphone, 'steer'):
+                self.backend.microphone.steer(azimuth)
+
+            # Call on_sound_direction Event Function
+            self.on_sound_direction(azimuth, confidence)
+
+            # Call Callback Functions
+            for callback in self.on_sound_direction_callbacks:
+                callback(azimuth, confidence)
+
+    def on_sound_direction(self, azimuth, confidence):
+        """
+        On Sound Direction Event. Called every time the direction of a voiced segment is estimated.
+
+        Parameters
+        ----------
+        azimuth: float
+            Direction [rad] in horizontal plane relative to the head (0: front, pi/2: left)
+        confidence: float
+            Estimate confidence [0..1]
+        """
+        pass
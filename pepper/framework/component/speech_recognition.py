@@ -1,5 +1,5 @@
 from pepper.framework.abstract import AbstractComponent
-from pepper.sensor import VAD, GoogleASR
+from pepper.sensor import VAD, GoogleASR, ASRHypothesis, UtteranceDispatcher
 from pepper import config
 
 
@@ -15,10 +15,37 @@ class SpeechRecognition(AbstractComponent):
         super(SpeechRecognition, self).__init__(backend)
 
         self.on_transcript_callbacks = []
-        self._asr = GoogleASR(config.LANGUAGE, self.backend.microphone.rate)
+        self.on_transcript_interim_callbacks = []
+        self._asr = GoogleASR(config.LANGUAGE, self.backend.microphone.rate,
+                              translate_alternatives=config.ASR_TRANSLATE_ALTERNATIVES)
+
+        def transcribe(audio):
+            return self.asr.transcribe(audio), audio
+
+        def transcribe_stream(stream):
+            finals = []
+
+            for hypotheses, final in self.asr.transcribe_stream(stream):
+                if final:
+                    if hypotheses: finals.append(hypotheses)
+                else:
+                    # Call on_transcript_interim Event Function and Callback Functions
+                    self.on_transcript_interim(hypotheses)
+                    for callback in self.on_transcript_interim_callbacks:
+                        callback(hypotheses)
+
+            # Longer utterances may be recognized in several segments: join their best hypotheses
+            if len(finals) > 1:
+                hypotheses = [ASRHypothesis(" ".join(segment[0].transcript.strip() for segment in finals),
+                                            min(segment[0].confidence for segment in finals))]
+            else:
+                hypotheses = finals[0] if finals else []
+
+            return hypotheses, stream.audio
+
+        def on_transcript(result):
+            hypotheses, audio = result
 
-        def on_utterance(audio):
-            hypotheses = self.asr.transcribe(audio)
             if hypotheses:
 
                 # Call on_transcript Event Function
@@ -28,7 +55,23 @@ class SpeechRecognition(AbstractComponent):
                 for callback in self.on_transcript_callbacks:
                     callback(hypotheses, audio)
 
-        self._vad = VAD(self.backend.microphone, [on_utterance])
+        def on_voice():
+            # Barge-in: stop talking when interrupted
+            if config.BARGE_IN and self.backend.text_to_speech.talking:
+                self.backend.text_to_speech.stop()
+
+        # Transcribe utterances on a bounded pool of workers, publishing transcripts in order of utterance
+        self._dispatcher = UtteranceDispatcher(transcribe_stream if config.ASR_STREAMING else transcribe, on_transcript,
+                                               workers=config.VAD_UTTERANCE_WORKERS,
+                                               backlog=config.VAD_UTTERANCE_BACKLOG,
+                                               max_age=config.VAD_UTTERANCE_MAX_AGE)
+
+        if config.ASR_STREAMING:
+            # Recognize speech while utterance is being recorded, to have a transcript soon after it ends
+            self._vad = VAD(self.backend.microphone, [], voice_callbacks=[on_voice],
+                            stream_callbacks=[self._dispatcher.submit])
+        else:
+            self._vad = VAD(self.backend.microphone, [self._dispatcher.submit], voice_callbacks=[on_voice])
 
     @property
     def asr(self):
@@ -48,6 +91,16 @@ class SpeechRecognition(AbstractComponent):
         """
         return self._vad
 
+    @property
+    def dispatcher(self):
+        """
+        Returns
+        -------
+        dispatcher: pepper.sensor.vad.UtteranceDispatcher
+            Dispatches utterances to speech recognition, with queue depth and latency metrics
+        """
+        return self._dispatcher
+
     def on_transcript(self, hypotheses, audio):
         """
         On Transcript Event. Called every time an utterance was understood by Automatic Speech Recognition.
@@ -60,3 +113,15 @@ class SpeechRecognition(AbstractComponent):
             Utterance audio
         """
         pass
+
+    def on_transcript_interim(self, hypotheses):
+        """
+        On Interim Transcript Event. Called while an utterance is being recorded (config.ASR_STREAMING),
+        with hypotheses that may still change.
+
+        Parameters
+        ----------
+        hypotheses: list of ASRHypothesis
+            Hypotheses about the utterance so far
+        """
+        pass
@@ -2,6 +2,7 @@ from pepper.framework.abstract import AbstractComponent
 from pepper.framework.component import ObjectDetection, FaceDetection
 from pepper.web.server import VideoFeedApplication
 from pepper.util.image import ImageAnnotator
+from pepper import config
 
 from PIL import Image
 
@@ -24,30 +25,33 @@ class VideoDisplay(AbstractComponent):
         object_queue = Queue()
         person_queue = Queue()
 
-        self.backend.camera.callbacks.append(lambda image: image_queue.put(image))
+        self.backend.camera.subscribe(lambda frame: image_queue.put(frame), scale=config.VIDEO_DISPLAY_SCALE)
 
         object_detection = self.require_dependency(VideoDisplay, ObjectDetection)  # type: ObjectDetection
-        object_detection.on_object_callbacks.append(lambda image, objects: object_queue.put((image, objects)))
+        object_detection.on_object_callbacks.append(lambda frame, objects: object_queue.put((frame, objects)))
 
         face_detection = self.require_dependency(VideoDisplay, FaceDetection)  # type: FaceDetection
-        face_detection.on_person_callbacks.append(lambda persons: person_queue.put(persons))
+        face_detection.on_person_callbacks.append(lambda persons, frame: person_queue.put((persons, frame)))
 
         webapp = VideoFeedApplication()
         annotator = ImageAnnotator()
 
         def worker():
             while True:
-                image = image_queue.get()
+                frame = image_queue.get()
 
                 objects = persons = []
 
-                try: image, objects = object_queue.get(False)
+                # Show objects on the exact frame they were detected in
+                try: frame, objects = object_queue.get(False)
                 except Empty: pass
 
-                try: persons = person_queue.get(False)
+                # Show persons detected since the last displayed frame
+                try: persons, _ = person_queue.get(False)
                 except Empty: pass
 
-                image = annotator.annotate(Image.fromarray(image), objects, persons)
+                # Bounds are normalized, so annotate at display scale
+                image = annotator.annotate(Image.fromarray(frame.at(config.VIDEO_DISPLAY_SCALE).image), objects, persons)
                 webapp.update(image)
 
         webapp_thread = Thread(target=webapp.start)
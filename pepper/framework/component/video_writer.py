@@ -1,5 +1,6 @@
 from pepper.framework.abstract import AbstractComponent
 from pepper.util.image import ImageWriter
+from pepper import config
 
 
 class VideoWriter(AbstractComponent):
@@ -14,4 +15,4 @@ class VideoWriter(AbstractComponent):
         super(VideoWriter, self).__init__(backend)
 
         writer = ImageWriter()
-        self.backend.camera.callbacks.append(writer.write)
\ No newline at end of file
+        self.backend.camera.subscribe(lambda frame: writer.write(frame.image), scale=config.VIDEO_WRITER_SCALE)
\ No newline at end of file
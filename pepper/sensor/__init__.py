@@ -1,4 +1,8 @@
 from .asr import AbstractASR, ASRHypothesis, GoogleASR
 from .face import OpenFace, FaceClassifier, Face, Person
 from .obj import CocoClassifyClient, CocoObject
-from .vad import VAD
+from .vad import VAD, UtteranceStream, UtteranceDispatcher
+from .motion import MotionGate
+from .beamformer import Beamformer
+from .localization import SoundLocalizer
+from .echo import EchoSuppressor
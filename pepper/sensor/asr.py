@@ -3,6 +3,11 @@ from __future__ import unicode_literals
 from pepper import logger
 
 from google.cloud import speech, translate_v2
+import numpy as np
+
+from collections import OrderedDict
+from threading import Thread, Lock
+from time import time
 
 
 class ASRHypothesis(object):
@@ -27,6 +32,60 @@ class ASRHypothesis(object):
         return self._confidence
 
 
+class ASRTiming(object):
+    def __init__(self, connect, upload, recognize):
+        """
+        Automatic Speech Recognition Request Timing
+
+        Parameters
+        ----------
+        connect: float
+            Time [s] spent setting up the client's connection (on its first request), or waiting for it to be set up
+        upload: float or None
+            Time [s] spent sending audio (streaming requests only, included in recognize otherwise)
+        recognize: float
+            Time [s] from sending the (last) audio until receiving the (final) result
+        """
+        self._connect = connect
+        self._upload = upload
+        self._recognize = recognize
+
+    @property
+    def connect(self):
+        """
+        Returns
+        -------
+        connect: float
+            Time [s] spent setting up the client's connection (on its first request), or waiting for it to be set up
+        """
+        return self._connect
+
+    @property
+    def upload(self):
+        """
+        Returns
+        -------
+        upload: float or None
+            Time [s] spent sending audio (streaming requests only, included in recognize otherwise)
+        """
+        return self._upload
+
+    @property
+    def recognize(self):
+        """
+        Returns
+        -------
+        recognize: float
+            Time [s] from sending the (last) audio until receiving the (final) result
+        """
+        return self._recognize
+
+    def __repr__(self):
+        return "{}: connect={:3.0f}ms, upload={}, recognize={:3.0f}ms".format(
+            self.__class__.__name__, self.connect * 1000,
+            "-" if self.upload is None else "{:3.0f}ms".format(self.upload * 1000), self.recognize * 1000)
+
+
 class AbstractASR(object):
     def __init__(self, language):
         """
@@ -57,12 +116,47 @@ class AbstractASR(object):
         """
         raise NotImplementedError()
 
+    def transcribe_stream(self, chunks):
+        """
+        Transcribe Speech in Audio Stream, while it is being recorded
+
+        Falls back to transcribing the complete audio, once the stream has ended,
+        for implementations without streaming support.
+
+        Parameters
+        ----------
+        chunks: iterable of numpy.ndarray
+            Audio chunks, e.g. pepper.sensor.vad.UtteranceStream
+
+        Yields
+        ------
+        hypotheses: list of ASRHypothesis
+        final: bool
+            Whether hypotheses are final for (a segment of) the audio, or interim (and may still change)
+        """
+        yield self.transcribe(np.concatenate(list(chunks))), True
+
 
 class GoogleASR(AbstractASR):
-    def __init__(self, language='en-GB', sample_rate=16000, max_alternatives=20):
+
+    WARMUP = 0.1  # Duration [s] of silence recognized to set up (warm up) the connection
+
+    # Clients are thread safe and keep their connection open, so they are shared by all GoogleASR instances
+    _speech_client = None
+    _translate_client = None
+    _warm = set()  # Clients whose connection has been set up
+    _warm_locks = {}  # Client -> Lock, held while its connection is being set up
+    _clients_lock = Lock()
+
+    def __init__(self, language='en-GB', sample_rate=16000, max_alternatives=20, client=None, warmup=True,
+                 translator=None, translate_alternatives=None):
         """
         Transcribe Speech using Google Speech API
 
+        The Speech (and Translate) clients are created once and shared, so requests reuse their connection.
+        A client's connection is set up with a request on a short silence, before its first request (see timing).
+        With warmup, this is done in the background on construction, so the first utterance doesn't pay for it.
+
         Parameters
         ----------
         language: str
@@ -71,14 +165,44 @@ class GoogleASR(AbstractASR):
             Input Audio Sample Rate
         max_alternatives: int
             Maximum Number of Alternatives Google will provide
+        client: speech.SpeechClient
+            Speech Client to use (defaults to a speech.SpeechClient shared by all GoogleASR instances)
+        warmup: bool
+            Whether to set up the clients' connection in the background on construction, rather than on first request
+        translator: translate_v2.Client
+            Translate Client to use for non-English languages (defaults to a translate_v2.Client shared by all
+            GoogleASR instances)
+        translate_alternatives: int or None
+            Number of (best) hypotheses to translate, for non-English languages (None: all).
+            The other hypotheses are returned untranslated, in the recognized language
         """
         super(GoogleASR, self).__init__(language)
 
         self._sample_rate = sample_rate
         self._max_alternatives = max_alternatives
+        self._client = client
+        self._translator = translator
+        self._translate_alternatives = translate_alternatives
+
+        self._timing = None
+
+        if warmup:
+            thread = Thread(target=self._warmup)
+            thread.daemon = True
+            thread.start()
 
         self._log.debug("Booted")
 
+    @property
+    def timing(self):
+        """
+        Returns
+        -------
+        timing: ASRTiming or None
+            Timing of last (completed) request
+        """
+        return self._timing
+
     def transcribe(self, audio, hints=()):
         """
         Transcribe Speech in Audio
@@ -86,31 +210,181 @@ class GoogleASR(AbstractASR):
         Parameters
         ----------
         audio: numpy.ndarray
+        hints: tuple of str
+            Phrases likely to be spoken
 
         Returns
         -------
         hypotheses: List[ASRHypothesis]
         """
-        response = speech.SpeechClient().recognize(speech.types.RecognitionConfig(
-                encoding=speech.enums.RecognitionConfig.AudioEncoding.LINEAR16,
-                sample_rate_hertz=self._sample_rate,
-                language_code=self._language,
-                max_alternatives=self._max_alternatives,
-                speech_contexts=[speech.types.SpeechContext(phrases=hints)]),
-            speech.types.RecognitionAudio(content=audio.tobytes()))
+        t0 = time()
+        self._connect()
+
+        t1 = time()
+        response = self._client.recognize(self._config(hints), speech.types.RecognitionAudio(content=audio.tobytes()))
+
+        self._timing = ASRTiming(t1 - t0, None, time() - t1)
+        self._log.debug("{}".format(self._timing))
 
         hypotheses = []
         for result in response.results:
             for alternative in result.alternatives:
                 hypotheses.append(ASRHypothesis(alternative.transcript, alternative.confidence))
 
+        return self._translate(hypotheses)
+
+    def transcribe_stream(self, chunks, hints=()):
+        """
+        Transcribe Speech in Audio Stream, while it is being recorded (Google Streaming Speech API)
+
+        Interim hypotheses are only yielded for English, final hypotheses are translated into English.
+
+        Parameters
+        ----------
+        chunks: iterable of numpy.ndarray
+            Audio chunks, e.g. pepper.sensor.vad.UtteranceStream
+        hints: tuple of str
+            Phrases likely to be spoken
+
+        Yields
+        ------
+        hypotheses: list of ASRHypothesis
+        final: bool
+            Whether hypotheses are final for (a segment of) the audio, or interim (and may still change)
+        """
+        t0 = time()
+        self._connect()
+        t1 = time()
+
+        uploaded = []  # Time the last audio was sent
+
+        def requests():
+            for chunk in chunks:
+                yield speech.types.StreamingRecognizeRequest(audio_content=chunk.tobytes())
+            uploaded.append(time())
+
+        config = speech.types.StreamingRecognitionConfig(config=self._config(hints), interim_results=True)
+
+        for response in self._client.streaming_recognize(config, requests()):
+            t2 = time()
+
+            for result in response.results:
+                hypotheses = [ASRHypothesis(alternative.transcript, alternative.confidence)
+                              for alternative in result.alternatives]
+
+                if result.is_final:
+                    if uploaded:
+                        self._timing = ASRTiming(t1 - t0, uploaded[0] - t1, t2 - uploaded[0])
+                        self._log.debug("{}".format(self._timing))
+                    yield self._translate(hypotheses), True
+                elif self.language.startswith('en'):
+                    yield hypotheses, False
+
+    def _config(self, hints=()):
+        """
+        Recognition Config
+
+        Parameters
+        ----------
+        hints: tuple of str
+            Phrases likely to be spoken
+
+        Returns
+        -------
+        config: speech.types.RecognitionConfig
+        """
+        return speech.types.RecognitionConfig(
+            encoding=speech.enums.RecognitionConfig.AudioEncoding.LINEAR16,
+            sample_rate_hertz=self._sample_rate,
+            language_code=self._language,
+            max_alternatives=self._max_alternatives,
+            speech_contexts=[speech.types.SpeechContext(phrases=hints)])
+
+    def _translate(self, hypotheses):
+        """
+        Translate Hypotheses into English, if not already in English
+
+        The (distinct) transcripts of the best translate_alternatives hypotheses are translated in one (batched)
+        request, the other hypotheses are returned untranslated.
+
+        Parameters
+        ----------
+        hypotheses: list of ASRHypothesis
+
+        Returns
+        -------
+        hypotheses: list of ASRHypothesis
+        """
         if not self.language.startswith('en'):
-            # Translate Input Speech into English if not already in English
-            client = translate_v2.Client()
-            new_hypotheses = [ASRHypothesis(client.translate(hypothesis.transcript)['translatedText'], hypothesis.confidence) for hypothesis in hypotheses]
+            # Translate Input Speech into English if not already in English (only best translate_alternatives)
+            best = hypotheses[:self._translate_alternatives]
+
+            # Translate distinct transcripts (N-best lists often repeat them) in one request
+            transcripts = list(OrderedDict.fromkeys(hypothesis.transcript for hypothesis in best))
+            translations = {}
+
+            if transcripts:
+                translations = {transcript: translation['translatedText'] for transcript, translation in
+                                zip(transcripts, self._translator.translate(transcripts))}
+
+            new_hypotheses = [ASRHypothesis(translations[hypothesis.transcript], hypothesis.confidence) for hypothesis in best]
+            new_hypotheses += hypotheses[len(best):]
             if hypotheses: self._log.debug("[{:3.0%}] {} -> {}".format(hypotheses[0].confidence, hypotheses[0].transcript, new_hypotheses[0].transcript))
             return new_hypotheses
 
         else:
             if hypotheses: self._log.debug("[{:3.0%}] {}".format(hypotheses[0].confidence, hypotheses[0].transcript))
             return hypotheses
+
+    def _connect(self):
+        """
+        Get (shared) Speech and Translate Clients, creating them if necessary, and set up their connection
+
+        A client's connection is set up once, with its first request,
+        other requests on the client wait until it has been set up.
+        """
+        with GoogleASR._clients_lock:
+            if self._client is None:
+                if GoogleASR._speech_client is None:
+                    GoogleASR._speech_client = speech.SpeechClient()
+                self._client = GoogleASR._speech_client
+
+            if self._translator is None and not self.language.startswith('en'):
+                if GoogleASR._translate_client is None:
+                    GoogleASR._translate_client = translate_v2.Client()
+                self._translator = GoogleASR._translate_client
+
+        self._set_up(self._client, lambda: self._client.recognize(self._config(), speech.types.RecognitionAudio(
+            content=np.zeros(int(self.WARMUP * self._sample_rate), np.int16).tobytes())))
+
+        if self._translator:
+            self._set_up(self._translator, lambda: self._translator.translate("hello"))
+
+    @staticmethod
+    def _set_up(client, request):
+        """
+        Set up Connection of Client (once per client) with a Request
+
+        Parameters
+        ----------
+        client: object
+        request: callable
+            Request on client, without side effects
+        """
+        with GoogleASR._clients_lock:
+            lock = GoogleASR._warm_locks.setdefault(client, Lock())
+
+        with lock:
+            if client not in GoogleASR._warm:
+                request()
+                GoogleASR._warm.add(client)
+
+    def _warmup(self):
+        """Set up Connection of Clients in the background"""
+        t0 = time()
+
+        try:
+            self._connect()
+            self._log.debug("Warmed up in {:3.2f}s".format(time() - t0))
+        except Exception as e:
+            self._log.warning("Couldn't warm up: {}".format(e))
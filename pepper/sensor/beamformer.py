@@ -0,0 +1,218 @@
+from pepper.util.resample import Resampler
+
+import numpy as np
+
+
+class Beamformer(object):
+
+    SPEED_OF_SOUND = 343.0  # [m/s]
+
+    HALF_WIDTH = 32  # Half width [samples] of (windowed sinc) fractional delay filters, adds as much latency
+    CACHE = 8  # Number of block sizes to cache steering weights for
+
+    def __init__(self, positions, rate, output_rate=None, azimuth=0.0, elevation=0.0):
+        """
+        Delay-and-Sum Beamformer, combining a multi-channel microphone array into one (resampled) mono stream
+
+        Channels are aligned towards the steering direction with (windowed sinc) fractional delay filters,
+        applied in the frequency domain (overlap-save), and averaged, which attenuates sound (noise) from other directions.
+
+        Steering (see steer) may be changed from another thread than the one processing audio.
+
+        Parameters
+        ----------
+        positions: np.ndarray
+            Microphone positions [m] (x: front, y: left, z: up), of shape (channels, 3), in channel order
+        rate: int
+            Input sample rate [Hz]
+        output_rate: int
+            Output sample rate [Hz] (defaults to rate)
+        azimuth: float
+            Steering direction [rad] in horizontal plane (0: front, pi/2: left)
+        elevation: float
+            Steering direction [rad] above horizontal plane
+        """
+        self._positions = np.asarray(positions, np.float64)
+        self._rate = rate
+        self._output_rate = rate if output_rate is None else output_rate
+
+        self._resampler = Resampler(self._rate, self._output_rate) if self._rate != self._output_rate else None
+
+        # Filters are long enough for the largest delay in any direction: the array's extent
+        extent = max(np.linalg.norm(a - b) for a in self._positions for b in self._positions)
+        self._taps = 2 * self.HALF_WIDTH + int(np.ceil(extent / self.SPEED_OF_SOUND * self.rate)) + 1
+
+        # Overlap-Save: previous samples needed to filter a block without wrapping around
+        self._history = np.zeros((self._taps - 1, self.channels), np.float32)
+
+        # Steering state (azimuth, elevation, filters, FFT size -> weights cache), replaced as a whole by steer
+        self._steering = None
+        self.steer(azimuth, elevation)
+
+    @property
+    def channels(self):
+        """
+        Returns
+        -------
+        channels: int
+            Number of microphone channels
+        """
+        return len(self._positions)
+
+    @property
+    def rate(self):
+        """
+        Returns
+        -------
+        rate: int
+            Input sample rate [Hz]
+        """
+        return self._rate
+
+    @property
+    def output_rate(self):
+        """
+        Returns
+        -------
+        output_rate: int
+            Output sample rate [Hz]
+        """
+        return self._output_rate
+
+    @property
+    def latency(self):
+        """
+        Returns
+        -------
+        latency: float
+            Delay [s] added by the fractional delay filters (besides resampling)
+        """
+        return float(self.HALF_WIDTH) / self.rate
+
+    @property
+    def azimuth(self):
+        """
+        Returns
+        -------
+        azimuth: float
+            Steering direction [rad] in horizontal plane (0: front, pi/2: left)
+        """
+        return self._steering[0]
+
+    @property
+    def elevation(self):
+        """
+        Returns
+        -------
+        elevation: float
+            Steering direction [rad] above horizontal plane
+        """
+        return self._steering[1]
+
+    def steer(self, azimuth, elevation=0.0):
+        """
+        Steer Beamformer towards Direction (thread safe: takes effect from the next block on)
+
+        Parameters
+        ----------
+        azimuth: float
+            Direction [rad] in horizontal plane (0: front, pi/2: left)
+        elevation: float
+            Direction [rad] above horizontal plane
+        """
+        direction = np.array([np.cos(elevation) * np.cos(azimuth),
+                              np.cos(elevation) * np.sin(azimuth),
+                              np.sin(elevation)])
+
+        # Sound from direction arrives earlier at microphones further in that direction: delay those
+        delays = self._positions.dot(direction) / self.SPEED_OF_SOUND * self.rate
+        delays -= delays.min()
+
+        # Hann windowed sinc per channel, centered on its delay, normalized to unity gain (at DC)
+        n = np.arange(self._taps, dtype=np.float64).reshape(-1, 1) - self.HALF_WIDTH - delays
+        filters = np.sinc(n) * np.where(np.abs(n) < self.HALF_WIDTH, 0.5 + 0.5 * np.cos(np.pi * n / self.HALF_WIDTH), 0)
+        filters /= filters.sum(axis=0) * self.channels
+
+        # Replaced in one assignment, so process always sees a consistent steering state
+        self._steering = (azimuth, elevation, filters, {})
+
+    def process(self, audio):
+        """
+        Beamform Block of (Interleaved) Audio
+
+        Parameters
+        ----------
+        audio: np.ndarray
+            Interleaved audio of shape (samples * channels,) or (samples, channels)
+
+        Returns
+        -------
+        mono: np.ndarray
+            Beamformed (and resampled) mono audio, dtype np.int16 (only valid until the next call to process)
+        """
+        audio = audio.reshape(-1, self.channels)
+
+        # Overlap-Save: prepend history, filter, and discard the (wrapped around) first taps - 1 samples
+        block = np.concatenate((self._history, audio)).astype(np.float32)
+        self._history = block[len(block) - len(self._history):]
+
+        # Delay channels (in frequency domain, zero padded to a fast FFT size) and average them
+        size = self._fft_size(len(block))
+        spectrum = np.einsum('fc,fc->f', np.fft.rfft(block, size, axis=0), self._steering_weights(size))
+        mono = np.fft.irfft(spectrum, size)[len(self._history):len(block)]
+
+        if self._resampler:
+            return self._resampler.process(mono)
+
+        return np.clip(np.round(mono), -32768, 32767).astype(np.int16)
+
+    @staticmethod
+    def _fft_size(n):
+        """
+        Smallest FFT size of at least n samples, with only 2, 3 and 5 as prime factors (fast FFT)
+
+        Parameters
+        ----------
+        n: int
+
+        Returns
+        -------
+        size: int
+        """
+        size = 2 ** int(np.ceil(np.log2(n)))
+
+        for threes in (1, 3, 9, 27):
+            for fives in (1, 5, 25):
+                candidate = threes * fives
+                while candidate < n:
+                    candidate *= 2
+                size = min(size, candidate)
+
+        return size
+
+    def _steering_weights(self, size):
+        """
+        Get (cached) Frequency Domain Steering Weights for FFT size, for the current steering state
+
+        Parameters
+        ----------
+        size: int
+            FFT size
+
+        Returns
+        -------
+        weights: np.ndarray
+            Complex weights of shape (size // 2 + 1, channels)
+        """
+        azimuth, elevation, filters, cache = self._steering
+
+        weights = cache.get(size)
+
+        if weights is None:
+            if len(cache) >= self.CACHE:
+                cache.clear()
+
+            weights = np.fft.rfft(filters, size, axis=0)
+            cache[size] = weights
+
+        return weights
@@ -0,0 +1,304 @@
+import numpy as np
+
+from threading import Lock
+from time import time
+
+
+class EchoSuppressor(object):
+
+    FRAME_MS = 10  # Frame length [ms] at which microphone and reference energy are compared
+    HISTORY = 4.0  # Reference energy history [s]
+
+    NOMINAL = 3000.0 ** 2  # Reference energy (mean square) assumed when only playback activity is known
+    FLOOR = 30.0 ** 2  # Reference energy (mean square) below which reference is considered silent
+
+    DELAY_SMOOTHING = 0.01  # Echo delay statistics smoothing, per frame
+    DELAY_CORRELATION = 0.5  # Minimum (log energy) correlation between reference and microphone to trust delay
+    DELAY_TOLERANCE = 2  # Frames before estimated delay considered for expected echo
+    REVERBERATION = 5  # Frames after estimated delay considered for expected echo
+
+    STEP = 0.1  # Echo coupling (log) increase per echo frame above estimate
+    STEP_SLOW = 0.01  # Echo coupling (log) decrease per frame below estimate, and increase per near-end speech frame
+
+    def __init__(self, rate, channels=1, max_delay=0.3, margin=2.0, attenuation=0.0):
+        """
+        Suppress Echo of Robot Speech in Microphone Audio, using the played back audio as reference
+
+        The energy of each microphone frame is compared against the (maximum) reference energy played back
+        around the estimated echo delay (or within max_delay, until the delay is known),
+        scaled by the estimated echo coupling (microphone / reference energy).
+        Frames that are not louder than the expected echo by margin are considered echo and attenuated,
+        so VAD only picks up (near-end) speech of people talking over the robot (barge-in).
+
+        The echo delay is the lag with the highest (smoothed) correlation between reference and microphone log energy.
+        The echo coupling tracks the upper envelope of echo (a high quantile of microphone / reference energy):
+        it rises quickly with echo frames above the estimate and decays slowly with quieter frames.
+        It rises slowly with near-end speech as well, so it recovers from an initial estimate that is too low.
+
+        Parameters
+        ----------
+        rate: int
+            Microphone sample rate [Hz]
+        channels: int
+            Number of (interleaved) microphone channels
+        max_delay: float
+            Maximum delay [s] between playback and echo (output & input latency + acoustic path)
+        margin: float
+            Factor (energy) by which a frame needs to exceed the expected echo to pass
+        attenuation: float
+            Gain applied to frames considered echo
+        """
+        self._rate = rate
+        self._channels = channels
+        self._max_delay = max_delay
+        self._margin = margin
+        self._attenuation = attenuation
+
+        self._frame_size = self.FRAME_MS * rate // 1000
+
+        # Reference energy ring buffer: end time [s] and energy of each reference frame
+        size = int(self.HISTORY * 1000 / self.FRAME_MS)
+        self._reference_times = np.full(size, -np.inf)
+        self._reference_energies = np.zeros(size, np.float32)
+        self._reference_index = 0
+        self._reference_end = -np.inf
+        self._reference_lock = Lock()
+
+        self._log_coupling = 0.0  # Log of echo coupling, initially assume echo as loud as reference
+
+        # Smoothed (log energy) statistics of microphone (x) and reference at each candidate delay (y)
+        self._lags = np.arange(int(max_delay * 1000 / self.FRAME_MS) + 1)
+        self._mx, self._mxx = 0.0, 0.0
+        self._my, self._myy, self._mxy = [np.zeros(len(self._lags)) for i in range(3)]
+        self._delay = None
+
+        self._output = np.zeros(0, np.int16)
+
+        self._suppressed = 0
+        self._passed = 0
+
+    @property
+    def rate(self):
+        """
+        Returns
+        -------
+        rate: int
+            Microphone sample rate [Hz]
+        """
+        return self._rate
+
+    @property
+    def coupling(self):
+        """
+        Returns
+        -------
+        coupling: float
+            Estimated echo coupling: energy of echo in microphone relative to energy of reference
+        """
+        return float(np.exp(self._log_coupling))
+
+    @property
+    def delay(self):
+        """
+        Returns
+        -------
+        delay: float or None
+            Estimated delay [s] between playback and echo, if known
+        """
+        return None if self._delay is None else self._delay * self.FRAME_MS / 1000.0
+
+    @property
+    def suppressed(self):
+        """
+        Returns
+        -------
+        suppressed: int
+            Number of microphone frames considered echo
+        """
+        return self._suppressed
+
+    @property
+    def passed(self):
+        """
+        Returns
+        -------
+        passed: int
+            Number of microphone frames during playback considered near-end speech
+        """
+        return self._passed
+
+    @property
+    def active(self):
+        """
+        Returns
+        -------
+        active: bool
+            Whether the microphone may currently pick up echo of reference audio
+        """
+        return time() < self._reference_end + self._max_delay
+
+    def reference(self, audio, rate):
+        """
+        Register Reference Audio, about to be played back
+
+        Parameters
+        ----------
+        audio: np.ndarray
+            Mono reference audio, dtype np.int16
+        rate: int
+            Reference sample rate [Hz]
+        """
+        frame_size = self.FRAME_MS * rate // 1000
+        audio = audio.astype(np.float32)
+
+        starts = np.arange(0, len(audio), frame_size)
+        energies = np.add.reduceat(audio * audio, starts) / np.diff(np.append(starts, len(audio)))
+
+        self._add_reference(energies)
+
+    def reference_activity(self, duration):
+        """
+        Register Playback Activity, for playback without reference audio (e.g. speech synthesized on the robot)
+
+        Parameters
+        ----------
+        duration: float
+            Time [s] playback is expected to continue
+        """
+        self._add_reference(np.full(int(duration * 1000 / self.FRAME_MS), self.NOMINAL, np.float32), False)
+
+    def process(self, audio):
+        """
+        Suppress Echo in Microphone Audio, that has just been captured
+
+        Parameters
+        ----------
+        audio: np.ndarray
+            (Interleaved) microphone audio, dtype np.int16
+
+        Returns
+        -------
+        audio: np.ndarray
+            Audio with echo frames attenuated. This is either audio itself (if nothing was suppressed),
+            or a view on a work buffer, which is only valid until the next call to process
+        """
+        t = time()
+
+        if not len(audio) or t > self._reference_end + self._max_delay + float(len(audio)) / self._channels / self.rate:
+            return audio
+
+        frames = audio.reshape(-1, self._channels).astype(np.float32)
+        starts = np.arange(0, len(frames), self._frame_size)
+        lengths = np.diff(np.append(starts, len(frames)))
+
+        energies = np.add.reduceat((frames * frames).sum(axis=1), starts) / (lengths * self._channels)
+
+        # Capture (end) time of each frame, assuming audio ends now
+        times = t - (len(frames) - starts - lengths) / float(self.rate)
+
+        # Reference energy played back at each candidate delay before each frame, shape (frames, lags)
+        with self._reference_lock:
+            order = np.argsort(self._reference_times)
+            reference_times, reference_energies = self._reference_times[order], self._reference_energies[order]
+
+        dt = self.FRAME_MS / 1000.0
+        targets = times.reshape(-1, 1) - self._lags * dt
+        index = np.minimum(np.searchsorted(reference_times, targets - dt / 2), len(reference_times) - 1)
+        lagged = np.where(reference_times[index] < targets + dt / 2, reference_energies[index], 0)
+
+        playing = lagged.max(axis=1) > self.FLOOR
+
+        if not playing.any():
+            return audio
+
+        self._update_delay(np.log(np.maximum(energies[playing], 1.0)), np.log(np.maximum(lagged[playing], 1.0)))
+
+        # Expected echo: maximum reference energy around estimated delay (or any delay, if unknown)
+        if self._delay is None:
+            reference = lagged[playing].max(axis=1)
+        else:
+            reference = lagged[playing, max(0, self._delay - self.DELAY_TOLERANCE):
+                                        self._delay + self.REVERBERATION + 1].max(axis=1)
+
+        playing[playing] = reference > self.FLOOR
+        reference = reference[reference > self.FLOOR]
+
+        if not playing.any():
+            return audio
+
+        ratios = np.log(np.maximum(energies[playing], 1.0) / reference)
+        near = ratios > self._log_coupling + np.log(self._margin)
+
+        # Adapt echo coupling: fast towards louder echo, slow otherwise
+        above = ratios > self._log_coupling
+        self._log_coupling += self.STEP * (above & ~near).sum() + self.STEP_SLOW * (near.sum() - (~above).sum())
+
+        echo = np.zeros(len(starts), bool)
+        echo[playing] = ~near
+
+        self._suppressed += int(echo.sum())
+        self._passed += int(near.sum())
+
+        if not echo.any():
+            return audio
+
+        if len(self._output) < len(audio):
+            self._output = np.zeros(len(audio), np.int16)
+
+        output = self._output[:len(audio)]
+        output[:] = audio
+
+        gains = np.repeat(np.where(echo, self._attenuation, 1.0), lengths * self._channels)
+        np.multiply(output, gains, out=output, casting='unsafe')
+
+        return output
+
+    def _update_delay(self, x, y):
+        """
+        Update Echo Delay Estimate
+
+        Parameters
+        ----------
+        x: np.ndarray
+            Log energy of microphone frames, shape (frames,)
+        y: np.ndarray
+            Log energy of reference at each candidate delay, shape (frames, lags)
+        """
+        weight = 1 - (1 - self.DELAY_SMOOTHING) ** len(x)
+
+        self._mx += weight * (x.mean() - self._mx)
+        self._mxx += weight * ((x * x).mean() - self._mxx)
+        self._my += weight * (y.mean(axis=0) - self._my)
+        self._myy += weight * ((y * y).mean(axis=0) - self._myy)
+        self._mxy += weight * ((x.reshape(-1, 1) * y).mean(axis=0) - self._mxy)
+
+        covariance = self._mxy - self._mx * self._my
+        variance = np.maximum((self._mxx - self._mx ** 2) * (self._myy - self._my ** 2), 1E-9)
+        correlation = covariance / np.sqrt(variance)
+
+        best = int(np.argmax(correlation))
+        self._delay = best if correlation[best] > self.DELAY_CORRELATION else None
+
+    def _add_reference(self, energies, queued=True):
+        """
+        Add Reference Frame Energies
+
+        Parameters
+        ----------
+        energies: np.ndarray
+        queued: bool
+            Whether playback is queued after reference still being played back, rather than starting now
+        """
+        t = time()
+
+        with self._reference_lock:
+            t0 = max(t, self._reference_end) if queued else t
+
+            size = len(self._reference_times)
+            index = (self._reference_index + np.arange(len(energies))) % size
+
+            self._reference_times[index] = t0 + np.arange(1, len(energies) + 1) * self.FRAME_MS / 1000.0
+            self._reference_energies[index] = energies
+
+            self._reference_index = (self._reference_index + len(energies)) % size
+            self._reference_end = max(self._reference_end, t0 + len(energies) * self.FRAME_MS / 1000.0)
@@ -12,7 +12,7 @@ import os
 
 
 class Face(object):
-    def __init__(self, representation, bounds):
+    def __init__(self, representation, bounds, distance=None):
         """
         OpenFace Face Information
 
@@ -22,9 +22,12 @@ class Face(object):
             Face Feature Vector
         bounds: Bounds
             Face Bounding Box
+        distance: float or None
+            Distance [m] to Face, if known
         """
         self._representation = representation
         self._bounds = bounds
+        self._distance = distance
 
     @property
     def representation(self):
@@ -46,6 +49,25 @@ class Face(object):
         """
         return self._bounds
 
+    @property
+    def distance(self):
+        """
+        Returns
+        -------
+        distance: float or None
+            Distance [m] to Face, if known (see Frame.distance)
+        """
+        return self._distance
+
+    @distance.setter
+    def distance(self, value):
+        """
+        Parameters
+        ----------
+        value: float or None
+        """
+        self._distance = value
+
 
 class Person(Face):
     def __init__(self, face, name, confidence):
@@ -59,7 +81,7 @@ class Person(Face):
         confidence: float
             Name Confidence
         """
-        super(Person, self).__init__(face.representation, face.bounds)
+        super(Person, self).__init__(face.representation, face.bounds, face.distance)
 
         self._name = name
         self._confidence = confidence
@@ -0,0 +1,128 @@
+from pepper.sensor.beamformer import Beamformer
+
+import numpy as np
+
+from itertools import combinations
+
+
+class SoundLocalizer(object):
+
+    FRAME = 1024  # Samples per channel per analysis frame
+    INTERPOLATION = 4  # Cross-correlation upsampling factor, for sub-sample time delays
+    AZIMUTHS = 360  # Number of candidate directions (in horizontal plane)
+
+    def __init__(self, positions, rate):
+        """
+        Estimate Direction of Arrival of Sound with GCC-PHAT (Generalized Cross Correlation - Phase Transform)
+
+        Audio is added in blocks, which are split into frames and transformed with one batched FFT.
+        Phase-transformed cross spectra of all microphone pairs are accumulated until estimate is called,
+        which picks the candidate direction whose expected time delays best match the cross correlations.
+
+        Parameters
+        ----------
+        positions: np.ndarray
+            Microphone positions [m] (x: front, y: left, z: up), of shape (channels, 3), in channel order
+        rate: int
+            Sample rate [Hz]
+        """
+        self._positions = np.asarray(positions, np.float64)
+        self._rate = rate
+
+        self._pairs = np.array(list(combinations(range(self.channels), 2)))
+        self._window = np.hanning(self.FRAME).astype(np.float32).reshape(1, -1, 1)
+
+        # Expected time delay between microphones of each pair, for each candidate direction, as correlation index
+        self._azimuths = np.linspace(-np.pi, np.pi, self.AZIMUTHS, endpoint=False)
+        directions = np.stack((np.cos(self._azimuths), np.sin(self._azimuths), np.zeros(self.AZIMUTHS)), 1)
+
+        baselines = self._positions[self._pairs[:, 1]] - self._positions[self._pairs[:, 0]]
+        delays = directions.dot(baselines.T) / Beamformer.SPEED_OF_SOUND * self.rate * self.INTERPOLATION
+        self._lags = np.round(delays).astype(np.int64) % (self.FRAME * self.INTERPOLATION)
+
+        self._remainder = np.zeros((0, self.channels), np.float32)
+        self.reset()
+
+    @property
+    def channels(self):
+        """
+        Returns
+        -------
+        channels: int
+            Number of microphone channels
+        """
+        return len(self._positions)
+
+    @property
+    def rate(self):
+        """
+        Returns
+        -------
+        rate: int
+            Sample rate [Hz]
+        """
+        return self._rate
+
+    @property
+    def frames(self):
+        """
+        Returns
+        -------
+        frames: int
+            Number of frames accumulated since last reset
+        """
+        return self._frames
+
+    def add(self, audio):
+        """
+        Add (Interleaved) Audio Block to current estimate
+
+        Parameters
+        ----------
+        audio: np.ndarray
+            Interleaved audio of shape (samples * channels,) or (samples, channels)
+        """
+        audio = np.concatenate((self._remainder, audio.reshape(-1, self.channels)))
+
+        n = len(audio) // self.FRAME
+        self._remainder = audio[n * self.FRAME:]
+
+        if n:
+            # Batched FFT of all frames and channels: shape (frames, bins, channels)
+            spectra = np.fft.rfft(audio[:n * self.FRAME].reshape(n, self.FRAME, self.channels) * self._window, axis=1)
+
+            # Cross spectra of all microphone pairs, with Phase Transform (keep phase, discard magnitude)
+            cross = spectra[..., self._pairs[:, 0]] * np.conj(spectra[..., self._pairs[:, 1]])
+            cross /= np.maximum(np.abs(cross), 1E-9)
+
+            self._cross += cross.sum(axis=0)
+            self._frames += n
+
+    def estimate(self):
+        """
+        Estimate Direction of Arrival from audio added since last reset
+
+        Returns
+        -------
+        azimuth: float or None
+            Direction [rad] in horizontal plane (0: front, pi/2: left), or None if no frames were added
+        confidence: float
+            Relative strength [0..1] of the estimate (mean phase-transformed correlation at its delays)
+        """
+        if not self._frames:
+            return None, 0.0
+
+        # (Upsampled) Cross Correlations of all pairs, shape (lags, pairs)
+        correlation = np.fft.irfft(self._cross / self._frames, self.FRAME * self.INTERPOLATION, axis=0)
+        correlation *= self.INTERPOLATION
+
+        # Steered Response: sum correlations of all pairs at the lags expected for each candidate direction
+        response = correlation[self._lags, np.arange(len(self._pairs))].sum(axis=1)
+        best = int(np.argmax(response))
+
+        return float(self._azimuths[best]), float(np.clip(response[best] / len(self._pairs), 0, 1))
+
+    def reset(self):
+        """Clear accumulated audio, to estimate the direction of a new segment"""
+        self._cross = np.zeros((self.FRAME // 2 + 1, len(self._pairs)), np.complex128)
+        self._frames = 0
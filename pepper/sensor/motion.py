@@ -0,0 +1,153 @@
+from pepper.util.yuv import rgb_to_luma
+from pepper import config
+
+import numpy as np
+
+from time import time
+
+
+class MotionGate(object):
+
+    SCALE = 8  # Downsampling factor (in both directions) of luma image
+    NOISE = 16  # Luma difference below which a pixel is considered unchanged
+
+    REPORT_INTERVAL = 100  # Number of skipped frames between skip ratio reports
+
+    def __init__(self, threshold=config.MOTION_GATE_THRESHOLD, refresh=config.MOTION_GATE_REFRESH):
+        """
+        Detect Change between Camera Frames, to skip expensive processing of static scenes
+
+        Frames are compared against the last frame that passed the gate,
+        so slow changes accumulate until they pass the gate as well.
+
+        Parameters
+        ----------
+        threshold: float
+            Fraction of (downsampled) pixels that needs to change for a frame to pass the gate
+        refresh: float
+            Time [s] after which a frame passes the gate, regardless of change
+        """
+        self._threshold = threshold
+        self._refresh = refresh
+
+        self._reference = None
+        self._luma = None
+        self._difference = None
+
+        self._t0 = 0
+        self._passed = 0
+        self._skipped = 0
+
+    @property
+    def threshold(self):
+        """
+        Returns
+        -------
+        threshold: float
+            Fraction of (downsampled) pixels that needs to change for a frame to pass the gate
+        """
+        return self._threshold
+
+    @property
+    def refresh(self):
+        """
+        Returns
+        -------
+        refresh: float
+            Time [s] after which a frame passes the gate, regardless of change
+        """
+        return self._refresh
+
+    @property
+    def passed(self):
+        """
+        Returns
+        -------
+        passed: int
+            Number of frames that passed the gate
+        """
+        return self._passed
+
+    @property
+    def skipped(self):
+        """
+        Returns
+        -------
+        skipped: int
+            Number of frames that were skipped by the gate
+        """
+        return self._skipped
+
+    @property
+    def skip_ratio(self):
+        """
+        Returns
+        -------
+        skip_ratio: float
+            Fraction of frames skipped by the gate
+        """
+        total = self.passed + self.skipped
+        return float(self.skipped) / total if total else 0.0
+
+    def changed(self, image):
+        """
+        Check whether image changed with respect to the last image that passed the gate
+
+        Parameters
+        ----------
+        image: np.ndarray
+            RGB (height, width, 3) or Luma (height, width) image
+
+        Returns
+        -------
+        changed: bool
+            Whether the image passes the gate
+        """
+        luma = self._downsample(image)
+
+        t1 = time()
+
+        if self._reference is None or self._reference.shape != luma.shape or t1 - self._t0 >= self.refresh:
+            changed = True
+        else:
+            if self._difference is None or self._difference.shape != luma.shape:
+                self._difference = np.empty_like(luma)
+
+            np.subtract(luma, self._reference, out=self._difference)
+            np.abs(self._difference, out=self._difference)
+            changed = np.count_nonzero(self._difference > self.NOISE) > self.threshold * luma.size
+
+        if changed:
+            # Luma becomes the new reference, old reference buffer is reused for the next luma image
+            self._reference, self._luma = luma, self._reference
+            self._t0 = t1
+            self._passed += 1
+        else:
+            self._skipped += 1
+
+        return changed
+
+    def _downsample(self, image):
+        """
+        Downsample Image and convert to Luma
+
+        Parameters
+        ----------
+        image: np.ndarray
+            RGB (height, width, 3) or Luma (height, width) image
+
+        Returns
+        -------
+        luma: np.ndarray
+            Downsampled Luma image, dtype np.int16
+        """
+        small = image[::self.SCALE, ::self.SCALE]
+
+        if self._luma is None or self._luma.shape != small.shape[:2]:
+            self._luma = np.empty(small.shape[:2], np.int16)
+
+        luma = self._luma
+
+        np.copyto(luma, small if small.ndim == 2 else rgb_to_luma(small))
+
+        return luma
@@ -180,7 +180,7 @@ class Bounds(object):
 
 
 class CocoObject(object):
-    def __init__(self, id, name, bounds, confidence):
+    def __init__(self, id, name, bounds, confidence, distance=None):
         """
         CoCo Object Information
 
@@ -194,11 +194,14 @@ class CocoObject(object):
             Bounding Box of object in frame [0..1]
         confidence: float
             Confidence of Object Classification [0..1]
+        distance: float or None
+            Distance [m] to object, if known
         """
         self._id = id
         self._name = name
         self._bounds = bounds
         self._confidence = confidence
+        self._distance = distance
 
     @property
     def id(self):
@@ -240,6 +243,25 @@ class CocoObject(object):
         """
         return self._confidence
 
+    @property
+    def distance(self):
+        """
+        Returns
+        -------
+        distance: float or None
+            Distance [m] to object, if known (see Frame.distance)
+        """
+        return self._distance
+
+    @distance.setter
+    def distance(self, value):
+        """
+        Parameters
+        ----------
+        value: float or None
+        """
+        self._distance = value
+
 
 class InceptionClassifyClient:
     def __init__(self, address=('localhost', 9999)):
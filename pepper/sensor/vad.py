@@ -3,7 +3,370 @@ from pepper import config, logger
 from webrtcvad import Vad
 import numpy as np
 
-from threading import Thread
+from collections import deque
+from threading import Thread, Condition, Lock
+from time import time
+
+
+class UtteranceStream(object):
+    def __init__(self, rate):
+        """
+        Stream of Utterance Audio, being recorded
+
+        Chunks are put on the stream by VAD while the utterance is still going on, so consumers
+        (e.g. streaming speech recognition) can start processing before it has ended.
+        Every iteration over the stream yields all chunks from the start, blocking until new chunks arrive,
+        and ends when the utterance ends, so several consumers can share one stream.
+
+        Parameters
+        ----------
+        rate: int
+            Audio Sample Rate
+        """
+        self._rate = rate
+        self._chunks = []
+        self._audio = None
+        self._closed = False
+        self._condition = Condition()
+
+    @property
+    def rate(self):
+        """
+        Returns
+        -------
+        rate: int
+            Audio Sample Rate
+        """
+        return self._rate
+
+    @property
+    def closed(self):
+        """
+        Returns
+        -------
+        closed: bool
+            Whether the utterance has ended
+        """
+        return self._closed
+
+    @property
+    def audio(self):
+        """
+        Complete Utterance Audio, blocks until the utterance has ended
+
+        Returns
+        -------
+        audio: np.ndarray
+        """
+        with self._condition:
+            while not self._closed:
+                self._condition.wait()
+        return self._audio
+
+    def put(self, audio):
+        """
+        Put Audio Chunk on Stream
+
+        Parameters
+        ----------
+        audio: np.ndarray
+        """
+        with self._condition:
+            self._chunks.append(audio)
+            self._condition.notify_all()
+
+    def close(self, audio):
+        """
+        Close Stream, as utterance has ended
+
+        Parameters
+        ----------
+        audio: np.ndarray
+            Complete Utterance Audio
+        """
+        with self._condition:
+            self._audio = audio
+            self._closed = True
+            self._condition.notify_all()
+
+    def __iter__(self):
+        index = 0
+
+        while True:
+            with self._condition:
+                while index == len(self._chunks) and not self._closed:
+                    self._condition.wait()
+
+                chunks = self._chunks[index:]
+                index = len(self._chunks)
+
+            if not chunks:
+                return
+
+            for chunk in chunks:
+                yield chunk
+
+
+class UtteranceDispatcher(object):
+
+    DROPPED = object()  # Result of utterances that were dropped (or failed), skipped on delivery
+
+    def __init__(self, process, deliver=None, workers=2, backlog=4, max_age=5.0):
+        """
+        Dispatch Utterances to a Bounded Pool of Worker Threads, delivering Results in Order
+
+        Utterances are processed (e.g. transcribed) concurrently by at most workers threads.
+        Results are delivered in the order utterances were submitted, so a quick transcript of a later utterance
+        waits for the transcript of an earlier one. When utterances arrive faster than they can be processed
+        (e.g. crowd noise), the oldest waiting utterances are dropped: beyond backlog waiting utterances,
+        or when they have been waiting for longer than max_age.
+
+        Parameters
+        ----------
+        process: callable
+            Process Utterance, called with submitted utterance on a worker thread, returns result
+        deliver: callable or None
+            Deliver Result, called with result of process in order of submission
+        workers: int
+            Maximum number of utterances processed concurrently
+        backlog: int
+            Maximum number of utterances waiting for a worker
+        max_age: float
+            Maximum time [s] an utterance may wait for a worker
+        """
+        self._process = process
+        self._deliver = deliver
+        self._backlog = backlog
+        self._max_age = max_age
+
+        self._queue = deque()  # Waiting utterances: (sequence, submit time, utterance)
+        self._condition = Condition()
+
+        self._results = {}  # Processed utterances waiting for delivery: sequence -> (submit time, result)
+        self._results_lock = Lock()
+        self._delivered_condition = Condition(self._results_lock)
+        self._delivering = False
+        self._next = 0  # Sequence of next utterance to deliver
+
+        self._submitted = 0
+        self._active = 0
+        self._max_depth = 0
+        self._dropped = 0
+        self._delivered = 0
+        self._wait = 0.0
+        self._latency = 0.0
+
+        self._log = logger.getChild(self.__class__.__name__)
+
+        for i in range(workers):
+            thread = Thread(target=self._worker)
+            thread.daemon = True
+            thread.start()
+
+    @property
+    def depth(self):
+        """
+        Returns
+        -------
+        depth: int
+            Number of utterances waiting for a worker
+        """
+        return len(self._queue)
+
+    @property
+    def max_depth(self):
+        """
+        Returns
+        -------
+        max_depth: int
+            Maximum number of utterances that have been waiting for a worker at once
+        """
+        return self._max_depth
+
+    @property
+    def active(self):
+        """
+        Returns
+        -------
+        active: int
+            Number of utterances being processed
+        """
+        return self._active
+
+    @property
+    def submitted(self):
+        """
+        Returns
+        -------
+        submitted: int
+            Number of utterances submitted
+        """
+        return self._submitted
+
+    @property
+    def delivered(self):
+        """
+        Returns
+        -------
+        delivered: int
+            Number of results delivered
+        """
+        return self._delivered
+
+    @property
+    def dropped(self):
+        """
+        Returns
+        -------
+        dropped: int
+            Number of utterances dropped (stale or failed)
+        """
+        return self._dropped
+
+    @property
+    def wait(self):
+        """
+        Returns
+        -------
+        wait: float
+            Mean time [s] delivered utterances waited for a worker
+        """
+        return self._wait / max(1, self._delivered)
+
+    @property
+    def latency(self):
+        """
+        Returns
+        -------
+        latency: float
+            Mean time [s] from submission of utterances to delivery of their results
+        """
+        return self._latency / max(1, self._delivered)
+
+    def submit(self, utterance):
+        """
+        Submit Utterance for Processing
+
+        Parameters
+        ----------
+        utterance: object
+            Utterance (e.g. audio), passed to process
+        """
+        with self._condition:
+            self._queue.append((self._submitted, time(), utterance))
+            self._submitted += 1
+
+            # Drop Oldest Waiting Utterances beyond Backlog
+            dropped = []
+            while len(self._queue) > self._backlog:
+                dropped.append(self._queue.popleft()[:2])
+
+            self._max_depth = max(self._max_depth, len(self._queue))
+            self._condition.notify()
+
+        for sequence, submitted in dropped:
+            self._log.warning("Dropped Utterance #{} (backlog full)".format(sequence))
+            self._store(sequence, submitted, None, self.DROPPED)
+
+    def join(self, timeout=None):
+        """
+        Wait until all submitted utterances have been delivered (or dropped)
+
+        Parameters
+        ----------
+        timeout: float or None
+            Maximum time [s] to wait
+
+        Returns
+        -------
+        done: bool
+            Whether all submitted utterances have been delivered (or dropped)
+        """
+        t1 = None if timeout is None else time() + timeout
+
+        with self._delivered_condition:
+            while self._next < self._submitted:
+                if t1 is not None and time() >= t1:
+                    return False
+                self._delivered_condition.wait(None if t1 is None else t1 - time())
+
+        return True
+
+    def _worker(self):
+        while True:
+            with self._condition:
+                while not self._queue:
+                    self._condition.wait()
+
+                sequence, submitted, utterance = self._queue.popleft()
+                self._active += 1
+
+            t0 = time()
+
+            if t0 - submitted > self._max_age:
+                self._log.warning("Dropped Utterance #{} (waited {:3.2f}s)".format(sequence, t0 - submitted))
+                result = self.DROPPED
+            else:
+                try:
+                    result = self._process(utterance)
+                except Exception as e:
+                    self._log.exception(e)
+                    result = self.DROPPED
+
+            with self._condition:
+                self._active -= 1
+
+            self._store(sequence, submitted, t0, result)
+
+    def _store(self, sequence, submitted, started, result):
+        """
+        Store Result and Deliver Results that are next in order (on this thread, unless another is delivering)
+
+        Parameters
+        ----------
+        sequence: int
+            Submission order of utterance
+        submitted: float
+            Time utterance was submitted
+        started: float or None
+            Time utterance was started processing
+        result: object
+            Result of processing, or UtteranceDispatcher.DROPPED
+        """
+        with self._results_lock:
+            self._results[sequence] = submitted, started, result
+
+            if result is self.DROPPED:
+                self._dropped += 1
+
+        while True:
+            with self._results_lock:
+                if self._delivering or self._next not in self._results:
+                    return
+
+                submitted, started, result = self._results.pop(self._next)
+                self._delivering = True
+
+            try:
+                if result is not self.DROPPED:
+                    if self._deliver:
+                        self._deliver(result)
+
+                    self._delivered += 1
+                    self._wait += started - submitted
+                    self._latency += time() - submitted
+            except Exception as e:
+                self._log.exception(e)
+            finally:
+                with self._delivered_condition:
+                    self._next += 1
+                    self._delivering = False
+                    self._delivered_condition.notify_all()
+
+    def __repr__(self):
+        return "{}: submitted={}, delivered={}, dropped={}, depth={} (max {}), wait={:3.0f}ms, latency={:3.0f}ms".format(
+            self.__class__.__name__, self.submitted, self.delivered, self.dropped, self.depth, self.max_depth,
+            self.wait * 1000, self.latency * 1000)
 
 
 class VAD(object):
@@ -11,11 +374,31 @@ class VAD(object):
     FRAME_MS = 10  # Must be either 10/20/30 ms, according to webrtcvad specification
     BUFFER_SIZE = 100  # Buffer Size
     WINDOW_SIZE = config.VAD_WINDOW_SIZE * FRAME_MS  # Sliding Window Length (Multiples of Frame MS)
-
-    def __init__(self, microphone, callbacks, mode=3):
+    VOICE_BUFFER_SIZE = 10  # Initial Voice Buffer Size [s]
+
+    # Cascade: Energy / Zero-Crossing Pre-Classifier
+    NOISE_MARGIN = 6.0  # Frames less than this [dB] above the noise level may be silent
+    NOISE_CROSSINGS = 0.1  # Frames with a zero-crossing rate within this of the noise's may be silent
+    NOISE_FALL = 0.5  # Noise level adaptation rate, when quieter frames arrive (per block)
+    NOISE_RISE = 0.01  # Noise level increase [dB] per frame, when no quieter frames arrive
+    NOISE_SMOOTHING = 0.01  # Noise zero-crossing rate smoothing, per silent frame
+    NOISE_QUIET = -60.0  # Noise level [dBFS] at (and below) which the configured thresholds apply
+    NOISE_LOUD = -30.0  # Noise level [dBFS] at (and above) which the 'loud' thresholds apply
+
+    # Endpointing
+    ENDPOINT_FRAMES = 10  # Consecutive decayed non-speech frames (once activation dropped) to end an utterance early
+    VOICE_LEVEL_SMOOTHING = 0.05  # Utterance speech level smoothing, per speech frame
+    SPLIT_SEARCH = 0.5  # Fraction of (maximum length) utterance, at its end, searched for the quietest frame to split on
+
+    def __init__(self, microphone, callbacks, mode=3, voice_callbacks=None, cascade=config.VAD_CASCADE,
+                 stream_callbacks=None, hangover=config.VAD_HANGOVER, endpoint_decay=config.VAD_ENDPOINT_DECAY,
+                 max_duration=config.VAD_MAX_DURATION):
         """
         Detect Utterances of People using Voice Activity Detection
 
+        All callbacks are called on the microphone (subscriber) thread and should return quickly:
+        hand utterances (streams) that take long to process to an UtteranceDispatcher (see SpeechRecognition).
+
         Parameters
         ----------
         microphone: AbstractMicrophone
@@ -24,12 +407,32 @@ class VAD(object):
             On Utterance Callback
         mode: int
             Voice Activity Detection (VAD) 'Aggressiveness' (1..3)
+        voice_callbacks: list of callable or None
+            On Voice (start of utterance) Callback (copied)
+        cascade: bool
+            Whether to reject clearly silent frames before Vad, using their energy and zero-crossing rate relative to
+            the (adaptive) noise level, and to adapt the voice/nonvoice thresholds to the noise level.
+            Only saves CPU for large microphone blocks (its per block cost outweighs Vad for small ones),
+            and the raised thresholds in noise trade missed quiet utterances for fewer false ones
+        stream_callbacks: list of callable or None
+            On Utterance Stream Callback, called with an UtteranceStream as soon as an utterance starts (copied)
+        hangover: float
+            Time [s] an utterance continues after the activation falls below the nonvoice threshold
+        endpoint_decay: float or None
+            Utterances end early, without hangover, when the activation fell below the nonvoice threshold after
+            ENDPOINT_FRAMES non-speech frames this much [dB] below the utterance's speech level.
+            Shorter pauses (within sentences) keep the activation up, and do not end the utterance
+            (None: disable early endpointing)
+        max_duration: float or None
+            Maximum utterance duration [s], longer utterances are split on their quietest frame (None: no maximum)
         """
         self._microphone = microphone
         self._microphone.callbacks += [self._on_audio]
         self._rate = microphone.rate
 
         self._callbacks = callbacks
+        self._voice_callbacks = list(voice_callbacks or [])
+        self._stream_callbacks = list(stream_callbacks or [])
         self._vad = Vad(mode)
 
         # Number of Elements (np.int16) in Frame
@@ -38,16 +441,50 @@ class VAD(object):
         self._ringbuffer_index = 0
 
         self._activation = 0
+        self._activation_sum = 0  # Running sum of Vad.is_speech results over Sliding Window
 
         # Initialize Ringbuffers, which will hold Audio data and Vad.is_speech results, respectively
         self._audio_ringbuffer = np.zeros((self.BUFFER_SIZE, self._frame_size), np.int16)
-        self._vad_ringbuffer = np.zeros(self.BUFFER_SIZE, np.bool)
+        self._vad_ringbuffer = np.zeros(self.BUFFER_SIZE, np.int8)
 
-        self._audio_buffer = bytearray()  # Audio Buffer will be filled with raw Microphone Audio
-        self._voice_buffer = bytearray()  # Voice Buffer will be filled with Voiced Audio
+        # Partial Frame left over from previous Microphone Audio Block
+        self._remainder = np.zeros(self._frame_size, np.int16)
+        self._remainder_length = 0
+
+        # Voice Buffer will be filled with Voiced Audio (grows when utterance does not fit)
+        self._voice_buffer = np.zeros(self.VOICE_BUFFER_SIZE * self.rate, np.int16)
+        self._voice_length = 0
 
         self._voice = False  # No Voice is present at start
 
+        self._position = 0  # Microphone stream position [samples] of next frame (see AbstractMicrophone.position)
+        self._emitted = 0  # Microphone stream position [samples] up to which audio was part of an utterance
+        self._onset = 0  # Microphone stream position of voice onset (start of activation window) in current utterance
+        self._segment = None  # Microphone stream positions (start, end) of voice in last utterance
+
+        # Endpointing
+        self._hangover = int(hangover * 1000 / self.FRAME_MS)  # Hangover [frames]
+        self._endpoint_decay = endpoint_decay
+        self._max_length = None if max_duration is None else int(max_duration * self.rate)  # [samples]
+
+        self._voice_level = None  # Smoothed level [dBFS] of speech frames in current utterance
+        self._trailing = 0  # Non-speech frames since activation fell below nonvoice threshold
+        self._decayed = 0  # Consecutive decayed non-speech frames
+
+        # Utterance Stream currently being recorded and length of Voice Buffer already put on it
+        self._stream = None
+        self._streamed = 0
+
+        self._cascade = cascade
+        self._voice_threshold = config.VAD_VOICE_THRESHOLD
+        self._nonvoice_threshold = config.VAD_NONVOICE_THRESHOLD
+
+        self._noise_level = None  # Noise level [dBFS]
+        self._noise_crossings = 0.0  # Noise zero-crossing rate
+
+        self._frames = 0
+        self._skipped = 0
+
         self._log = logger.getChild(self.__class__.__name__)
         self._log.debug("Booted")
 
@@ -71,6 +508,26 @@ class VAD(object):
         """
         return self._callbacks
 
+    @property
+    def voice_callbacks(self):
+        """
+        Returns
+        -------
+        voice_callbacks: list of callable
+            On Voice (start of utterance) Callback
+        """
+        return self._voice_callbacks
+
+    @property
+    def stream_callbacks(self):
+        """
+        Returns
+        -------
+        stream_callbacks: list of callable
+            On Utterance Stream Callback
+        """
+        return self._stream_callbacks
+
     @property
     def rate(self):
         """
@@ -113,6 +570,48 @@ class VAD(object):
         for callback in self.callbacks:
             callback(audio)
 
+    def on_voice(self):
+        """On Voice Callback, called when an utterance starts, user specified callback(s) should have same signature"""
+        for callback in self.voice_callbacks:
+            callback()
+
+    def on_utterance_stream(self, stream):
+        """
+        On Utterance Stream Callback, called when an utterance starts, user specified callback(s) should have same signature
+
+        Callbacks should hand the stream to another thread (e.g. UtteranceDispatcher.submit) to consume it,
+        as the utterance is only recorded after they return
+
+        Parameters
+        ----------
+        stream: UtteranceStream
+            Stream of audio containing utterance
+        """
+        for callback in self.stream_callbacks:
+            callback(stream)
+
+    @property
+    def voice(self):
+        """
+        Returns
+        -------
+        voice: bool
+            Whether an utterance is currently being recorded
+        """
+        return self._voice
+
+    @property
+    def segment(self):
+        """
+        Returns
+        -------
+        segment: (int, int) or None
+            Microphone stream positions [samples] (start, end) of voice in the last utterance, from its onset (without
+            the audio buffered before it, see AbstractMicrophone.position). Read it from an On Utterance Callback
+            to get the segment of the utterance that callback is called with
+        """
+        return self._segment
+
     @property
     def activation(self):
         """
@@ -123,77 +622,347 @@ class VAD(object):
         """
         return self._activation
 
+    @property
+    def voice_threshold(self):
+        """
+        Returns
+        -------
+        voice_threshold: float
+            Activation above which an utterance starts (adapts to noise level in cascade mode)
+        """
+        return self._voice_threshold
+
+    @property
+    def nonvoice_threshold(self):
+        """
+        Returns
+        -------
+        nonvoice_threshold: float
+            Activation below which an utterance ends (adapts to noise level in cascade mode)
+        """
+        return self._nonvoice_threshold
+
+    @property
+    def noise_level(self):
+        """
+        Returns
+        -------
+        noise_level: float or None
+            Estimated background noise level [dBFS] (cascade mode)
+        """
+        return self._noise_level
+
+    @property
+    def skipped(self):
+        """
+        Returns
+        -------
+        skipped: float
+            Fraction of frames rejected as silent without calling Vad (cascade mode)
+        """
+        return self._skipped / float(max(1, self._frames))
+
     def _on_audio(self, audio):
         """
         Microphone On Audio Event, Processes Audio to filter out Utterances
 
+        Audio is sliced into frames using views, only a partial frame at the end of a block is copied
+
         Parameters
         ----------
         audio: np.ndarray
         """
 
-        # Put Microphone Audio at the end of the Audio Buffer
-        self._audio_buffer.extend(audio.tobytes())
+        # Stream Position of Block (positions jump over audio dropped before it reached this callback)
+        position = self._microphone.position(self._on_audio)
+
+        if position is None:
+            position = self._position + self._remainder_length
+
+        # Complete Partial Frame left over from previous Block
+        if self._remainder_length:
+            n = min(len(audio), self._frame_size - self._remainder_length)
+            self._remainder[self._remainder_length:self._remainder_length + n] = audio[:n]
+            self._remainder_length += n
+            audio = audio[n:]
+            position += n
+
+            if self._remainder_length < self._frame_size:
+                return
+
+            self._position = position - self._frame_size
+            self._process_frames(self._remainder.reshape(1, -1))
+            self._remainder_length = 0
+
+        self._position = position
+
+        # Process Each Frame-Length of Audio in Block
+        n = len(audio) // self._frame_size
+
+        if n:
+            self._process_frames(audio[:n * self._frame_size].reshape(n, self._frame_size))
+
+        # Keep Partial Frame for next Block
+        self._remainder_length = len(audio) - n * self._frame_size
+        self._remainder[:self._remainder_length] = audio[n * self._frame_size:]
 
-        # Process Each Frame-Length of Audio in Buffer
-        # 2 * self._frame_size, because we're counting bytes, not np.int16's
-        while len(self._audio_buffer) > 2 * self._frame_size:
-            frame = np.frombuffer(self._audio_buffer[:2*self._frame_size], np.int16)
-            self._process_frame(frame)
-            self._process_voice(frame)
-            del self._audio_buffer[:2*self._frame_size]
+        # Put Voice recorded in this Block on Utterance Stream
+        if self._stream:
+            self._stream_voice()
 
-    def _process_frame(self, frame):
+    def _process_frames(self, frames):
+        """
+        Process Frames of Audio, of shape (n, self._frame_size) and of dtype np.int16
+
+        Parameters
+        ----------
+        frames: np.ndarray
+        """
+        samples = frames.astype(np.float32)
+        energy = np.einsum('ij,ij->i', samples, samples)  # Sum of squares, compared against noise level [dBFS]
+        levels = 10 * np.log10(energy / (frames.shape[1] * 32768.0 ** 2) + 1E-10)
+
+        silent = self._classify(frames, energy, levels) if self._cascade else [False] * len(frames)
+
+        for frame, frame_silent, level in zip(frames, silent, levels):
+            self._position += self._frame_size
+            speech = self._process_frame(frame, frame_silent)
+            self._process_voice(frame, speech, level)
+
+    def _classify(self, frames, energy, levels):
+        """
+        Pre-Classify Frames as (clearly) Silent, and update Noise Level & Thresholds
+
+        A frame is silent when both its energy is close to the noise level and its zero-crossing rate
+        is close to that of the noise (so quiet unvoiced speech, like fricatives, still reaches Vad).
+
+        Parameters
+        ----------
+        frames: np.ndarray
+            Frames of shape (n, self._frame_size)
+        energy: np.ndarray
+            Sum of squares of each frame, of shape (n,)
+        levels: np.ndarray
+            Level [dBFS] of each frame, of shape (n,)
+
+        Returns
+        -------
+        silent: np.ndarray
+            Whether each frame is silent, of shape (n,)
+        """
+        # Zero crossing: consecutive samples of opposite sign (sign bit of xor set)
+        crossings = ((frames[:, 1:] ^ frames[:, :-1]) < 0).sum(axis=1) / float(frames.shape[1])
+
+        quietest = int(np.argmin(energy))
+        quietest_level = float(levels[quietest])
+
+        if self._noise_level is None:
+            self._noise_level, self._noise_crossings = quietest_level, float(crossings[quietest])
+
+        margin = frames.shape[1] * 32768.0 ** 2 * 10 ** ((self._noise_level + self.NOISE_MARGIN) / 10)
+        silent = (energy < margin) & (np.abs(crossings - self._noise_crossings) < self.NOISE_CROSSINGS)
+
+        # Noise Level follows quieter frames quickly and rises slowly, up to the quietest frame
+        if quietest_level < self._noise_level:
+            self._noise_level += self.NOISE_FALL * (quietest_level - self._noise_level)
+        else:
+            self._noise_level = min(quietest_level, self._noise_level + self.NOISE_RISE * len(frames))
+
+        if silent.any():
+            weight = 1 - (1 - self.NOISE_SMOOTHING) ** silent.sum()
+            self._noise_crossings += weight * (crossings[silent].mean() - self._noise_crossings)
+
+        # Thresholds rise from their configured values in quiet, to their 'loud' values in noisy environments
+        loudness = min(max((self._noise_level - self.NOISE_QUIET) / (self.NOISE_LOUD - self.NOISE_QUIET), 0), 1)
+        self._voice_threshold = config.VAD_VOICE_THRESHOLD + loudness * (
+                config.VAD_VOICE_THRESHOLD_LOUD - config.VAD_VOICE_THRESHOLD)
+        self._nonvoice_threshold = config.VAD_NONVOICE_THRESHOLD + loudness * (
+                config.VAD_NONVOICE_THRESHOLD_LOUD - config.VAD_NONVOICE_THRESHOLD)
+
+        self._frames += len(frames)
+        self._skipped += int(silent.sum())
+
+        return silent
+
+    def _process_frame(self, frame, silent=False):
         """
         Process Single Frame of Audio, must be of length self._frame_size and of dtype np.int16
 
         Parameters
         ----------
         frame: np.ndarray
+        silent: bool
+            Whether frame was pre-classified as silent (skipping Vad)
+
+        Returns
+        -------
+        speech: bool
+            Whether frame contains speech
         """
 
         # Put Frame on Audio Ringbuffer
         self._audio_ringbuffer[self._ringbuffer_index] = frame
 
-        # Check if Frame contains speech and put result on VAD Ringbuffer
-        self._vad_ringbuffer[self._ringbuffer_index] = self.vad.is_speech(frame.tobytes(), self.rate, len(frame))
+        # Check if Frame contains speech and put result on VAD Ringbuffer, updating Sliding Window sum
+        speech = not silent and self.vad.is_speech(frame.tobytes(), self.rate, len(frame))
+        self._activation_sum += int(speech) - int(self._vad_ringbuffer[self._ringbuffer_index - self.WINDOW_SIZE])
+        self._vad_ringbuffer[self._ringbuffer_index] = speech
 
         # Update Ringbuffer Index
         self._ringbuffer_index = (self._ringbuffer_index + 1) % self.BUFFER_SIZE
 
-    def _process_voice(self, frame):
+        return speech
+
+    def _process_voice(self, frame, speech=False, level=0.0):
         """
         Check if Utterance is currently starting/happening/stopping and act accordingly
 
+        An utterance ends hangover after the activation falls below the nonvoice threshold,
+        or early, as soon as it does after ENDPOINT_FRAMES non-speech frames decayed by endpoint_decay.
+        Utterances reaching the maximum duration are split on their quietest frame.
+        An utterance starts with the buffered audio before it, up to where the previous utterance ended.
+
         Parameters
         ----------
         frame: np.ndarray
+        speech: bool
+            Whether frame contains speech
+        level: float
+            Frame level [dBFS]
         """
-        window = np.arange(self._ringbuffer_index - self.WINDOW_SIZE, self._ringbuffer_index) % self.BUFFER_SIZE
-        self._activation = np.mean(self._vad_ringbuffer[window])
+        self._activation = float(self._activation_sum) / self.WINDOW_SIZE
 
         if self._voice:
-            if self.activation > config.VAD_NONVOICE_THRESHOLD:
-                self._voice_buffer.extend(frame)  # Add Frame to Voice Buffer
+            self._append_voice(frame)  # Add Frame to Voice Buffer
+
+            # Track Speech Level, and count Non-Speech Frames that decayed well below it
+            if speech:
+                self._decayed = 0
+                self._voice_level = level if self._voice_level is None else \
+                    self._voice_level + self.VOICE_LEVEL_SMOOTHING * (level - self._voice_level)
+            elif self._endpoint_decay is not None and self._voice_level is not None and \
+                    level < self._voice_level - self._endpoint_decay:
+                self._decayed += 1
             else:
+                self._decayed = 0
+
+            # Count Hangover Frames
+            self._trailing = self._trailing + 1 if self.activation <= self.nonvoice_threshold else 0
+
+            if (self._trailing and self._decayed >= self.ENDPOINT_FRAMES) or self._trailing > self._hangover:
                 self._voice = False  # Stop Recording Voice
+                self._end_utterance(self._voice_length)
+                self._voice_length = 0  # Clear Voice Buffer
+            elif self._max_length and self._voice_length >= self._max_length:
+                self._split_voice()
+        else:
+            if self.activation > self.voice_threshold:
+                self._voice = True  # Start Recording Voice
+                self._onset = self._position - self.WINDOW_SIZE * self._frame_size
+                self._voice_level = None
+                self._trailing = 0
+                self._decayed = 0
+                self.on_voice()
 
-                # Append Last Frame a couple of times, to give Google some room to play
-                # TODO: Update this to some better solution, e.g. just listen a while longer
-                for i in range(self.WINDOW_SIZE//2):
-                    self._voice_buffer.extend(frame)
+                # Add Buffered Audio to Voice Buffer, except audio already part of the previous utterance
+                frames = min(self.BUFFER_SIZE, (self._position - self._emitted) // self._frame_size)
+                self._append_voice(self._audio_ringbuffer.take(
+                    range(self._ringbuffer_index - frames, self._ringbuffer_index), axis=0, mode='wrap'))
 
-                # Cast Voice Buffer to Numpy Array
-                result = np.frombuffer(self._voice_buffer, np.int16)
+                self._start_stream()
 
-                # Call Utterance Callback in Thread, to prevent blocking
-                Thread(target=self.on_utterance, args=(result,)).start()
+    def _end_utterance(self, length):
+        """
+        End Utterance, consisting of the start of the Voice Buffer
 
-                self._voice_buffer = bytearray()  # Clear Voice Buffer
-        else:
-            if self.activation > config.VAD_VOICE_THRESHOLD:
-                self._voice = True  # Start Recording Voice
+        Parameters
+        ----------
+        length: int
+            Utterance length [samples]
+        """
+
+        # Copy Voice out of Voice Buffer, which will be reused
+        result = self._voice_buffer[:length].copy()
+
+        # Voice Buffer ends with the current frame, the rest of a split utterance is voiced from its start
+        start = self._position - self._voice_length
+        self._segment = (max(start, self._onset), start + length)
+        self._onset = self._emitted = start + length
+
+        # Put Remaining Voice on Utterance Stream and Close it
+        if self._stream:
+            self._stream_voice(length)
+            self._stream.close(result)
+            self._stream = None
+
+        self.on_utterance(result)
+
+    def _split_voice(self):
+        """
+        Split Utterance that reached Maximum Duration on its Quietest Frame (in the last SPLIT_SEARCH of it)
+
+        The part up to and including the quietest frame is ended as utterance, the rest starts the next utterance.
+        Audio already put on an utterance stream is not searched, as it can not be taken back.
+        """
+        n = self._voice_length // self._frame_size
+        first = int(n * (1 - self.SPLIT_SEARCH))
+
+        if self._stream:
+            first = max(first, -(-self._streamed // self._frame_size))
+
+        samples = self._voice_buffer[first * self._frame_size:n * self._frame_size].reshape(-1, self._frame_size)
+        samples = samples.astype(np.float32)
+        split = (first + int(np.argmin(np.einsum('ij,ij->i', samples, samples))) + 1) * self._frame_size
+
+        self._log.debug("Split Utterance at {:3.2f}s".format(split / float(self.rate)))
+
+        self._end_utterance(split)
+
+        # Move Rest of Voice to start of Voice Buffer
+        rest = self._voice_length - split
+        self._voice_buffer[:rest] = self._voice_buffer[split:self._voice_length]
+        self._voice_length = rest
+
+        self._start_stream()
+
+    def _start_stream(self):
+        """Start Utterance Stream (if there are stream callbacks), which receives Voice at the end of each Block"""
+        if self.stream_callbacks:
+            self._stream = UtteranceStream(self.rate)
+            self._streamed = 0
+            self.on_utterance_stream(self._stream)
+
+    def _append_voice(self, audio):
+        """
+        Append Audio to Voice Buffer, growing it if necessary
+
+        Parameters
+        ----------
+        audio: np.ndarray
+            Frame or Frames of Audio
+        """
+        audio = audio.reshape(-1)
+        length = self._voice_length + len(audio)
+
+        if length > len(self._voice_buffer):
+            voice_buffer = np.zeros(max(length, 2 * len(self._voice_buffer)), np.int16)
+            voice_buffer[:self._voice_length] = self._voice_buffer[:self._voice_length]
+            self._voice_buffer = voice_buffer
+
+        self._voice_buffer[self._voice_length:length] = audio
+        self._voice_length = length
+
+    def _stream_voice(self, length=None):
+        """
+        Put Voice that was not yet streamed on Utterance Stream
+
+        Parameters
+        ----------
+        length: int or None
+            Length of Voice Buffer to stream up to (None: all)
+        """
+        length = self._voice_length if length is None else length
 
-                # Add Buffered Audio to Voice Buffer
-                self._voice_buffer.extend(self._audio_ringbuffer[self._ringbuffer_index:].tobytes())
-                self._voice_buffer.extend(self._audio_ringbuffer[:self._ringbuffer_index].tobytes())
+        if length > self._streamed:
+            self._stream.put(self._voice_buffer[self._streamed:length].copy())
+            self._streamed = length
@@ -0,0 +1,168 @@
+import numpy as np
+
+from fractions import gcd
+
+
+class Resampler(object):
+
+    TAPS = 16  # Filter length, in samples at the lower of both rates
+    CUTOFF = 0.9  # Low-pass cutoff, as a fraction of the lower Nyquist frequency
+
+    def __init__(self, rate, output_rate, channels=1, block=4096):
+        """
+        Streaming Polyphase Resampler, converting audio between any two integer sample rates
+
+        Conceptually, audio is upsampled by 'up', low-pass filtered and downsampled by 'down',
+        but only the filter taps needed for each output sample are evaluated (polyphase).
+        Filter state is kept between blocks and all work buffers are preallocated (for blocks up to 'block').
+
+        Parameters
+        ----------
+        rate: int
+            Input sample rate [Hz]
+        output_rate: int
+            Output sample rate [Hz]
+        channels: int
+            Number of (interleaved) audio channels
+        block: int
+            Expected (maximum) number of samples per channel per block, buffers grow if blocks are larger
+        """
+        self._rate = rate
+        self._output_rate = output_rate
+        self._channels = channels
+
+        divisor = gcd(rate, output_rate)
+        self._up = output_rate // divisor
+        self._down = rate // divisor
+
+        # Windowed-sinc low-pass prototype filter at the upsampled rate, split into 'up' polyphase branches
+        self._length = -(-self.TAPS * max(self._up, self._down) // self._up)  # Taps per branch
+
+        cutoff = self.CUTOFF * 0.5 / max(self._up, self._down)
+        n = np.arange(self._length * self._up) - (self._length * self._up - 1) / 2.0
+        prototype = 2 * cutoff * self._up * np.sinc(2 * cutoff * n) * np.hamming(len(n))
+
+        # Branch p holds taps p, p + up, p + 2 up, ... (shape: up, taps per branch, 1)
+        self._branches = prototype.reshape(self._length, self._up).T.astype(np.float32).reshape(self._up, -1, 1)
+
+        self._offsets = np.arange(self._length - 1, -1, -1).reshape(1, -1)  # Newest input sample last
+
+        # Upsampled position of next output sample, relative to the first sample of the next block
+        self._position = 0
+
+        self._allocate(block)
+
+    @property
+    def rate(self):
+        """
+        Returns
+        -------
+        rate: int
+            Input sample rate [Hz]
+        """
+        return self._rate
+
+    @property
+    def output_rate(self):
+        """
+        Returns
+        -------
+        output_rate: int
+            Output sample rate [Hz]
+        """
+        return self._output_rate
+
+    @property
+    def channels(self):
+        """
+        Returns
+        -------
+        channels: int
+            Number of (interleaved) audio channels
+        """
+        return self._channels
+
+    def process(self, audio):
+        """
+        Resample Block of Audio
+
+        Parameters
+        ----------
+        audio: np.ndarray
+            (Interleaved) audio of shape (samples * channels,) or (samples, channels)
+
+        Returns
+        -------
+        audio: np.ndarray
+            Resampled (interleaved) audio, dtype np.int16.
+            This is a view on a work buffer, which is only valid until the next call to process
+        """
+        audio = audio.reshape(-1, self.channels)
+        samples = len(audio)
+        history = self._length - 1
+
+        if samples > self._block:
+            self._allocate(samples)
+
+        # Input: filter history followed by new block
+        np.copyto(self._input[history:history + samples], audio, casting='unsafe')
+
+        # Output samples whose newest input sample lies within this block
+        outputs = max(0, (samples * self._up - self._position + self._down - 1) // self._down)
+
+        position, base, phase = self._position_buffer[:outputs], self._base[:outputs], self._phase[:outputs]
+        index, window, taps = self._index[:outputs], self._window[:outputs], self._taps[:outputs]
+        output, result = self._output[:outputs], self._result[:outputs]
+
+        np.multiply(self._steps[:outputs], self._down, out=position)
+        position += self._position
+        np.floor_divide(position, self._up, out=base)
+        np.remainder(position, self._up, out=phase)
+
+        # Gather input window and polyphase branch of each output sample, and apply filter
+        np.add(base.reshape(-1, 1), self._offsets, out=index)
+        np.take(self._input, index, axis=0, out=window)
+        np.take(self._branches, phase, axis=0, out=taps)
+        window *= taps
+        window.sum(axis=1, out=output)
+
+        np.round(output, out=output)
+        np.clip(output, -32768, 32767, out=output)
+        np.copyto(result, output, casting='unsafe')
+
+        # Keep filter history & position for next block
+        self._position += outputs * self._down - samples * self._up
+        self._history[:] = self._input[samples:samples + history]
+
+        return result.reshape(-1)
+
+    def _allocate(self, block):
+        """
+        (Re)allocate Work Buffers, for blocks of up to block samples per channel
+
+        Parameters
+        ----------
+        block: int
+        """
+        history = self._length - 1
+        outputs = block * self._up // self._down + 1
+
+        previous = getattr(self, '_input', None)
+
+        self._block = block
+        self._input = np.zeros((history + block, self.channels), np.float32)
+
+        if previous is not None:
+            self._input[:history] = previous[:history]
+
+        self._history = self._input[:history]
+
+        self._steps = np.arange(outputs)
+        self._position_buffer = np.empty(outputs, np.int64)
+        self._base = np.empty(outputs, np.int64)
+        self._phase = np.empty(outputs, np.int64)
+        self._index = np.empty((outputs, self._length), np.int64)
+        self._window = np.empty((outputs, self._length, self.channels), np.float32)
+        self._taps = np.empty((outputs, self._length, 1), np.float32)
+        self._output = np.empty((outputs, self.channels), np.float32)
+        self._result = np.empty((outputs, self.channels), np.int16)
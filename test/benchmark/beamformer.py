@@ -0,0 +1,136 @@
+"""Benchmark: Beamformer real time factor and directional gain, for four-channel 48 kHz Naoqi audio"""
+
+from pepper.framework.backend.naoqi import NaoqiMicrophone
+from pepper.sensor.beamformer import Beamformer
+
+import numpy as np
+
+from threading import Thread
+from timeit import timeit
+
+
+def simulate(azimuth, frequency, samples, rate=NaoqiMicrophone.RATE_ALL, amplitude=3000):
+    """
+    Simulate Tone arriving at Naoqi Microphones from Direction
+
+    Parameters
+    ----------
+    azimuth: float
+        Direction [rad] of sound source
+    frequency: float
+        Tone frequency [Hz]
+    samples: int
+        Number of samples per channel
+    rate: int
+    amplitude: float
+
+    Returns
+    -------
+    audio: np.ndarray
+        Interleaved audio of shape (samples * channels,) and dtype np.int16
+    """
+    direction = np.array([np.cos(azimuth), np.sin(azimuth), 0])
+    advance = NaoqiMicrophone.POSITIONS.dot(direction) / Beamformer.SPEED_OF_SOUND
+    t = np.arange(samples, dtype=np.float64).reshape(-1, 1) / rate + advance
+    return (amplitude * np.sin(2 * np.pi * frequency * t)).astype(np.int16).ravel()
+
+
+def benchmark(block=4096, repeat=100):
+    """
+    Measure Beamformer real time factor (processing time / audio duration)
+
+    Parameters
+    ----------
+    block: int
+        Samples per channel per block
+    repeat: int
+        Number of blocks to average over
+    """
+    beamformer = Beamformer(NaoqiMicrophone.POSITIONS, NaoqiMicrophone.RATE_ALL, NaoqiMicrophone.RATE)
+    audio = (np.random.randn(block * beamformer.channels) * 1000).astype(np.int16)
+
+    dt = timeit(lambda: beamformer.process(audio), number=repeat) / repeat
+    print "block {:5d} samples: {:6.3f} ms per block, real time factor {:6.4f}".format(
+        block, dt * 1000, dt / (float(block) / beamformer.rate))
+
+
+def gain(frequency, block=4096, blocks=8):
+    """
+    Measure Beamformer gain (steered front) for a tone from several directions
+
+    Parameters
+    ----------
+    frequency: float
+        Tone frequency [Hz]
+    block: int
+        Samples per channel per block
+    blocks: int
+        Number of blocks to measure over
+    """
+    gains = []
+
+    for azimuth in np.linspace(0, np.pi, 5):
+        beamformer = Beamformer(NaoqiMicrophone.POSITIONS, NaoqiMicrophone.RATE_ALL, NaoqiMicrophone.RATE)
+        audio = simulate(azimuth, frequency, block * blocks).reshape(-1, beamformer.channels)
+        mono = np.concatenate([beamformer.process(audio[i:i + block]) for i in range(0, len(audio), block)])
+        gains.append(np.std(mono[len(mono) // 4:]) / np.std(audio[:, 0]))
+
+    print "{:5.0f} Hz gain (0 .. 180 deg): {}".format(frequency, " ".join("{:5.2f}".format(g) for g in gains))
+
+
+def continuity(block, blocks=16):
+    """
+    Compare Beamforming in Blocks with Beamforming in one Pass (no resampling), while steering from another thread
+
+    Block boundaries must not introduce discontinuities: outputs may only differ by rounding (1 LSB)
+
+    Parameters
+    ----------
+    block: int
+        Samples per channel per block
+    blocks: int
+        Number of blocks
+
+    Returns
+    -------
+    error: int
+        Maximum difference between blockwise and one pass output
+    """
+    audio = simulate(np.pi / 3, 1000, block * blocks).reshape(-1, len(NaoqiMicrophone.POSITIONS))
+    audio = audio + (np.random.RandomState(0).randn(*audio.shape) * 1000).astype(np.int16)
+
+    reference = Beamformer(NaoqiMicrophone.POSITIONS, NaoqiMicrophone.RATE_ALL, azimuth=0.5).process(audio).copy()
+
+    beamformer = Beamformer(NaoqiMicrophone.POSITIONS, NaoqiMicrophone.RATE_ALL, azimuth=0.5)
+    mono = np.concatenate([beamformer.process(audio[i:i + block]).copy() for i in range(0, len(audio), block)])
+    error = int(np.abs(mono.astype(np.int32) - reference).max())
+
+    # Steering concurrently with processing must not disturb it
+    running = [True]
+
+    def steer():
+        while running[0]:
+            beamformer.steer(np.random.uniform(-np.pi, np.pi))
+
+    thread = Thread(target=steer)
+    thread.start()
+    try:
+        for i in range(0, len(audio), block):
+            beamformer.process(audio[i:i + block])
+    finally:
+        running[0] = False
+        thread.join()
+
+    print "block {:5d} samples: blockwise vs. one pass max error {} / 32768".format(block, error)
+    return error
+
+
+if __name__ == '__main__':
+    for block in (1024, 4096, 16384):
+        benchmark(block)
+
+    for block in (160, 1365, 4096):
+        assert continuity(block) <= 1
+
+    for frequency in (500, 1000, 2000, 4000, 6000):
+        gain(frequency)
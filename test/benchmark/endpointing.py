@@ -0,0 +1,119 @@
+"""Benchmark: VAD endpointing latency (end of speech to end of utterance) and utterance length"""
+
+from pepper.framework.abstract.microphone import AbstractMicrophone
+from pepper.sensor.vad import VAD
+
+import numpy as np
+
+
+def simulate(seconds, rate=16000, noise=50, speech=(0.5, 2.0), pause=(1.0, 3.0), gaps=()):
+    """
+    Simulate Microphone Audio: noise floor with tone bursts ("speech") of words, each ending in a 30 ms decay
+
+    Parameters
+    ----------
+    seconds: int
+    rate: int
+    noise: float
+        Noise (standard deviation)
+    speech: (float, float)
+        Range of burst durations [s]
+    pause: (float, float)
+        Range of pauses [s] between bursts
+    gaps: tuple of float
+        Pauses [s] within each burst (between its words), spread evenly over it
+
+    Returns
+    -------
+    audio: np.ndarray
+    ends: list of int
+        End [samples] of each burst
+    """
+    rng = np.random.RandomState(0)
+    t = np.arange(seconds * rate, dtype=np.float64) / rate
+    audio = rng.randn(len(t)) * noise
+    ends = []
+
+    start = 1.0
+    while start < seconds - 4:
+        duration = rng.uniform(*speech)
+
+        middles = [start + duration * (i + 1) / (len(gaps) + 1.0) for i in range(len(gaps))]
+        words = zip([start] + [middle + gap / 2 for middle, gap in zip(middles, gaps)],
+                    [middle - gap / 2 for middle, gap in zip(middles, gaps)] + [start + duration])
+
+        for word_start, word_end in words:
+            burst = (t >= word_start) & (t < word_end)
+            decay = np.minimum(1, (word_end - t[burst]) / 0.03)
+            audio[burst] += 5000 * decay * np.sin(2 * np.pi * 200 * t[burst]) * (1 + 0.5 * np.sin(2 * np.pi * 4 * t[burst]))
+        ends.append(int((start + duration) * rate))
+        start += duration + rng.uniform(*pause)
+
+    return audio.astype(np.int16), ends
+
+
+def benchmark(name, audio, ends, block=160, **kwargs):
+    """
+    Measure endpointing latency and utterance length
+
+    Parameters
+    ----------
+    name: str
+    audio: np.ndarray
+    ends: list of int
+        End [samples] of each burst
+    block: int
+        Samples per microphone block
+    kwargs
+        VAD endpointing parameters
+
+    Returns
+    -------
+    utterances: list of np.ndarray
+    """
+    utterances = []
+    vad = VAD(AbstractMicrophone(16000, 1, []), [utterances.append], **kwargs)
+
+    # Utterance callbacks are called as the utterance ends, in the block that ends it
+    endpoints = []
+    for i in range(0, len(audio), block):
+        count = len(utterances)
+        vad._on_audio(audio[i:i + block])
+        if len(utterances) > count:
+            endpoints.append(i + block)
+
+    # Latency from end of each burst to the first utterance ending after it
+    latencies = [(endpoints[np.searchsorted(endpoints, end)] - end) / 16.0
+                 for end in ends if end < endpoints[-1]]
+    lengths = [len(utterance) / 16000.0 for utterance in utterances]
+
+    print "{:10s}: {:2d} utterances, endpoint latency median {:4.0f} ms, max {:4.0f} ms, longest utterance {:5.2f} s".format(
+        name, len(utterances), np.median(latencies), max(latencies), max(lengths))
+
+    return utterances
+
+
+if __name__ == '__main__':
+    audio, ends = simulate(120)
+
+    print "Speech bursts of 0.5 - 2 s"
+    benchmark("previous", audio, ends, hangover=0.0, endpoint_decay=None, max_duration=None)
+    benchmark("hangover", audio, ends, endpoint_decay=None)
+    benchmark("early", audio, ends)
+
+    audio, ends = simulate(120, speech=(20, 40), pause=(0.5, 1.0))
+
+    print "Speech bursts of 20 - 40 s"
+    benchmark("previous", audio, ends, hangover=0.0, endpoint_decay=None, max_duration=None)
+    utterances = benchmark("split", audio, ends)
+
+    assert max(len(utterance) for utterance in utterances) <= 15 * 16000
+
+    audio, ends = simulate(120, speech=(2.0, 3.0), pause=(0.3, 0.6), gaps=(0.12, 0.15, 0.2))
+
+    print "Speech bursts of 2 - 3 s, with pauses of 120 - 200 ms between words"
+    utterances = benchmark("early", audio, ends)
+
+    # Pauses within sentences do not end utterances, and utterances do not repeat audio of the previous one
+    assert len(utterances) == len(ends)
+    assert sum(len(utterance) for utterance in utterances) <= len(audio)
@@ -0,0 +1,100 @@
+"""Benchmark: sustained NaoqiCamera frame rate, sequential vs. pipelined acquisition, against a local ALVideoDevice"""
+
+from pepper.framework import CameraResolution
+from pepper.framework.backend.naoqi import NaoqiCamera
+
+import numpy as np
+
+from time import time, sleep
+
+
+class VideoDeviceStandIn(object):
+    def __init__(self, latency=0.010, bandwidth=50E6):
+        """
+        Local Stand-In for the Naoqi ALVideoDevice Service, serving random YUV422 images
+
+        Parameters
+        ----------
+        latency: float
+            Simulated round trip time [s] per getImageRemote call
+        bandwidth: float
+            Simulated network bandwidth [bytes/s]
+        """
+        self._latency = latency
+        self._bandwidth = bandwidth
+        self._shape = None
+        self._data = None
+
+    def subscribeCamera(self, name, index, resolution, color_space, rate):
+        # Reverse lookup of Naoqi resolution code, NATIVE is served as VGA
+        resolutions = [r for r, code in NaoqiCamera.RESOLUTION_CODE.items() if code == resolution]
+        height, width = max(r.value for r in resolutions)
+        self._shape = width, height
+        self._data = np.random.randint(0, 256, width * height * 2).astype(np.uint8).tobytes()
+        return name
+
+    def getImageRemote(self, client):
+        t = time()
+        sleep(self._latency + len(self._data) / self._bandwidth)
+        width, height = self._shape
+        return [width, height, 2, NaoqiCamera.COLOR_SPACE, int(t), int(t % 1 * 1E6), self._data, 0, 0.0, 0.0, 0.0, 0.0]
+
+    def setColorSpace(self, client, color_space):
+        pass
+
+    def unsubscribe(self, name):
+        pass
+
+
+class SessionStandIn(object):
+    def __init__(self, service):
+        self._service = service
+
+    def service(self, name):
+        return self._service
+
+
+def benchmark(resolution, pipelined, duration=3.0, latency=0.010, bandwidth=50E6):
+    """
+    Measure sustained frame rate of NaoqiCamera
+
+    Parameters
+    ----------
+    resolution: CameraResolution
+    pipelined: bool
+    duration: float
+        Measurement duration [s]
+    latency: float
+        Simulated round trip time [s]
+    bandwidth: float
+        Simulated network bandwidth [bytes/s]
+
+    Returns
+    -------
+    rate: float
+        Sustained frame rate [Hz]
+    """
+    service = VideoDeviceStandIn(latency, bandwidth)
+    camera = NaoqiCamera(SessionStandIn(service), resolution, 1000, pipelined=pipelined)
+    camera.subscribe(lambda frame: None)
+    camera.start()
+
+    # Every published frame is either delivered to or dropped by the subscriber
+    published = lambda: sum(subscriber.delivered + subscriber.dropped for subscriber in camera.subscribers)
+
+    sleep(0.5)  # Warm up
+    frames, t0 = published(), time()
+    sleep(duration)
+    rate = (published() - frames) / (time() - t0)
+
+    # Stopped cameras wait without using CPU, so they don't affect later benchmarks
+    camera.stop()
+    return rate
+
+
+if __name__ == '__main__':
+    for resolution in CameraResolution:
+        sequential = benchmark(resolution, False)
+        pipelined = benchmark(resolution, True)
+        print "{:8s} sequential {:7.1f} Hz | pipelined {:7.1f} Hz ({:4.2f}x)".format(
+            resolution.name, sequential, pipelined, pipelined / sequential)
@@ -0,0 +1,55 @@
+"""Benchmark: Resampler cost per second of audio and accuracy, for common device rates to 16 kHz"""
+
+from pepper.util.resample import Resampler
+
+import numpy as np
+
+from timeit import timeit
+
+
+def benchmark(rate, output_rate=16000, channels=1, block=1024, seconds=10):
+    """
+    Measure Resampler processing time per second of audio and error on a 1 kHz tone
+
+    Parameters
+    ----------
+    rate: int
+        Input sample rate [Hz]
+    output_rate: int
+        Output sample rate [Hz]
+    channels: int
+    block: int
+        Samples per channel per block (as delivered by the audio device)
+    seconds: int
+        Seconds of audio to process
+    """
+    t = np.arange(rate * seconds, dtype=np.float64) / rate
+    audio = np.repeat((8000 * np.sin(2 * np.pi * 1000 * t)).astype(np.int16), channels)
+    blocks = [audio[i:i + block * channels] for i in range(0, len(audio), block * channels)]
+
+    resampler = Resampler(rate, output_rate, channels, block)
+
+    def run():
+        for b in blocks:
+            resampler.process(b)
+
+    dt = timeit(run, number=1) / seconds
+
+    # Accuracy: residual after least squares fit of a 1 kHz tone (of any phase) to the output
+    resampler = Resampler(rate, output_rate, channels, block)
+    output = np.concatenate([resampler.process(b).copy() for b in blocks]).reshape(-1, channels)[output_rate:, 0]
+    t = np.arange(len(output), dtype=np.float64) / output_rate
+    basis = np.stack((np.sin(2 * np.pi * 1000 * t), np.cos(2 * np.pi * 1000 * t)), 1)
+    fit = basis.dot(np.linalg.lstsq(basis, output, rcond=None)[0])
+    error = np.abs(output - fit).max()
+
+    print "{:5d} Hz -> {:5d} Hz, {} channel(s): {:6.3f} ms per second of audio, max error {:4.0f} / 8000".format(
+        rate, output_rate, channels, dt * 1000, error)
+
+
+if __name__ == '__main__':
+    for rate in (8000, 22050, 32000, 44100, 48000):
+        benchmark(rate)
+
+    for channels in (2, 4):
+        benchmark(48000, channels=channels)
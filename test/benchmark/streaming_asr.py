@@ -0,0 +1,194 @@
+"""Benchmark: latency from end of utterance to final transcript, batch vs. streaming and cold vs. warm ASR clients"""
+
+from pepper.framework.abstract.microphone import AbstractMicrophone
+from pepper.sensor.vad import VAD, UtteranceDispatcher
+from pepper.sensor.asr import GoogleASR
+from pepper import config
+
+import numpy as np
+
+from collections import namedtuple
+from time import time, sleep
+
+
+Response = namedtuple("Response", ["results"])
+Result = namedtuple("Result", ["alternatives", "is_final"])
+Alternative = namedtuple("Alternative", ["transcript", "confidence"])
+
+
+class SpeechClientStandIn(object):
+
+    INTERIM_INTERVAL = 0.3  # Audio [s] between interim results
+
+    def __init__(self, rate=16000, latency=0.15, processing=0.2, connect=0.3, bandwidth=1E6):
+        """
+        Local Stand-In for the Google Speech API (speech.SpeechClient), transcribing audio as its duration
+
+        Parameters
+        ----------
+        rate: int
+            Audio sample rate
+        latency: float
+            Simulated round trip time [s] per request
+        processing: float
+            Simulated recognition time [s] per second of audio
+        connect: float
+            Simulated channel setup and authentication time [s], on first request
+        bandwidth: float
+            Simulated upload bandwidth [bytes/s]
+        """
+        self._rate = rate
+        self._latency = latency
+        self._processing = processing
+        self._connect = connect
+        self._bandwidth = bandwidth
+
+    def recognize(self, config, audio):
+        self._connected()
+        duration = len(audio.content) / 2.0 / self._rate
+        sleep(len(audio.content) / self._bandwidth + self._latency + self._processing * duration)
+        return self._response(duration, True)
+
+    def streaming_recognize(self, config, requests):
+        self._connected()
+        duration, interim, done = 0.0, 0.0, time()
+
+        # Audio is recognized as it arrives, as far as processing keeps up
+        for request in requests:
+            sleep(len(request.audio_content) / self._bandwidth)
+            chunk = len(request.audio_content) / 2.0 / self._rate
+            done = max(done, time()) + self._processing * chunk
+            duration += chunk
+
+            if duration - interim > self.INTERIM_INTERVAL:
+                interim = duration
+                yield self._response(duration, False)
+
+        sleep(max(0.0, done - time()) + self._latency)
+        yield self._response(duration, True)
+
+    def _connected(self):
+        sleep(self._connect)
+        self._connect = 0
+
+    @staticmethod
+    def _response(duration, final):
+        return Response([Result([Alternative("utterance of {:3.2f} s".format(duration), 0.9)], final)])
+
+
+def simulate(seconds, rate=16000, noise=50):
+    """
+    Simulate Microphone Audio: noise floor with tone bursts ("speech") of 1 - 3 seconds
+
+    Parameters
+    ----------
+    seconds: int
+    rate: int
+    noise: float
+        Noise (standard deviation)
+
+    Returns
+    -------
+    audio: np.ndarray
+    """
+    rng = np.random.RandomState(0)
+    t = np.arange(seconds * rate, dtype=np.float64) / rate
+    audio = rng.randn(len(t)) * noise
+
+    start = 1.0
+    while start < seconds - 4:
+        duration = rng.uniform(1.0, 3.0)
+        burst = (t >= start) & (t < start + duration)
+        audio[burst] += 5000 * np.sin(2 * np.pi * 200 * t[burst]) * (1 + 0.5 * np.sin(2 * np.pi * 4 * t[burst]))
+        start += duration + rng.uniform(1.0, 2.0)
+
+    return audio.astype(np.int16)
+
+
+def benchmark(audio, streaming, warmup=True, block=1024, rate=16000, latency=0.15, processing=0.2, connect=0.3):
+    """
+    Measure latency from end of utterance to final transcript, feeding audio in real time
+
+    Parameters
+    ----------
+    audio: np.ndarray
+    streaming: bool
+        Whether to stream utterances to ASR while they are being recorded
+    warmup: bool
+        Whether to warm up the ASR client before the first utterance
+    block: int
+        Samples per microphone block
+    rate: int
+    latency: float
+        Simulated round trip time [s]
+    processing: float
+        Simulated recognition time [s] per second of audio
+    connect: float
+        Simulated connection setup time [s]
+
+    Returns
+    -------
+    latencies: list of float
+        Latency [s] per utterance
+    """
+    asr = GoogleASR(sample_rate=rate, client=SpeechClientStandIn(rate, latency, processing, connect), warmup=warmup)
+
+    ends, transcripts, interims, timings = [], [], [], []
+
+    def on_utterance_end(utterance):
+        ends.append(time())
+
+    def transcribe(utterance):
+        asr.transcribe(utterance)
+        return asr.timing
+
+    def transcribe_stream(stream):
+        for hypotheses, final in asr.transcribe_stream(stream):
+            if not final:
+                interims.append(hypotheses)
+        return asr.timing
+
+    def on_transcript(timing):
+        transcripts.append(time())
+        timings.append(timing)
+
+    # Transcribe on a dispatcher, as SpeechRecognition does: VAD callbacks are called on the microphone thread
+    dispatcher = UtteranceDispatcher(transcribe_stream if streaming else transcribe, on_transcript,
+                                     workers=config.VAD_UTTERANCE_WORKERS, backlog=config.VAD_UTTERANCE_BACKLOG,
+                                     max_age=config.VAD_UTTERANCE_MAX_AGE)
+
+    if streaming:
+        vad = VAD(AbstractMicrophone(rate, 1, []), [on_utterance_end], stream_callbacks=[dispatcher.submit])
+    else:
+        vad = VAD(AbstractMicrophone(rate, 1, []), [on_utterance_end, dispatcher.submit])
+
+    # Feed audio in real time
+    t0 = time()
+    for i in range(0, len(audio), block):
+        sleep(max(0.0, t0 + float(i + block) / rate - time()))
+        vad._on_audio(audio[i:i + block])
+
+    dispatcher.join()
+
+    latencies = sorted(transcript - end for end, transcript in zip(ends, transcripts))
+
+    print "{:9s} {:4s}: {} utterances, {:2d} interim transcripts, latency median {:4.0f} ms, max {:4.0f} ms " \
+          "(connect max {:3.0f} ms, upload median {}, recognize median {:3.0f} ms)".format(
+        "streaming" if streaming else "batch", "warm" if warmup else "cold", len(latencies), len(interims),
+        np.median(latencies) * 1000, max(latencies) * 1000, max(timing.connect for timing in timings) * 1000,
+        "{:4.0f} ms".format(np.median([timing.upload for timing in timings]) * 1000) if streaming else "-",
+        np.median([timing.recognize for timing in timings]) * 1000)
+
+    return latencies
+
+
+if __name__ == '__main__':
+    audio = simulate(20)
+
+    for processing in (0.1, 0.3):
+        print "Recognition {:.0%} of real time".format(processing)
+        benchmark(audio, False, warmup=False, processing=processing)
+        batch = benchmark(audio, False, processing=processing)
+        streaming = benchmark(audio, True, processing=processing)
+
+        assert len(batch) == len(streaming)
@@ -0,0 +1,103 @@
+"""Benchmark: translation of N-best ASR hypotheses, one request per hypothesis vs. one batched request"""
+
+import pepper.framework  # Load framework ahead of sensors, as pepper.config depends on it
+from pepper.sensor.asr import GoogleASR, ASRHypothesis
+
+import numpy as np
+
+from time import time, sleep
+
+
+class TranslateClientStandIn(object):
+    def __init__(self, latency=0.1, per_character=1E-5):
+        """
+        Local Stand-In for the Google Translate API (translate_v2.Client), 'translating' by upper casing
+
+        Parameters
+        ----------
+        latency: float
+            Simulated round trip time [s] per request
+        per_character: float
+            Simulated translation time [s] per character
+        """
+        self._latency = latency
+        self._per_character = per_character
+        self.requests = 0
+
+    def translate(self, values):
+        self.requests += 1
+        batch = isinstance(values, list)
+        values = values if batch else [values]
+        sleep(self._latency + self._per_character * sum(len(value) for value in values))
+        translations = [{'translatedText': value.upper(), 'input': value} for value in values]
+        return translations if batch else translations[0]
+
+
+def hypotheses(n, distinct, rng):
+    """
+    Simulate N-best List, with repeated transcripts
+
+    Parameters
+    ----------
+    n: int
+    distinct: int
+        Number of distinct transcripts
+    rng: np.random.RandomState
+
+    Returns
+    -------
+    hypotheses: list of ASRHypothesis
+    """
+    transcripts = ["ik wil graag {} koffie".format(i) for i in range(distinct)]
+    confidences = np.sort(rng.uniform(0, 1, n))[::-1]
+    return [ASRHypothesis(transcripts[rng.randint(distinct)], confidence) for confidence in confidences]
+
+
+def benchmark(translate_alternatives=None, n=20, distinct=12, repeat=5):
+    """
+    Measure time to translate N-best lists
+
+    Parameters
+    ----------
+    translate_alternatives: int or None
+        Number of best hypotheses to translate (None: all)
+    n: int
+        Number of hypotheses
+    distinct: int
+        Number of distinct transcripts
+    repeat: int
+        Number of N-best lists
+    """
+    rng = np.random.RandomState(0)
+    translator = TranslateClientStandIn()
+    asr = GoogleASR('nl-NL', client=object(), warmup=False, translator=translator,
+                    translate_alternatives=translate_alternatives)
+
+    lists = [hypotheses(n, distinct, rng) for i in range(repeat)]
+
+    # Previous implementation: one request per hypothesis
+    t0 = time()
+    for nbest in lists:
+        legacy = [ASRHypothesis(translator.translate(hypothesis.transcript)['translatedText'], hypothesis.confidence)
+                  for hypothesis in nbest]
+    dt_legacy = (time() - t0) / repeat
+
+    translator.requests = 0
+
+    t0 = time()
+    for nbest in lists:
+        batched = asr._translate(nbest)
+    dt = (time() - t0) / repeat
+
+    print "{} hypotheses ({} distinct), translate {:3s}: sequential {:5.0f} ms, batched {:4.0f} ms ({} request)".format(
+        n, distinct, str(translate_alternatives or "all"), dt_legacy * 1000, dt * 1000, translator.requests // repeat)
+
+    # Output is unchanged up to translate_alternatives, other hypotheses are kept untranslated
+    assert [(h.transcript, h.confidence) for h in batched] == \
+           [(h.transcript, h.confidence) for h in legacy][:translate_alternatives] + \
+           [(h.transcript, h.confidence) for h in nbest][len(legacy[:translate_alternatives]):]
+
+
+if __name__ == '__main__':
+    benchmark()
+    benchmark(translate_alternatives=5)
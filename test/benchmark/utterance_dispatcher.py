@@ -0,0 +1,100 @@
+"""Benchmark: utterance bursts (crowd noise), thread per utterance vs. bounded UtteranceDispatcher"""
+
+import pepper.framework  # Load framework ahead of sensors, as pepper.config depends on it
+from pepper.sensor.vad import UtteranceDispatcher
+
+import numpy as np
+
+from threading import Thread, Lock
+from time import time, sleep
+
+
+class Recognizer(object):
+    def __init__(self, durations):
+        """
+        Simulated (cloud) speech recognition, taking a given time per utterance
+
+        Parameters
+        ----------
+        durations: list of float
+            Recognition time [s] per utterance
+        """
+        self._durations = durations
+        self._lock = Lock()
+        self._concurrent = 0
+        self.max_concurrent = 0
+        self.delivered = []
+
+    def process(self, utterance):
+        with self._lock:
+            self._concurrent += 1
+            self.max_concurrent = max(self.max_concurrent, self._concurrent)
+
+        sleep(self._durations[utterance])
+
+        with self._lock:
+            self._concurrent -= 1
+
+        return utterance
+
+    def deliver(self, utterance):
+        self.delivered.append(utterance)
+
+    def __str__(self):
+        order = np.array(self.delivered)
+        return "{:2d} delivered, {:2d} out of order, {:2d} concurrent".format(
+            len(order), int(np.sum(order[1:] < order[:-1])), self.max_concurrent)
+
+
+def simulate(utterances, interval, durations, dispatcher):
+    """
+    Submit a Burst of Utterances
+
+    Parameters
+    ----------
+    utterances: int
+    interval: float
+        Time [s] between utterances
+    durations: list of float
+        Recognition time [s] per utterance
+    dispatcher: bool
+        Whether to use UtteranceDispatcher, rather than a thread per utterance
+
+    Returns
+    -------
+    recognizer: Recognizer
+    """
+    recognizer = Recognizer(durations)
+
+    if dispatcher:
+        dispatcher = UtteranceDispatcher(recognizer.process, recognizer.deliver, workers=2, backlog=4, max_age=5.0)
+        submit = dispatcher.submit
+    else:
+        submit = lambda utterance: Thread(target=lambda: recognizer.deliver(recognizer.process(utterance))).start()
+
+    t0 = time()
+    for utterance in range(utterances):
+        submit(utterance)
+        sleep(interval)
+
+    if dispatcher:
+        dispatcher.join()
+        print "dispatcher: {} | {}".format(recognizer, dispatcher)
+    else:
+        while len(recognizer.delivered) < utterances:
+            sleep(0.01)
+        print "threads   : {} | {:3.2f}s".format(recognizer, time() - t0)
+
+    return recognizer
+
+
+if __name__ == '__main__':
+    rng = np.random.RandomState(0)
+    durations = rng.uniform(0.2, 1.5, 30)
+
+    for interval in (1.0, 0.2):
+        print "Utterance every {:.1f}s, recognition {:.1f}-{:.1f}s".format(interval, durations.min(), durations.max())
+        simulate(len(durations), interval, durations, False)
+        recognizer = simulate(len(durations), interval, durations, True)
+
+        assert recognizer.delivered == sorted(recognizer.delivered)
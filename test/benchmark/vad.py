@@ -0,0 +1,144 @@
+"""Benchmark: VAD frames per second: previous per-frame bytearray implementation, block-processing engine, cascade"""
+
+from pepper.framework.abstract.microphone import AbstractMicrophone
+from pepper.sensor.vad import VAD
+from pepper import config
+
+import numpy as np
+
+from threading import Thread, current_thread, enumerate as threads
+from time import time
+
+
+class LegacyVAD(VAD):
+    """Previous VAD implementation: bytearray audio buffer, per-frame window mean (voice appended as bytes)"""
+
+    def __init__(self, microphone, callbacks, mode=3, cascade=False):
+        super(LegacyVAD, self).__init__(microphone, callbacks, mode, cascade=False)
+        self._vad_ringbuffer = np.zeros(self.BUFFER_SIZE, np.bool)
+        self._audio_buffer = bytearray()
+        self._voice_buffer = bytearray()
+
+    def _on_audio(self, audio):
+        self._audio_buffer.extend(audio.tobytes())
+
+        while len(self._audio_buffer) > 2 * self._frame_size:
+            frame = np.frombuffer(self._audio_buffer[:2*self._frame_size], np.int16)
+            self._process_frame(frame)
+            self._process_voice(frame)
+            del self._audio_buffer[:2*self._frame_size]
+
+    def _process_frame(self, frame):
+        self._audio_ringbuffer[self._ringbuffer_index] = frame
+        self._vad_ringbuffer[self._ringbuffer_index] = self.vad.is_speech(frame.tobytes(), self.rate, len(frame))
+        self._ringbuffer_index = (self._ringbuffer_index + 1) % self.BUFFER_SIZE
+
+    def _process_voice(self, frame):
+        window = np.arange(self._ringbuffer_index - self.WINDOW_SIZE, self._ringbuffer_index) % self.BUFFER_SIZE
+        self._activation = np.mean(self._vad_ringbuffer[window])
+
+        if self._voice:
+            if self.activation > config.VAD_NONVOICE_THRESHOLD:
+                self._voice_buffer.extend(frame.tobytes())
+            else:
+                self._voice = False
+                for i in range(self.WINDOW_SIZE//2):
+                    self._voice_buffer.extend(frame.tobytes())
+                result = np.frombuffer(self._voice_buffer, np.int16)
+                Thread(target=self.on_utterance, args=(result,)).start()
+                self._voice_buffer = bytearray()
+        else:
+            if self.activation > config.VAD_VOICE_THRESHOLD:
+                self._voice = True
+                self._voice_buffer.extend(self._audio_ringbuffer[self._ringbuffer_index:].tobytes())
+                self._voice_buffer.extend(self._audio_ringbuffer[:self._ringbuffer_index].tobytes())
+
+
+def simulate(seconds, rate=16000, noise=50):
+    """
+    Simulate Microphone Audio: noise floor with tone bursts ("speech") of 0.5 - 2 seconds
+
+    Parameters
+    ----------
+    seconds: int
+    rate: int
+    noise: float
+        Noise (standard deviation)
+
+    Returns
+    -------
+    audio: np.ndarray
+    bursts: int
+        Number of bursts
+    """
+    rng = np.random.RandomState(0)
+    t = np.arange(seconds * rate, dtype=np.float64) / rate
+    audio = rng.randn(len(t)) * noise
+    bursts = 0
+
+    start = 1.0
+    while start < seconds - 3:
+        duration = rng.uniform(0.5, 2.0)
+        burst = (t >= start) & (t < start + duration)
+        audio[burst] += 5000 * np.sin(2 * np.pi * 200 * t[burst]) * (1 + 0.5 * np.sin(2 * np.pi * 4 * t[burst]))
+        bursts += 1
+        start += duration + rng.uniform(1.0, 3.0)
+
+    return audio.astype(np.int16), bursts
+
+
+def benchmark(cls, audio, block, cascade=False):
+    """
+    Measure VAD throughput in frames per second
+
+    Parameters
+    ----------
+    cls: type
+        VAD class
+    audio: np.ndarray
+    block: int
+        Samples per microphone block
+    cascade: bool
+        Whether to pre-classify silent frames (see VAD)
+
+    Returns
+    -------
+    utterances: list of np.ndarray
+        Detected utterances, to verify implementations agree
+    """
+    utterances = []
+
+    vad = cls(AbstractMicrophone(16000, 1, []), [utterances.append], cascade=cascade)
+
+    t0 = time()
+    for i in range(0, len(audio), block):
+        vad._on_audio(audio[i:i + block])
+    dt = time() - t0
+
+    # Wait for (LegacyVAD) utterance callback threads
+    for thread in threads():
+        if thread is not current_thread() and not thread.daemon:
+            thread.join()
+
+    frames = len(audio) // vad._frame_size
+    print "{:10s} {:7s} block {:5d}: {:9.0f} frames/s ({:6.2f} us/frame), {:3.0%} skipped, {} utterances".format(
+        cls.__name__, "cascade" if cascade else "", block, frames / dt, dt / frames * 1E6, vad.skipped,
+        len(utterances))
+
+    # LegacyVAD utterance callbacks ran in threads, which may have finished out of order
+    return sorted(utterances, key=lambda utterance: utterance.tobytes())
+
+
+if __name__ == '__main__':
+    for noise in (50, 500):
+        audio, bursts = simulate(120, noise=noise)
+        print "Noise {:.0f} dBFS, {} bursts".format(20 * np.log10(noise / 32768.0), bursts)
+
+        for block in (160, 1365, 4096):
+            legacy = benchmark(LegacyVAD, audio, block)
+            current = benchmark(VAD, audio, block)
+            benchmark(VAD, audio, block, cascade=True)
+
+            # Utterances also differ at their end: LegacyVAD pads with copies of the last frame (see VAD endpointing)
+            if len(legacy) != len(current):
+                print "{:28s} LegacyVAD and VAD differ by {:+d} utterance(s)".format("", len(current) - len(legacy))
@@ -0,0 +1,287 @@
+"""
+Benchmark: VAD on a corpus of labelled WAV files, faster than real time
+
+Each WAV file (16 bit PCM, any rate / channels) comes with a label file of the same name (.txt),
+in Audacity label track format: one speech region per line, as "<start [s]>\t<end [s]>[\t<label>]".
+
+Usage: python -m test.benchmark.vad_corpus [directory]
+Without directory, a synthetic corpus (speech-like phrases: harmonic bursts with short pauses between words,
+in several kinds of noise) is generated.
+
+Reports, per file and over the corpus:
+    frames/s: VAD throughput (frames of VAD.FRAME_MS), through the microphone ring buffer
+    onset: latency [ms] from start of speech region to start of utterance detection (median)
+    offset: latency [ms] from end of speech region to end of utterance (median)
+    missed: fraction of speech regions without detected utterance
+    false: fraction of detected utterances outside any speech region
+    split: fraction of speech regions detected as more than one utterance
+    merged: fraction of detected utterances spanning more than one speech region
+Onset and offset latencies are only measured on utterances within a single speech region.
+"""
+
+from pepper.framework.abstract.microphone import AbstractMicrophone
+from pepper.framework import OverflowPolicy
+from pepper.sensor.vad import VAD
+from pepper.util.resample import Resampler
+
+import numpy as np
+
+from glob import glob
+from tempfile import mkdtemp
+from time import time, sleep
+import wave
+import sys
+import os
+
+
+class WaveMicrophone(AbstractMicrophone):
+
+    RATE = 16000
+
+    def __init__(self, path, block=1024):
+        """
+        Fake Microphone, playing a WAV file (mixed to mono, resampled to 16 kHz) as fast as callbacks can process it
+
+        Parameters
+        ----------
+        path: str
+            WAV file (16 bit PCM)
+        block: int
+            Samples per microphone block
+        """
+        super(WaveMicrophone, self).__init__(self.RATE, 1, [], overflow=OverflowPolicy.BLOCK)
+
+        wav = wave.open(path, 'rb')
+        try:
+            if wav.getsampwidth() != 2:
+                raise ValueError("{}: only 16 bit PCM is supported".format(path))
+
+            channels, rate = wav.getnchannels(), wav.getframerate()
+            audio = np.frombuffer(wav.readframes(wav.getnframes()), np.int16)
+        finally:
+            wav.close()
+
+        if channels > 1:
+            audio = audio.reshape(-1, channels).mean(axis=1).astype(np.int16)
+
+        if rate != self.RATE:
+            audio = Resampler(rate, self.RATE, block=len(audio)).process(audio)
+
+        self._audio = audio
+        self._block = block
+
+    @property
+    def audio(self):
+        """
+        Returns
+        -------
+        audio: np.ndarray
+            Mono 16 kHz audio
+        """
+        return self._audio
+
+    def play(self):
+        """Play File, returning when all callbacks have processed it"""
+        self.start()
+
+        for i in range(0, len(self.audio), self._block):
+            self.on_audio(self.audio[i:i + self._block])
+
+        while any(subscriber.delivered < len(self.audio) for subscriber in self.subscribers):
+            sleep(0.001)
+
+        self.stop()
+
+
+class MeasuredVAD(VAD):
+    def __init__(self, microphone, **kwargs):
+        """
+        VAD recording (microphone sample) positions at which utterances are detected and end
+
+        Parameters
+        ----------
+        microphone: AbstractMicrophone
+        kwargs
+            VAD parameters
+        """
+        super(MeasuredVAD, self).__init__(microphone, [], **kwargs)
+        self.position = 0
+        self.onsets = []
+        self.offsets = []
+
+    def _process_voice(self, frame, speech=False, level=0.0):
+        voice = self.voice
+        super(MeasuredVAD, self)._process_voice(frame, speech, level)
+        self.position += len(frame)
+
+        if self.voice and not voice:
+            self.onsets.append(self.position)
+        elif voice and not self.voice:
+            self.offsets.append(self.position)
+
+
+def read_labels(path, rate=WaveMicrophone.RATE):
+    """
+    Read Speech Regions from Audacity Label File
+
+    Parameters
+    ----------
+    path: str
+    rate: int
+
+    Returns
+    -------
+    regions: list of (int, int)
+        Start and end [samples] of each speech region
+    """
+    with open(path) as labels:
+        return [tuple(int(float(value) * rate) for value in line.split('\t')[:2]) for line in labels if line.strip()]
+
+
+def generate(directory, seconds=120, rate=WaveMicrophone.RATE):
+    """
+    Generate Synthetic Corpus: speech-like phrases of one or more words (harmonics of a gliding pitch, syllable rate
+    amplitude modulation) with 100 - 200 ms pauses between them, in white noise of two levels and in 'babble'
+    (quieter speech-like signals throughout). Each phrase is labelled as one speech region
+
+    Parameters
+    ----------
+    directory: str
+    seconds: int
+        Duration [s] of each file
+    rate: int
+    """
+    rng = np.random.RandomState(0)
+    t = np.arange(seconds * rate, dtype=np.float64) / rate
+
+    def speech(start, duration, amplitude):
+        n = int(duration * rate)
+        pitch = rng.uniform(100, 250) * (1 + 0.1 * np.sin(2 * np.pi * rng.uniform(0.5, 2) * t[:n]))
+        phase = 2 * np.pi * np.cumsum(pitch) / rate
+        voiced = sum(np.sin(k * phase) / k for k in range(1, 10))
+        syllables = 0.75 + 0.25 * np.sin(2 * np.pi * rng.uniform(3, 6) * t[:n] + rng.uniform(0, 2 * np.pi))
+        edges = np.minimum(1, np.minimum(t[:n], duration - t[:n]) / 0.03)
+        return slice(int(start * rate), int(start * rate) + n), amplitude * voiced * syllables * edges
+
+    for name, noise, babble in [("quiet", 30, 0), ("noisy", 300, 0), ("babble", 30, 5)]:
+        audio = rng.randn(len(t)) * noise
+
+        for i in range(babble):
+            region, signal = speech(0, seconds, 300)
+            audio[region] += np.roll(signal, rng.randint(len(t)))
+
+        regions = []
+        start = 1.0
+        while start < seconds - 5:
+            duration = rng.uniform(0.5, 4.0)
+
+            # Words of equal length, with short pauses between them
+            gaps = rng.uniform(0.1, 0.2, int(duration // 1.2))
+            length = (duration - gaps.sum()) / (len(gaps) + 1)
+
+            word = start
+            for gap in list(gaps) + [0]:
+                region, signal = speech(word, length, 3000)
+                audio[region] += signal
+                word += length + gap
+
+            regions.append((start, start + duration))
+            start += duration + rng.uniform(0.5, 3.0)
+
+        wav = wave.open(os.path.join(directory, name + ".wav"), 'wb')
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(np.clip(audio, -32768, 32767).astype(np.int16).tobytes())
+        wav.close()
+
+        with open(os.path.join(directory, name + ".txt"), 'w') as labels:
+            labels.writelines("{:.3f}\t{:.3f}\tspeech\n".format(start, end) for start, end in regions)
+
+
+def evaluate(path, block=1024, **kwargs):
+    """
+    Run VAD on labelled WAV file and compare detected utterances with speech regions
+
+    Parameters
+    ----------
+    path: str
+        WAV file, with label file next to it
+    block: int
+        Samples per microphone block
+    kwargs
+        VAD parameters
+
+    Returns
+    -------
+    result: dict
+        frames, seconds (processing time), regions, utterances, missed, false, split, merged (counts),
+        onsets, offsets (latencies [samples])
+    """
+    microphone = WaveMicrophone(path, block)
+    vad = MeasuredVAD(microphone, **kwargs)
+
+    t0 = time()
+    microphone.play()
+    dt = time() - t0
+
+    regions = read_labels(os.path.splitext(path)[0] + ".txt")
+    utterances = zip(vad.onsets, vad.offsets + [vad.position] * (len(vad.onsets) - len(vad.offsets)))
+
+    # Utterance detected in region, when it is being detected while region is going on
+    overlaps = [[i for i, (start, end) in enumerate(regions) if onset < end and offset > start]
+                for onset, offset in utterances]
+    hits = [[j for j, overlap in enumerate(overlaps) if i in overlap] for i in range(len(regions))]
+
+    # Latencies of utterances within a single region (a merged utterance starts or ends in another region)
+    single = [len(overlap) == 1 for overlap in overlaps]
+
+    return dict(
+        frames=vad.position // vad._frame_size, seconds=dt,
+        regions=len(regions), utterances=len(utterances),
+        missed=sum(not hit for hit in hits), false=sum(not overlap for overlap in overlaps),
+        split=sum(len(hit) > 1 for hit in hits), merged=sum(len(overlap) > 1 for overlap in overlaps),
+        onsets=[utterances[hit[0]][0] - start for hit, (start, end) in zip(hits, regions) if hit and single[hit[0]]],
+        offsets=[utterances[hit[-1]][1] - end for hit, (start, end) in zip(hits, regions) if hit and single[hit[-1]]])
+
+
+def report(name, result):
+    """
+    Print Result of evaluate
+
+    Parameters
+    ----------
+    name: str
+    result: dict
+    """
+    print "{:24s}: {:7.0f} frames/s, onset {:4.0f} ms, offset {:4.0f} ms, " \
+          "missed {:4.0%}, false {:4.0%}, split {:4.0%}, merged {:4.0%}".format(
+        name, result['frames'] / result['seconds'],
+        np.median(result['onsets'] or [np.nan]) / 16.0, np.median(result['offsets'] or [np.nan]) / 16.0,
+        result['missed'] / float(max(1, result['regions'])), result['false'] / float(max(1, result['utterances'])),
+        result['split'] / float(max(1, result['regions'])), result['merged'] / float(max(1, result['utterances'])))
+
+
+if __name__ == '__main__':
+    directory = sys.argv[1] if len(sys.argv) > 1 else mkdtemp()
+
+    if len(sys.argv) < 2:
+        print "Generating synthetic corpus in {}".format(directory)
+        generate(directory)
+
+    configurations = [
+        ("default", {}),
+        ("cascade", dict(cascade=True)),
+        ("no early endpointing", dict(endpoint_decay=None)),
+    ]
+
+    for name, kwargs in configurations:
+        print name
+        results = []
+
+        for path in sorted(glob(os.path.join(directory, "*.wav"))):
+            results.append(evaluate(path, **kwargs))
+            report("  " + os.path.basename(path), results[-1])
+
+        report("  total", {key: sum(result[key] for result in results) if key not in ('onsets', 'offsets')
+                           else sum((result[key] for result in results), []) for key in results[0]})
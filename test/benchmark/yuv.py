@@ -0,0 +1,43 @@
+"""Micro-benchmark: YUV422 -> RGB conversion, float32 reference vs. lookup-table converter"""
+
+from pepper.framework import CameraResolution
+from pepper.util.yuv import yuv422_to_rgb, YUV422Converter
+
+import numpy as np
+
+from timeit import timeit
+
+
+def benchmark(resolution, repeat=50):
+    """
+    Benchmark YUV422 -> RGB Conversion at given resolution
+
+    Parameters
+    ----------
+    resolution: CameraResolution
+    repeat: int
+        Number of conversions to average over
+    """
+
+    # Naoqi streams NATIVE resolution as VGA
+    height, width = CameraResolution.VGA.value if resolution == CameraResolution.NATIVE else resolution.value
+
+    data = np.random.randint(0, 256, height * width * 2).astype(np.uint8).tobytes()
+    reference = yuv422_to_rgb(data, width, height)
+
+    dt_reference = timeit(lambda: yuv422_to_rgb(data, width, height), number=repeat) / repeat
+    print "{:8s} {:4d}x{:<4d} {:>10s} {:8.3f} ms".format(resolution.name, width, height, "float32", dt_reference * 1000)
+
+    converter = YUV422Converter(width, height)
+    out = np.empty((height, width, 3), np.uint8)
+
+    error = np.abs(converter.convert(data, out).astype(np.int16) - reference).max()
+    dt = timeit(lambda: converter.convert(data, out), number=repeat) / repeat
+
+    print "{:8s} {:4d}x{:<4d} {:>10s} {:8.3f} ms ({:4.2f}x, max error {})".format(
+        resolution.name, width, height, "lut", dt * 1000, dt_reference / dt, error)
+
+
+if __name__ == '__main__':
+    for resolution in CameraResolution:
+        benchmark(resolution)